@@ -0,0 +1,234 @@
+"""Benchmark the cabrillo library on synthetic logs.
+
+Run from the project root, e.g.:
+
+    python -m benchmarks.run --sizes 1000 100000 --output results.json
+    python -m benchmarks.run --sizes 1000 100000 --compare results.json
+
+Each benchmark is timed several times and the fastest run is reported, along
+with the peak memory allocated during a separate run under tracemalloc.
+Import benchmarks run in a fresh interpreter each time.
+"""
+import argparse
+import glob
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.synthetic import generate_log
+from cabrillo import QSO
+from cabrillo.checks import (check_band_changes, check_operating_time,
+                             check_serials)
+from cabrillo.parser import (decode_log, parse_log_file, parse_log_text,
+                             validate_log_file)
+from cabrillo.qso import frequency_to_band
+
+
+def counterparts(cab):
+    """Return the QSOs as logged by the other stations."""
+    return [QSO(qso.freq, qso.mo, qso.date, qso.dx_call, qso.de_call,
+                de_exch=qso.dx_exch, dx_exch=qso.de_exch, t=qso.t)
+            for qso in cab.qso]
+
+
+def setup(text, filename):
+    """Return the benchmarks for one log as (name, callable)."""
+    cab = parse_log_text(text)
+    others = counterparts(cab)
+    freqs = [qso.freq for qso in cab.qso]
+
+    def match_against():
+        for qso, other in zip(cab.qso, others):
+            qso.match_against(other)
+
+    def read(encoding):
+        def func():
+            with open(filename, 'rb') as f:
+                decode_log(f.read(), encoding)
+        return func
+
+    def band():
+        for freq in freqs:
+            frequency_to_band(freq)
+
+    return [
+        ('parse_log_text', lambda: parse_log_text(text)),
+        ('parse_log_text_lazy', lambda: parse_log_text(text, lazy=True)),
+        ('parse_log_text_normalize',
+         lambda: parse_log_text(text, normalize=True)),
+        ('parse_log_file', lambda: parse_log_file(filename)),
+        ('parse_log_file_unicode_escape',
+         lambda: parse_log_file(filename, encoding='unicode_escape')),
+        ('decode_log', read(None)),
+        ('decode_log_unicode_escape', read('unicode_escape')),
+        ('write', lambda: cab.write(io.StringIO())),
+        ('match_against', match_against),
+        ('frequency_to_band', band),
+        ('check_serials', lambda: check_serials(cab.qso)),
+        ('check_operating_time', lambda: check_operating_time(cab, limit=360)),
+        ('check_band_changes',
+         lambda: check_band_changes(cab.qso, max_changes=8)),
+    ]
+
+
+def fixtures():
+    """Return the benchmarks on the test fixtures as (name, callable)."""
+    filenames = [filename for filename in sorted(glob.glob('tests/*.log'))
+                 if validate_log_file(filename).valid]
+
+    def parse(encoding):
+        def func():
+            for filename in filenames:
+                parse_log_file(filename, encoding=encoding)
+        return func
+
+    return len(filenames), [
+        ('fixtures_parse_log_file', parse(None)),
+        ('fixtures_parse_log_file_unicode_escape', parse('unicode_escape'))]
+
+
+# Statements timed by the import benchmarks.
+IMPORTS = [('import_cabrillo', 'import cabrillo'),
+           ('import_qso', 'from cabrillo import QSO'),
+           ('import_parser', 'import cabrillo.parser')]
+
+_IMPORT_SCRIPT = """
+import time
+import tracemalloc
+if {trace}:
+    tracemalloc.start()
+start = time.perf_counter()
+{statement}
+print(time.perf_counter() - start, tracemalloc.get_traced_memory()[1])
+"""
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def measure_import(statement, repeat):
+    """Return the fastest of repeat runs of an import statement in fresh
+    interpreters in seconds and the peak memory."""
+    def execute(trace):
+        output = subprocess.run(
+            [sys.executable, '-c',
+             _IMPORT_SCRIPT.format(trace=trace, statement=statement)],
+            cwd=_ROOT, check=True, capture_output=True, text=True).stdout
+        seconds, peak = output.split()
+        return float(seconds), int(peak)
+
+    seconds = min(execute(False)[0] for _ in range(repeat))
+    return seconds, execute(True)[1]
+
+
+def measure(func, repeat):
+    """Return the fastest of repeat runs in seconds and the peak memory."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return min(times), peak
+
+
+def run(sizes, transmitters=1, repeat=3, names=None):
+    """Run the benchmarks.
+
+    Arguments:
+        sizes: Iterable of numbers of QSOs per synthetic log.
+        transmitters: 1 or 2, see generate_log.
+        repeat: Number of timed runs per benchmark.
+        names: Names of the benchmarks to run. Defaults to all.
+
+    Returns:
+        dict: Machine-readable results.
+    """
+    results = []
+    for size in sizes:
+        text = generate_log(size, transmitters=transmitters, extra_headers=50)
+        with tempfile.NamedTemporaryFile('w', suffix='.log',
+                                         delete=False) as f:
+            f.write(text)
+        try:
+            for name, func in setup(text, f.name):
+                if names and name not in names:
+                    continue
+                seconds, peak = measure(func, repeat)
+                results.append(dict(name=name, size=size,
+                                    transmitters=transmitters,
+                                    seconds=seconds, peak_bytes=peak))
+        finally:
+            os.unlink(f.name)
+
+    size, benchmarks = fixtures()
+    for name, func in benchmarks:
+        if names and name not in names:
+            continue
+        seconds, peak = measure(func, repeat * 10)
+        results.append(dict(name=name, size=size, transmitters=None,
+                            seconds=seconds, peak_bytes=peak))
+
+    for name, statement in IMPORTS:
+        if names and name not in names:
+            continue
+        seconds, peak = measure_import(statement, repeat * 10)
+        results.append(dict(name=name, size=0, transmitters=None,
+                            seconds=seconds, peak_bytes=peak))
+
+    return dict(python=platform.python_version(),
+                implementation=platform.python_implementation(),
+                machine=platform.machine(), repeat=repeat, results=results)
+
+
+def compare(old, new):
+    """Return lines comparing the times of two result dicts."""
+    def index(results):
+        return {(r['name'], r['size'], r['transmitters']): r
+                for r in results['results']}
+
+    old_index = index(old)
+    lines = []
+    for key, result in index(new).items():
+        if key in old_index:
+            ratio = result['seconds'] / old_index[key]['seconds']
+            lines.append('{:<22} {:>8} {:>10.4f}s {:>6.2f}x'.format(
+                key[0], key[1], result['seconds'], ratio))
+    return lines
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000])
+    parser.add_argument('--transmitters', type=int, choices=[1, 2], default=1)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--benchmark', action='append', dest='names',
+                        help='Only run this benchmark. May be repeated.')
+    parser.add_argument('--output', help='Write JSON results to this file.')
+    parser.add_argument('--compare', help='JSON results of an earlier run '
+                                          'to compare against.')
+    args = parser.parse_args(argv)
+
+    results = run(args.sizes, args.transmitters, args.repeat, args.names)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            print('\n'.join(compare(json.load(f), results)))
+    elif not args.output:
+        json.dump(results, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+"""Generate synthetic Cabrillo logs for benchmarking.
+
+The logs are deterministic for a given seed, so benchmark results stay
+comparable between runs.
+"""
+import random
+from datetime import datetime, timedelta
+
+# (band edge, band width) in kHz.
+BANDS = [(1800, 200), (3500, 500), (7000, 300), (14000, 350), (21000, 450),
+         (28000, 1700)]
+MODES = ['CW', 'PH']
+HEADER = """START-OF-LOG: 3.0
+CALLSIGN: {callsign}
+CONTEST: CQ-WPX-CW
+CATEGORY-OPERATOR: {operator}
+CATEGORY-ASSISTED: NON-ASSISTED
+CATEGORY-BAND: ALL
+CATEGORY-POWER: HIGH
+CATEGORY-MODE: MIXED
+CATEGORY-STATION: FIXED
+CATEGORY-TRANSMITTER: {transmitter}
+CLAIMED-SCORE: 12345678
+CLUB: Yankee Clipper Contest Club
+LOCATION: WMA
+GRID-LOCATOR: FN42EB
+NAME: Randy Thompson
+EMAIL: test@test.arpa
+ADDRESS: 11 Hollis Street
+ADDRESS-CITY: Uxbridge
+ADDRESS-STATE-PROVINCE: MA
+ADDRESS-POSTALCODE: 01569
+ADDRESS-COUNTRY: USA
+OPERATORS: AA1XXX AA2XXX AA3XXX
+CREATED-BY: cabrillo benchmarks
+SOAPBOX: Synthetic log for benchmarking.
+"""
+
+
+def random_call(rng):
+    """Return a plausible random callsign."""
+    prefix = rng.choice(['K', 'W', 'N', 'AA', 'DL', 'G', 'JA', 'VE', 'S5',
+                         'EA', 'OH', 'PY', 'VK', 'ZL', 'UA'])
+    return '{}{}{}'.format(prefix, rng.randint(0, 9), ''.join(
+        rng.choice('ABCDEFGHIJKLMNOPQRSTUVWXYZ')
+        for _ in range(rng.randint(1, 3))))
+
+
+def generate_log(num_qso, transmitters=1, x_qso_ratio=0.01, extra_headers=0,
+                 callsign='AA1ZZZ', seed=0):
+    """Generate the text of a synthetic, time-ordered Cabrillo log.
+
+    Arguments:
+        num_qso: Number of QSO and X-QSO lines.
+        transmitters: 1 for a single transmitter log, 2 for a log with
+            transmitter IDs 0 and 1 on each QSO.
+        x_qso_ratio: Fraction of QSOs written as X-QSO.
+        extra_headers: Number of additional X- header lines.
+        callsign: Callsign of the station.
+        seed: Seed of the random number generator.
+
+    Returns:
+        str: Cabrillo log text.
+    """
+    rng = random.Random(seed)
+    calls = [random_call(rng) for _ in range(max(1, num_qso // 4))]
+    lines = [HEADER.format(
+        callsign=callsign,
+        operator='SINGLE-OP' if transmitters == 1 else 'MULTI-OP',
+        transmitter='ONE' if transmitters == 1 else 'TWO')]
+    for i in range(extra_headers):
+        lines.append('X-BENCHMARK-{}: value {}\n'.format(i, i))
+
+    date = datetime(2009, 5, 30)
+    serial = [0] * transmitters
+    for i in range(num_qso):
+        if rng.random() < 0.5:
+            date += timedelta(minutes=1)
+        t = rng.randrange(transmitters)
+        serial[t] += 1
+        edge, width = rng.choice(BANDS)
+        mode = rng.choice(MODES)
+        rst = '599' if mode == 'CW' else '59'
+        lines.append('{}: {} {} {} {:<13} {} {:<4} {:<13} {} {:<4}{}\n'.format(
+            'X-QSO' if rng.random() < x_qso_ratio else 'QSO',
+            edge + rng.randrange(width), mode, date.strftime('%Y-%m-%d %H%M'),
+            callsign, rst, serial[t], rng.choice(calls), rst,
+            rng.randint(1, 3000), '' if transmitters == 1 else ' {}'.format(t)))
+    lines.append('END-OF-LOG:\n')
+    return ''.join(lines)
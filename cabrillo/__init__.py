@@ -1,9 +1,34 @@
 """cabrillo is a library that parses Cabrillo log files for amateur radio
 contests.
-"""
 
-from cabrillo.qso import QSO
-from cabrillo.cabrillo import Cabrillo
+QSO, Cabrillo and the submodules are imported on first access, so that
+`import cabrillo` stays cheap for short-lived processes.
+"""
 
-__all__ = [QSO, Cabrillo]
+__all__ = ['QSO', 'Cabrillo']
 name = 'cabrillo'
+
+_ATTRIBUTES = {'QSO': 'cabrillo.qso', 'Cabrillo': 'cabrillo.cabrillo'}
+_SUBMODULES = ['adif', 'aio', 'archive', 'cabrillo', 'checks', 'cli',
+               'columnar', 'contest', 'crosscheck', 'data', 'diff', 'errors',
+               'externalcheck', 'instrumentation', 'lazy', 'merge', 'parser',
+               'qso', 'sharedindex', 'storage']
+
+
+def __getattr__(attribute):
+    import importlib
+
+    if attribute in _ATTRIBUTES:
+        value = getattr(importlib.import_module(_ATTRIBUTES[attribute]),
+                        attribute)
+    elif attribute in _SUBMODULES:
+        value = importlib.import_module('{}.{}'.format(__name__, attribute))
+    else:
+        raise AttributeError(
+            'module {!r} has no attribute {!r}'.format(__name__, attribute))
+    globals()[attribute] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_ATTRIBUTES) | set(_SUBMODULES))
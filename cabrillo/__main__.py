@@ -0,0 +1,6 @@
+"""Run the command-line interface with `python -m cabrillo`."""
+import sys
+
+from cabrillo.cli import main
+
+sys.exit(main())
@@ -0,0 +1,299 @@
+"""Contains the list of contest identifications, loaded on first access
+of cabrillo.data.CONTEST."""
+
+# Not used to validate the CONTEST header, which accepts any value.
+CONTEST = [
+    '10-10-SPRINT',
+    '10-10-FALL-CW',
+    '10-10-FALL-DIGITAL',
+    '10-10-OPEN-SEASON',
+    '10-10-SPRING-CW',
+    '10-10-SPRING-DIGITAL',
+    '10-10-SUMMER-PHONE',
+    '10-10-WINTER-PHONE',
+    '7QP',
+    'A1CLUB-AWT',
+    'AGCW-QRP',
+    'AL-QSO-PARTY',
+    'ALL-AFRICA',
+    'AADX-CW',
+    'AADX-SSB',
+    'ANZAC',
+    '40-80',
+    'ARI-DX',
+    'AZ-QSO-PARTY',
+    'AR-QSO-PARTY',
+    'ARRL-10-GHZ',
+    'ARRL-10',
+    'ARRL-160',
+    'ARRL-222',
+    'ARRL-EME',
+    'ARRL-FD',
+    'ARRL-DIGI',
+    'ARRL-DX-CW',
+    'ARRL-DX-SSB',
+    'ARRL-VHF-JAN',
+    'ARRL-VHF-JUN',
+    'ARRL-RR-CW',
+    'ARRL-RR-DIG',
+    'ARRL-RR-PH',
+    'ARRL-RTTY',
+    'ARRL-SCR',
+    'ARRL-VHF-SEP',
+    'ARRL-SS-CW',
+    'ARRL-SS-SSB',
+    'AP-SPRINT',
+    'WIA-AUSTRALIADAY',
+    'BALKAN-HF',
+    'BALTIC-CONTEST',
+    'BARTG-RTTY',
+    'BARTG-SPRINT',
+    'BATAVIA',
+    'BC-QSO-PARTY',
+    'BUCURESTI-DIGITAL',
+    'CA-QSO-PARTY',
+    'CP-QSO-PARTY',
+    'CQP',
+    'COQP',
+    'STAYHOME',
+    'CQ-160-CW',
+    'CQ-160-SSB',
+    'CQ-WW-CW',
+    'CQ-WW-RTTY',
+    'CQ-WW-SSB',
+    'CQ-VHF',
+    'CQ-VHF-SSBCW',  # Split from CQ-VHF, 2025-06-05
+    'CQ-VHF-DIGI',   # Split from CQ-VHF, 2025-06-05
+    'CQ-WPX-RTTY',
+    'CQ-WPX-CW',
+    'CQ-WPX-SSB',
+    'CQ-M',
+    'CQMMDX',
+    '9A-CW',
+    'CVA-DX-CW',
+    'CVA-DX-SSB',
+    'CW-OPEN',
+    'CW-OPS',
+    'DARC-10',
+    'XMAS',
+    'DE-QSO-PARTY',
+    'DIG-QSO-PARTY',
+    'DL-DX-RTTY',
+    'DRCG-WW-RTTY',
+    'PACC',
+    'PACCDIGI',
+    'EA-PSK',
+    'EARTTY',
+    'EANET-SPRINT',
+    'EU-PSK-DX',
+    'EU-SPRINT-SSB',
+    'EUCW-160',
+    'EURASIA-CHAMP',
+    'EUHFC',
+    'EUDXC',
+    'F9AA-CW',
+    'F9AA-DIGI',
+    'F9AA-SSB',
+    'FIRAC-CONTEST',
+    'FCG-FQP',
+    'FT8-RU',
+    'WWSA',
+    'GA-QSO-PARTY',
+    'GUNUNGJATI',
+    'HA3NS-SPRINT',
+    'HAM-SPIRIT-CW',
+    'HAM-SPIRIT-SSB',
+    'HI-QSO-PARTY',
+    'HELVETIA',
+    'ARRL-HPM-150',
+    'EA-MAJESTAD-CW',
+    'EA-MAJESTAD-SSB',
+    'HOLYLAND',
+    'HA-DX',
+    'IARU-HF',
+    'ICWC-MST',
+    'ID-QSO-PARTY',
+    'IG-WW-RY',
+    'IL-QSO-PARTY',
+    'IN-QSO-PARTY',
+    'IAQP',
+    'JARTS-WW-RTTY',
+    'JIDX-CW',
+    'JIDX-SSB',
+    'KALBAR CONTEST',
+    'KANHAM',
+    'KS-QSO-PARTY',
+    'KCJ-TOPBAND',
+    'KYQP',
+    'LA-QSO-PARTY',
+    'LZ-DX',
+    'MAIDENHEAD-MAYHEM',
+    'ME-QSO-PARTY',
+    'MAKROTHEN-RTTY',
+    'MYDX-SSB-CONTEST',
+    'MCD-QSO-PARTY',
+    'MMC-HF-CW',
+    'MDC-QSO-PARTY',
+    'XE-RTTY',
+    'MI-QSO-PARTY',
+    'MINITEST-40',
+    'MINITEST-80',
+    'MN-QSO-PARTY',
+    'MS-QSO-PARTY',
+    'MO-QSO-PARTY',
+    'NCCC-SPRINT-RTTY',
+    'NCCC-SPRINT-CW',
+    'NE-QSO-PARTY',
+    'NV-QSO-PARTY',
+    'NEQP',
+    'NH-QSO-PARTY',
+    'NJQP',
+    'NM-QSO-PARTY',
+    'NY-QSO-PARTY',
+    'VHF-NAMSS',
+    'NAQP-CW',
+    'NAQP-RTTY',
+    'NAQP-SSB',
+    'NA-SPRINT-CW',
+    'NA-SPRINT-RTTY',
+    'NA-SPRINT-SSB',
+    'NC-QSO-PARTY',
+    'ND-QSO-PARTY',
+    'NRAU-10',
+    'NRRL-MGM',
+    'MEMORIAL-CONTEST',
+    'OCEANIA-DX-CW',
+    'OCEANIA-DX-SSB',
+    'MRRC-OHQP',
+    'OK-DX-RTTY',
+    'OK-OM-DX',
+    'OK-QSO-PARTY',
+    'ON-QSO-PARTY',
+    'UKR-CHAMP-RTTY',
+    'PBDX-CONTEST',
+    'PA-QSO-PARTY',
+    'POC',
+    'PORTUGAL-DAY',
+    'TBD',
+    'QC-QSO-PARTY',
+    'CANADA-DAY',
+    'CANADA-WINTER',
+    'RAEM',
+    'RCC-CUP',
+    'REF-CW',
+    'REF-SSB',
+    'RSGB-160',
+    'RSGB-80M-AUT',
+    'RSGB-80M-CC',
+    'RSGB-AFS-CW',
+    'RSGB-COMMONWEALTH',
+    'RSGB-DX',
+    'RSGB-FT4',
+    'RSGB-HQP',
+    'RSGB-LOW-POWER',
+    'RSGB-IOTA',
+    'RSGB-NFD',
+    'RSGB-ROLO',
+    'RSGB-NFD',
+    'RTTYOPS-WEEKEND-SPRINT',
+    'RTTYOPS-WEEKSPRINT',
+    'RTTYOPS-WW-RTTY',
+    'RADIO-160',
+    'RDAC',
+    'RDXC',
+    'RUS-WW-PSK',
+    'RADIO-WW-RTTY',
+    'RUS-WW-DIGI',
+    'RUS-WW-MM',
+    'SARL-HF-CW',
+    'SARL-HF-DIGI',
+    'SARL-HF-SSB',
+    'SARTG-NY-RTTY',
+    'SARTG-RTTY',
+    'SAC-CW',
+    'SAC-SSB',
+    'SA10M',
+    'SACW',
+    'SC-QSO-PARTY',
+    'SDQSOP',
+    'SPDX',
+    'STEW-PERRY',
+    'TN-QSO-PARTY',
+    'TNPOTA',
+    'TESLA-HF',
+    'TXQP',
+    'TSPOTA',
+    'TISZACUP',
+    'TRC-DIGI',
+    'ALRS-UA1DZ-CUP',
+    'UBA-DX-CW',
+    'UBA-DX-SSB',
+    'UBA-ON-2M',
+    'UBA-ON-6M',
+    'UBA-ON-CW',
+    'UBA-ON-SSB',
+    'UBA-PSK63-PREFIX',
+    'UBA-SPRING-CONTEST',
+    'UFT-QRP',
+    'UKEI-DX',
+    'UKEICC-80M',
+    'UR-DX-RTTY',
+    'UKRAINIAN-DX',
+    'UR-DX-DIGI',
+    'UN-DX',
+    'VT-QSO-PARTY',
+    'VA-QSO-PARTY',
+    'VKSHIRES',
+    'VOLTA-RTTY',
+    'ISLAND-QSO-PARTY',
+    'DARC-WAEDC-CW',
+    'DARC-WAEDC-RTTY',
+    'DARC-WAEDC-SSB',
+    'WA-SALMON-RUN',
+    'WVQP',
+    'WFD',
+    'WIQP',
+    'WAG',
+    'WAPC-DX',
+    'WW-DIGI',
+    'WWSAC',
+    'WW-PMC',
+    'YARC-QSO-PARTY',
+    'YB DX CONTEST',
+    'YB-DX-CONTEST',
+    'YL-OM',
+    'YO-DX-HF',
+    'YOTA',
+    'YUDX',
+    'GC',
+    'ARRL-',
+    'ARRL-10-G',
+    'ARRL-1',
+    'ARRL-DI',
+    'ARRL-DX-',
+    'ARRL-DX-S',
+    'ARRL-E',
+    'ARRL-SS-',
+    'ARRL-SS-S',
+    'BARTG-RT',
+    'CQ-160-',
+    'CQ-160-S',
+    'CQ-WPX-',
+    'CQ-WPX-RT',
+    'CQ-WPX-S',
+    'CQ-V',
+    'CQ-WW-',
+    'CQ-WW-RT',
+    'CQ-WW-S',
+    'IARU-',
+    'NAQP-',
+    'NAQP-S',
+    'NAQP-RT',
+    'RD',
+    'RSGB-IO',
+    'SPD',
+    'SPDXC-RT',
+    'TARA-RT',
+    'W',
+    'WW-DI'
+]
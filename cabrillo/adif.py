@@ -0,0 +1,248 @@
+"""Contains utilities to convert between ADIF and Cabrillo QSOs.
+
+ADIF (https://adif.org) is the common exchange format of logging software.
+Both directions work on streams and keep only one record in memory.
+
+Fields without an ADIF equivalent are stored in application-defined fields:
+APP_CABRILLO_MO (the Cabrillo mode), APP_CABRILLO_T (the transmitter ID) and
+APP_CABRILLO_X_QSO (Y for X-QSOs).
+
+A Cabrillo QSO needs a sent and a received exchange. ADIF records without
+them (RST_SENT, STX_STRING or STX, and RST_RCVD, SRX_STRING or SRX) cannot be
+converted.
+"""
+from datetime import datetime
+
+from cabrillo import QSO
+from cabrillo.errors import InvalidLogException, InvalidQSOException
+
+# ADIF band, lower and upper edge in kHz, Cabrillo band designation.
+BANDS = [('160M', 1800, 2000, '1800'),
+         ('80M', 3500, 4000, '3500'),
+         ('60M', 5060, 5450, '5330'),
+         ('40M', 7000, 7300, '7000'),
+         ('30M', 10100, 10150, '10100'),
+         ('20M', 14000, 14350, '14000'),
+         ('17M', 18068, 18168, '18068'),
+         ('15M', 21000, 21450, '21000'),
+         ('12M', 24890, 24990, '24890'),
+         ('10M', 28000, 29700, '28000'),
+         ('6M', 50000, 54000, '50'),
+         ('4M', 70000, 71000, '70'),
+         ('2M', 144000, 148000, '144'),
+         ('1.25M', 222000, 225000, '222'),
+         ('70CM', 420000, 450000, '432'),
+         ('33CM', 902000, 928000, '902'),
+         ('23CM', 1240000, 1300000, '1.2G'),
+         ('13CM', 2300000, 2450000, '2.3G'),
+         ('9CM', 3300000, 3500000, '3.4G'),
+         ('6CM', 5650000, 5925000, '5.7G'),
+         ('3CM', 10000000, 10500000, '10G'),
+         ('1.25CM', 24000000, 24250000, '24G'),
+         ('6MM', 47000000, 47200000, '47G'),
+         ('4MM', 75500000, 81000000, '75G'),
+         ('2.5MM', 119980000, 123000000, '122G'),
+         ('2MM', 134000000, 149000000, '134G'),
+         ('1MM', 241000000, 250000000, '241G')]
+
+# ADIF mode to Cabrillo mode. Other ADIF modes are digital.
+MODES = {'CW': 'CW', 'SSB': 'PH', 'AM': 'PH', 'DIGITALVOICE': 'PH',
+         'FM': 'FM', 'RTTY': 'RY'}
+
+# Cabrillo mode to ADIF mode. DG has no ADIF equivalent.
+OUTPUT_MODES = {'CW': 'CW', 'PH': 'SSB', 'FM': 'FM', 'RY': 'RTTY'}
+
+# Highest frequency in kHz logged exactly in Cabrillo.
+_MAX_HF = 30000
+
+_CABRILLO_BANDS = {designation: name for name, _, _, designation in BANDS}
+_ADIF_BANDS = {name: designation for name, _, _, designation in BANDS}
+
+
+def _fields(file, chunk_size):
+    """Scan ADIF data for fields.
+
+    Yields:
+        (name, value) tuple for each field. name is upper-cased. EOH and EOR
+        are yielded as fields with an empty value.
+    """
+    buf = ''
+    pos = 0
+    eof = False
+    while True:
+        start = buf.find('<', pos)
+        end = buf.find('>', start) if start != -1 else -1
+        if end != -1:
+            spec = buf[start + 1:end].split(':')
+            try:
+                length = int(spec[1]) if len(spec) > 1 else 0
+            except ValueError:
+                raise InvalidLogException(
+                    'Invalid ADIF field length in <{}>.'.format(
+                        buf[start + 1:end]))
+            pos = end + 1 + length
+            if pos <= len(buf) or eof:
+                yield spec[0].upper(), buf[end + 1:pos]
+                continue
+        elif eof:
+            return
+
+        # Read more, keeping only the incomplete field.
+        chunk = file.read(chunk_size)
+        eof = not chunk
+        buf = buf[start:] + chunk if start != -1 else chunk
+        pos = 0
+
+
+def _record_to_qso(record, de_call, check_mode):
+    """Convert an ADIF record to a QSO."""
+    try:
+        dx_call = record['CALL']
+        date = datetime.strptime(record['QSO_DATE'] + record['TIME_ON'][:4],
+                                 '%Y%m%d%H%M')
+    except KeyError as e:
+        raise InvalidQSOException('ADIF record without {}.'.format(e))
+    except ValueError as e:
+        raise InvalidQSOException(
+            'Unable to parse ADIF date/time: {}'.format(e))
+
+    de_call = record.get('STATION_CALLSIGN') or record.get('OPERATOR') \
+        or de_call
+    if not de_call:
+        raise InvalidQSOException('ADIF record without STATION_CALLSIGN.')
+
+    # Prefer the exact frequency in kHz over the band designation on HF.
+    # Cabrillo uses band designations above 30 MHz.
+    band = record.get('BAND', '').upper()
+    if record.get('FREQ'):
+        try:
+            khz = int(round(float(record['FREQ']) * 1000))
+        except ValueError:
+            raise InvalidQSOException(
+                'Invalid ADIF frequency {}.'.format(record['FREQ']))
+        # Outside the known bands, keep the frequency.
+        freq = str(khz)
+        if khz > _MAX_HF:
+            freq = next((designation for _, low, high, designation in BANDS
+                         if low <= khz <= high), freq)
+    elif band in _ADIF_BANDS:
+        freq = _ADIF_BANDS[band]
+    elif record.get('APP_CABRILLO_FREQ'):
+        freq = record['APP_CABRILLO_FREQ']
+    else:
+        raise InvalidQSOException('ADIF record without FREQ or known BAND.')
+
+    mo = record.get('APP_CABRILLO_MO') or MODES.get(
+        record.get('MODE', '').upper(), 'DG')
+
+    exchanges = []
+    for rst, string, number in [('RST_SENT', 'STX_STRING', 'STX'),
+                                ('RST_RCVD', 'SRX_STRING', 'SRX')]:
+        exchange = record.get(rst, '').split()
+        exchange.extend((record.get(string) or record.get(number, '')).split())
+        if not exchange:
+            raise InvalidQSOException(
+                'ADIF record with {} without {}, {} or {}.'.format(
+                    dx_call, rst, string, number))
+        exchanges.append(exchange)
+
+    t = record.get('APP_CABRILLO_T')
+    return QSO(freq, mo, date, de_call, dx_call, de_exch=exchanges[0],
+               dx_exch=exchanges[1], t=int(t) if t else None,
+               valid=record.get('APP_CABRILLO_X_QSO', '').upper() != 'Y',
+               check_mode=check_mode)
+
+
+def read_adif(file, de_call=None, check_mode=True, chunk_size=65536):
+    """Read QSOs from ADIF data.
+
+    Arguments:
+        file: Text-file-like object with a read() method.
+        de_call: Sent callsign for records without STATION_CALLSIGN or
+            OPERATOR.
+        check_mode: Check if modes in APP_CABRILLO_MO are valid per
+            specification. Defaults to True.
+        chunk_size: Number of characters read at a time.
+
+    Yields:
+        cabrillo.QSO in the order of the records.
+
+    Raises:
+        InvalidQSOException, InvalidLogException
+    """
+    record = dict()
+    for name, value in _fields(file, chunk_size):
+        if name == 'EOR':
+            yield _record_to_qso(record, de_call, check_mode)
+            record = dict()
+        elif name == 'EOH':
+            record = dict()
+        else:
+            record[name] = value.strip()
+
+
+def _adif_band(freq):
+    """Return the ADIF band of a Cabrillo frequency or band designation and
+    whether freq is an exact frequency. The band is None if unknown."""
+    try:
+        freq_num = int(freq)
+    except ValueError:
+        return _CABRILLO_BANDS.get(freq), False
+    for name, low, high, _ in BANDS:
+        if low <= freq_num <= high:
+            return name, True
+    return _CABRILLO_BANDS.get(freq), False
+
+
+def _field(name, value):
+    return '<{}:{}>{}'.format(name, len(value), value)
+
+
+def write_adif(qsos, file, rst=False):
+    """Write QSOs as ADIF.
+
+    Arguments:
+        qsos: Iterable of cabrillo.QSO, e.g. Cabrillo.qso.
+        file: Anything that has a write() - method accepting a string.
+        rst: If True, the first exchange component is a signal report and is
+            written as RST_SENT and RST_RCVD. Defaults to False, which writes
+            whole exchanges as STX_STRING and SRX_STRING.
+    """
+    file.write('Generated by cabrillo (Python)\n{} {} {}\n'.format(
+        _field('ADIF_VER', '3.1.4'), _field('PROGRAMID', 'cabrillo'),
+        '<EOH>'))
+
+    for qso in qsos:
+        fields = [_field('QSO_DATE', qso.date.strftime('%Y%m%d')),
+                  _field('TIME_ON', qso.date.strftime('%H%M')),
+                  _field('STATION_CALLSIGN', qso.de_call),
+                  _field('CALL', qso.dx_call)]
+
+        band, exact = _adif_band(qso.freq)
+        if band:
+            fields.append(_field('BAND', band))
+        if exact:
+            fields.append(_field('FREQ', '{:.3f}'.format(
+                int(qso.freq) / 1000)))
+        if not band:
+            fields.append(_field('APP_CABRILLO_FREQ', str(qso.freq)))
+
+        if qso.mo in OUTPUT_MODES:
+            fields.append(_field('MODE', OUTPUT_MODES[qso.mo]))
+        fields.append(_field('APP_CABRILLO_MO', qso.mo))
+
+        for exchange, rst_name, string in [
+                (qso.de_exch, 'RST_SENT', 'STX_STRING'),
+                (qso.dx_exch, 'RST_RCVD', 'SRX_STRING')]:
+            if rst and exchange:
+                fields.append(_field(rst_name, exchange[0]))
+                exchange = exchange[1:]
+            if exchange:
+                fields.append(_field(string, ' '.join(exchange)))
+
+        if qso.t is not None:
+            fields.append(_field('APP_CABRILLO_T', str(qso.t)))
+        if not qso.valid:
+            fields.append(_field('APP_CABRILLO_X_QSO', 'Y'))
+
+        file.write(' '.join(fields) + ' <EOR>\n')
@@ -0,0 +1,73 @@
+"""Contains asyncio variants of the log file parsing utilities."""
+import asyncio
+import functools
+
+from cabrillo.parser import parse_log_bytes
+
+
+async def aparse_log_file(filename, ignore_unknown_key=False,
+                          check_categories=True, ignore_order=False,
+                          check_mode=True, lazy=False, encoding=None,
+                          executor=None, chunk_size=65536):
+    """Parse a Cabrillo log file without blocking the event loop.
+
+    The file is read in chunks in the event loop's default executor. Parsing
+    is offloaded to executor.
+
+    Arguments:
+        filename: filename of the target log file.
+        executor: concurrent.futures.Executor to parse in. Use a
+            ProcessPoolExecutor to parse several large logs in parallel.
+            Defaults to the event loop's default executor.
+        chunk_size: Number of bytes read at a time.
+        See parse_log_file for the other arguments.
+
+    Returns:
+        cabrillo.Cabrillo
+
+    Raises:
+        InvalidQSOException, InvalidLogException
+    """
+    loop = asyncio.get_running_loop()
+    f = await loop.run_in_executor(None, open, filename, 'rb')
+    try:
+        chunks = []
+        while True:
+            chunk = await loop.run_in_executor(None, f.read, chunk_size)
+            if not chunk:
+                break
+            chunks.append(chunk)
+    finally:
+        await loop.run_in_executor(None, f.close)
+
+    return await loop.run_in_executor(executor, functools.partial(
+        parse_log_bytes, b''.join(chunks), ignore_unknown_key,
+        check_categories, ignore_order, check_mode, lazy, encoding=encoding))
+
+
+async def aparse_many(filenames, concurrency=4, return_exceptions=False,
+                      **kwargs):
+    """Parse several Cabrillo log files concurrently.
+
+    Arguments:
+        filenames: Iterable of filenames of the target log files.
+        concurrency: Maximum number of logs read and parsed at once.
+        return_exceptions: If True, exceptions are returned in place of the
+            log that failed to parse, like asyncio.gather(). Otherwise the
+            first exception is raised.
+        See aparse_log_file for the other arguments.
+
+    Returns:
+        list of cabrillo.Cabrillo in the order of filenames.
+
+    Raises:
+        InvalidQSOException, InvalidLogException
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def parse(filename):
+        async with semaphore:
+            return await aparse_log_file(filename, **kwargs)
+
+    return await asyncio.gather(*[parse(filename) for filename in filenames],
+                                return_exceptions=return_exceptions)
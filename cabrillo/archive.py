@@ -0,0 +1,101 @@
+"""Contains utilities to parse logs straight from zip, tar and gzip archives.
+
+Members are read into memory one at a time, nothing is extracted to disk.
+"""
+import collections
+import concurrent.futures
+import functools
+import gzip
+import os.path
+import tarfile
+import zipfile
+
+from cabrillo.errors import CabrilloParserException
+from cabrillo.parser import parse_log_bytes
+
+LOG_SUFFIXES = ('.log', '.cbr')
+
+
+def iter_members(filename, suffixes=LOG_SUFFIXES):
+    """Read the log files in an archive.
+
+    Zip files, tar files (compressed or not) and single gzip-compressed files
+    are supported.
+
+    Arguments:
+        filename: filename of the archive.
+        suffixes: Tuple of file name suffixes of the members to read,
+            compared case-insensitively. A gzip-compressed file is read
+            regardless of its name.
+
+    Yields:
+        (member name, bytes of the member) tuple.
+    """
+    if zipfile.is_zipfile(filename):
+        with zipfile.ZipFile(filename) as archive:
+            for info in archive.infolist():
+                if not info.is_dir() and \
+                        info.filename.lower().endswith(suffixes):
+                    yield info.filename, archive.read(info)
+    elif tarfile.is_tarfile(filename):
+        with tarfile.open(filename) as archive:
+            for member in archive:
+                if member.isfile() and member.name.lower().endswith(suffixes):
+                    yield member.name, archive.extractfile(member).read()
+    else:
+        name = os.path.basename(filename)
+        if name.lower().endswith('.gz'):
+            name = name[:-3]
+        with gzip.open(filename) as f:
+            yield name, f.read()
+
+
+def _parse_member(data, kwargs):
+    try:
+        return parse_log_bytes(data, **kwargs)
+    except CabrilloParserException as e:
+        return e
+
+
+def parse_archive(filename, suffixes=LOG_SUFFIXES, jobs=None,
+                  return_exceptions=False, **kwargs):
+    """Parse the log files in an archive.
+
+    Arguments:
+        filename: filename of the archive.
+        suffixes: See iter_members.
+        jobs: Number of worker processes to parse in. Defaults to parsing in
+            this process.
+        return_exceptions: If True, a log that fails to parse gives its
+            exception in place of the log. Otherwise the exception is raised.
+        See parse_log_text for the other arguments.
+
+    Yields:
+        (member name, cabrillo.Cabrillo) tuple in archive order.
+
+    Raises:
+        InvalidQSOException, InvalidLogException
+    """
+    def results():
+        if not jobs:
+            for name, data in iter_members(filename, suffixes):
+                yield name, _parse_member(data, kwargs)
+            return
+
+        parse = functools.partial(_parse_member, kwargs=kwargs)
+        with concurrent.futures.ProcessPoolExecutor(jobs) as executor:
+            # Bound the number of members held in memory.
+            pending = collections.deque()
+            for name, data in iter_members(filename, suffixes):
+                pending.append((name, executor.submit(parse, data)))
+                if len(pending) >= 2 * jobs:
+                    name, future = pending.popleft()
+                    yield name, future.result()
+            for name, future in pending:
+                yield name, future.result()
+
+    for name, result in results():
+        if isinstance(result, CabrilloParserException) \
+                and not return_exceptions:
+            raise result
+        yield name, result
@@ -7,6 +7,7 @@ import io
 
 from cabrillo import data
 from cabrillo.errors import InvalidLogException
+from cabrillo.lazy import LazyQSOList
 
 
 class Cabrillo:
@@ -45,7 +46,8 @@ class Cabrillo:
           offtime: List containing two datetime objects denoting start and
             end of off-time.
           soapbox: List of lines of soapbox text.
-          qso: List of all QSOs, including ignored QSOs.
+          qso: List of all QSOs, including ignored QSOs. A LazyQSOList for
+            logs parsed in lazy mode.
           valid_qso: List of all valid QSOs (excluding ignored X-QSO) (read-only).
           x_qso: List of all invalid QSOs (X-QSO only) (read-only).
           x_anything: An ordered mapping of ignored/unknown attributes.
@@ -77,19 +79,32 @@ class Cabrillo:
         else:
             self.version = version
 
-        self.qso = []
-        for qso in d.get('qso', []):
-            self.append_qso(qso, ignore_order)
+        qso_list = d.get('qso', [])
+        if isinstance(qso_list, LazyQSOList):
+            # QSOs are parsed on access, see validate_all().
+            self.qso = qso_list
+        else:
+            self.qso = []
+            for qso in qso_list:
+                self.append_qso(qso, ignore_order)
 
         self.ignore_order = ignore_order
 
         if check_categories:
-            for attribute, candidates in data.VALID_CATEGORIES_MAP.items():
-                value = getattr(self, attribute, None)
-                if value and value not in candidates:
-                    raise InvalidLogException(
-                        'Got {} for {} but expecting one of {}.'.format(
-                            value, attribute, candidates))
+            self._check_categories()
+
+    def _check_categories(self):
+        """Check if categories, if given, exist in the Cabrillo specification.
+
+        Raises:
+            InvalidLogException
+        """
+        for attribute, candidates in data.VALID_CATEGORIES_MAP.items():
+            value = getattr(self, attribute, None)
+            if value and value not in candidates:
+                raise InvalidLogException(
+                    'Got {} for {} but expecting one of {}.'.format(
+                        value, attribute, candidates))
 
     valid_qso = property(fget=lambda self: [
                          qso for qso in self.qso if qso.valid])
@@ -110,6 +125,52 @@ class Cabrillo:
 
         self.qso.append(qso)
 
+    def validate_all(self):
+        """Parse all QSOs of a lazily parsed log and check their order.
+
+        Logs that are not parsed lazily are validated upon construction, so
+        this is a no-op for them.
+
+        Raises:
+            InvalidQSOException, InvalidLogException
+        """
+        if isinstance(self.qso, LazyQSOList):
+            self.qso.validate_all(self.ignore_order)
+
+    def header_items(self):
+        """Generate the header lines of the Cabrillo log text.
+
+        Yields:
+            (keyword, value) tuple for each line, starting with
+            START-OF-LOG, in output order.
+        """
+        yield 'START-OF-LOG', self.version
+
+        # Output known attributes.
+        for attribute, keyword in data.OUTPUT_KEYWORD_MAP.items():
+            value = getattr(self, attribute, None)
+            if value is not None:
+                if attribute == 'certificate':
+                    # Convert boolean to YES/NO.
+                    yield keyword, 'YES' if value else 'NO'
+                elif attribute in ['address', 'soapbox']:
+                    # Process multi-line attributes.
+                    for x in value:
+                        yield keyword, x
+                elif attribute == 'operators':
+                    # Process attributes delimited by space.
+                    yield keyword, ' '.join(value)
+                elif attribute == 'offtime':
+                    # Process offtime dates.
+                    yield keyword, ' '.join(
+                        [x.strftime("%Y-%m-%d %H%M") for x in value])
+                elif attribute != 'version':
+                    yield keyword, value
+
+        # Output ignored attributes.
+        for attribute, keyword in self.x_anything.items():
+            yield attribute.replace('_', '-'), keyword
+
     def text(self):
         """Generate the Cabrillo log text.
 
@@ -128,17 +189,21 @@ class Cabrillo:
             self.write(out)
             return out.getvalue()
 
-    def write(self, file):
+    def write(self, file, qso=None):
         """writes a Cabrillo log text to the text-file-like object file.
 
         Arguments:
             file: Anything that has a write() - method accepting a string.
                   Cabrillo log file text is written here. `_` in attribute
                   names are automatically replaced by `-`.
+            qso: Optional iterable of QSOs written in place of self.qso,
+                  e.g. to stream QSOs that are not held in memory.
 
         Raises:
-            InvalidLogException when target Cabrillo version is not 3.0
-            or ignore_ordered mode is active.
+            InvalidLogException when target Cabrillo version is not 3.0,
+            ignore_ordered mode is active or the QSOs of a lazy log are not
+            ordered time-wise.
+            InvalidQSOException for invalid QSOs of a lazy log.
         """
         if self.version != '3.0':
             raise InvalidLogException("Only Cabrillo v3 supported.")
@@ -147,37 +212,17 @@ class Cabrillo:
             raise InvalidLogException(
                 "Refuse produce output in ignore_ordered mode as Cabrillo logs need to be ordered time-wise.")
 
-        print('START-OF-LOG: {}'.format(self.version), file=file)
-
-        # Output known attributes.
-        for attribute, keyword in data.OUTPUT_KEYWORD_MAP.items():
-            value = getattr(self, attribute, None)
-            if value is not None:
-                if attribute == 'certificate':
-                    # Convert boolean to YES/NO.
-                    print('{}: {}'.format(
-                        keyword, 'YES' if value else 'NO'), file=file)
-                elif attribute in ['address', 'soapbox']:
-                    # Process multi-line attributes.
-                    for x in value:
-                        print('{}: {}'.format(keyword, x), file=file)
-                elif attribute == 'operators':
-                    # Process attributes delimited by space.
-                    print('{}: {}'.format(keyword, ' '.join(value)), file=file)
-                elif attribute == 'offtime':
-                    # Process offtime dates.
-                    print('{}: {}'.format(keyword, ' '.join(
-                        [x.strftime("%Y-%m-%d %H%M") for x in value])), file=file)
-                elif attribute != 'version':
-                    print('{}: {}'.format(keyword, value), file=file)
+        if qso is None and isinstance(self.qso, LazyQSOList):
+            # Lazy logs skip the ordering check of append_qso, so check
+            # before anything is written.
+            self.qso.validate_all()
 
-        # Output ignored attributes.
-        for attribute, keyword in self.x_anything.items():
-            print('{}: {}'.format(attribute.replace('_', '-'), keyword), file=file)
+        for keyword, value in self.header_items():
+            print('{}: {}'.format(keyword, value), file=file)
 
         # Output QSOs:
-        for qso in self.qso:
-            print(qso, file=file)
+        for x in self.qso if qso is None else qso:
+            print(x, file=file)
 
         print('END-OF-LOG:', file=file)
 
@@ -0,0 +1,374 @@
+"""Contains checks of a single log against contest rules.
+
+The checks take one pass over the time-ordered QSOs. They can run on
+Cabrillo.qso after parsing, or QSO by QSO while a log is read, e.g. on the
+QSOs returned by IncrementalParser.update().
+"""
+import collections
+
+from cabrillo import data
+from cabrillo.qso import _epoch_minute, frequency_to_band
+
+GAP = 'gap'
+REPEAT = 'repeat'
+REGRESSION = 'regression'
+INVALID = 'invalid'
+DWELL = 'dwell'
+RATE = 'rate'
+
+# Integer code of each band designation of frequency_to_band. Other
+# designations, e.g. LIGHT, get codes as they are seen.
+BAND_CODES = {band: code for code, band in enumerate(data.FREQ_RANGES)}
+
+SerialAnomaly = collections.namedtuple('SerialAnomaly',
+                                       ['index', 'qso', 'kind', 'expected'])
+SerialAnomaly.__doc__ = """Sent serial number that does not follow the
+previous one of its transmitter.
+
+Attributes:
+    index: Index of the QSO in the QSOs checked.
+    qso: cabrillo.QSO
+    kind: GAP (serial numbers were skipped), REPEAT (the previous serial
+        number was sent again), REGRESSION (a lower serial number was sent)
+        or INVALID (the serial number is missing or not a number).
+    expected: The serial number expected.
+"""
+
+OperatingPeriod = collections.namedtuple('OperatingPeriod',
+                                         ['start', 'end', 'minutes', 'qsos'])
+OperatingPeriod.__doc__ = """Time of continuous operation.
+
+Attributes:
+    start: datetime of the first QSO.
+    end: datetime of the last QSO.
+    minutes: Operating time in minutes. The minute of each QSO counts, as
+        do pauses shorter than the minimum break.
+    qsos: Number of valid QSOs.
+"""
+
+BandChangeViolation = collections.namedtuple(
+    'BandChangeViolation',
+    ['index', 'qso', 'kind', 'band', 'previous_band', 'minutes'])
+BandChangeViolation.__doc__ = """Band change of a transmitter breaking the
+rules.
+
+Attributes:
+    index: Index of the QSO in the QSOs checked.
+    qso: cabrillo.QSO, the first QSO on the new band.
+    kind: DWELL (the previous band was left too early) or RATE (too many
+        band changes within an hour).
+    band: Band designation changed to.
+    previous_band: Band designation changed from.
+    minutes: For DWELL, the minutes spent on the previous band. For RATE, the
+        minutes since the earliest band change counted.
+"""
+
+
+class SerialChecker:
+    """Checks that sent serial numbers count up by one per transmitter.
+
+    Each transmitter (QSO.t) has its own sequence. X-QSOs are checked too, as
+    their serial numbers were sent.
+
+    After a repeat or regression, the sequence continues from the highest
+    serial number sent. After a gap, it continues from the serial number
+    sent, unless the next serial number lies between the ones before and at
+    the gap: then the serial number at the gap was a single mistyped one and
+    the sequence continues as if it had been correct. Either way, a single
+    mistyped serial number is reported once.
+    """
+
+    def __init__(self, field=-1, start=1):
+        """Construct a SerialChecker.
+
+        Arguments:
+            field: Index of the serial number in QSO.de_exch. Defaults to
+                the last component.
+            start: The serial number expected first, or None to accept any.
+        """
+        self.field = field
+        self.start = start
+        self.index = 0
+        # Transmitter to the highest serial number sent.
+        self._last = dict()
+        # Transmitter to (serial number expected before, serial number sent)
+        # of a gap reported for its previous QSO.
+        self._gaps = dict()
+
+    def check(self, qso):
+        """Check the next QSO.
+
+        Returns:
+            SerialAnomaly, or None if the serial number is as expected.
+        """
+        index = self.index
+        self.index += 1
+        last = self._last.get(qso.t)
+        expected = self.start if last is None else last + 1
+        gap = self._gaps.pop(qso.t, None)
+
+        try:
+            serial = int(qso.de_exch[self.field])
+        except (IndexError, ValueError):
+            return SerialAnomaly(index, qso, INVALID, expected)
+
+        if gap is not None and gap[0] <= serial < gap[1]:
+            # Resynchronise after a single mistyped serial number. It either
+            # took the place of the expected one, or was sent in between.
+            expected = gap[0] + 1 if serial > gap[0] else gap[0]
+            last = expected - 1
+
+        if expected is None or serial == expected:
+            self._last[qso.t] = serial
+            return None
+        if serial > expected:
+            self._last[qso.t] = serial
+            self._gaps[qso.t] = (expected, serial)
+            return SerialAnomaly(index, qso, GAP, expected)
+        if serial == expected - 1 and last is not None:
+            return SerialAnomaly(index, qso, REPEAT, expected)
+        return SerialAnomaly(index, qso, REGRESSION, expected)
+
+    def check_all(self, qsos):
+        """Check the next QSOs.
+
+        Returns:
+            list of SerialAnomaly.
+        """
+        check = self.check
+        return [anomaly for anomaly in map(check, qsos)
+                if anomaly is not None]
+
+
+def check_serials(qsos, field=-1, start=1):
+    """Check the sent serial numbers of a log.
+
+    Arguments:
+        qsos: Time-ordered iterable of cabrillo.QSO, e.g. Cabrillo.qso.
+        See SerialChecker for the other arguments.
+
+    Returns:
+        list of SerialAnomaly.
+    """
+    return SerialChecker(field, start).check_all(qsos)
+
+
+class OperatingTimeReport:
+    """Result of check_operating_time.
+
+    Attributes:
+        periods: List of OperatingPeriod separated by breaks.
+        minutes: Total operating time in minutes.
+        limit: Operating time allowed by CATEGORY-TIME in minutes, or None.
+        window: OperatingPeriod of the allowed operating time with the most
+            valid QSOs, or None for a log without QSOs. Without a limit, this
+            spans the whole log.
+        offtime_qsos: List of the QSOs logged during the declared OFFTIME.
+    """
+
+    def __init__(self, periods, minutes, limit, window, offtime_qsos):
+        self.periods = periods
+        self.minutes = minutes
+        self.limit = limit
+        self.window = window
+        self.offtime_qsos = offtime_qsos
+
+    valid = property(fget=lambda self: not self.offtime_qsos and (
+        self.limit is None or self.minutes <= self.limit))
+
+    def __str__(self):
+        return '<OperatingTimeReport of {} minutes in {} periods>'.format(
+            self.minutes, len(self.periods))
+
+
+def category_time_limit(category_time):
+    """Return the operating time allowed by a CATEGORY-TIME in minutes, e.g.
+    360 for 6-HOURS, or None if not limited or not one of data.CATEGORY_TIME,
+    which logs parsed without check_categories may have."""
+    if category_time not in data.CATEGORY_TIME:
+        return None
+    return int(category_time.split('-')[0]) * 60
+
+
+def check_operating_time(cab, min_break=60, limit=None):
+    """Derive the operating periods of a log and check them against its
+    CATEGORY-TIME and OFFTIME.
+
+    A pause of at least min_break minutes between two QSOs is a break. Every
+    other pause counts as operating time. The best window is found with a
+    two-pointer pass over the QSOs.
+
+    Arguments:
+        cab: cabrillo.Cabrillo. QSOs are sorted by time for logs parsed with
+            ignore_order.
+        min_break: Minimum length of a break in minutes. Defaults to 60.
+        limit: Allowed operating time in minutes. Defaults to the limit of
+            cab.category_time.
+
+    Returns:
+        OperatingTimeReport
+    """
+    if limit is None:
+        limit = category_time_limit(cab.category_time)
+    qsos = sorted(cab.qso, key=lambda qso: qso.date) \
+        if cab.ignore_order else cab.qso
+    offtime = cab.offtime
+
+    periods = []
+    offtime_qsos = []
+    # Per QSO: operating minutes since the first QSO and valid QSOs up to
+    # and including it.
+    on_time = []
+    counts = []
+    best = None
+    first = 0
+    period_start = 0
+    # Minute of the previous QSO.
+    previous = None
+    for i, qso in enumerate(qsos):
+        minute = _epoch_minute(qso.date)
+        if i == 0:
+            on_time.append(1)
+            counts.append(int(qso.valid))
+        else:
+            pause = minute - previous
+            if pause >= min_break:
+                periods.append(_period(qsos, period_start, i - 1, on_time,
+                                       counts))
+                period_start = i
+                pause = 1
+            on_time.append(on_time[-1] + pause)
+            counts.append(counts[-1] + qso.valid)
+        previous = minute
+
+        if offtime and offtime[0] < qso.date < offtime[1]:
+            offtime_qsos.append(qso)
+
+        if limit is not None:
+            while on_time[i] - on_time[first] + 1 > limit:
+                first += 1
+        if best is None or counts[i] - (counts[first - 1] if first else 0) \
+                > best[2]:
+            best = (first, i, counts[i] - (counts[first - 1] if first else 0))
+
+    if not qsos:
+        return OperatingTimeReport([], 0, limit, None, offtime_qsos)
+
+    periods.append(_period(qsos, period_start, len(qsos) - 1, on_time, counts))
+    return OperatingTimeReport(
+        periods, on_time[-1], limit,
+        _period(qsos, best[0], best[1], on_time, counts), offtime_qsos)
+
+
+def _period(qsos, first, last, on_time, counts):
+    """Return the OperatingPeriod from QSO first to QSO last."""
+    return OperatingPeriod(
+        qsos[first].date, qsos[last].date,
+        on_time[last] - on_time[first] + 1,
+        counts[last] - (counts[first - 1] if first else 0))
+
+
+class BandChangeChecker:
+    """Checks the band changes of each transmitter, e.g. for the 10-minute
+    rule of multi-operator categories.
+
+    Each transmitter (QSO.t) is followed separately. Bands are determined
+    with frequency_to_band and kept as integer codes. The times of the
+    latest band changes are kept in a ring buffer per transmitter, so each
+    QSO is checked in constant time.
+    """
+
+    def __init__(self, min_dwell=10, max_changes=None, clock_hour=True):
+        """Construct a BandChangeChecker.
+
+        Arguments:
+            min_dwell: Minimum minutes on a band after changing to it, or
+                None to not check. Defaults to 10.
+            max_changes: Maximum band changes per hour, or None to not
+                check.
+            clock_hour: If True (default), max_changes applies to each clock
+                hour (00 through 59 minutes), else to any 60 minutes.
+        """
+        self.min_dwell = min_dwell
+        self.max_changes = max_changes
+        self.clock_hour = clock_hour
+        self.index = 0
+        self._codes = dict(BAND_CODES)
+        self._bands = list(self._codes)
+        # Frequency to band code.
+        self._freqs = dict()
+        # Transmitter to [band code, minute of changing to it or None for
+        # the first band, ring buffer of the minutes of the latest band
+        # changes].
+        self._transmitters = dict()
+
+    def _code(self, freq):
+        code = self._freqs.get(freq)
+        if code is None:
+            band = frequency_to_band(freq)
+            code = self._codes.get(band)
+            if code is None:
+                code = self._codes[band] = len(self._bands)
+                self._bands.append(band)
+            self._freqs[freq] = code
+        return code
+
+    def check(self, qso):
+        """Check the next QSO.
+
+        Returns:
+            list of BandChangeViolation, empty if the QSO breaks no rule.
+        """
+        index = self.index
+        self.index += 1
+        code = self._code(qso.freq)
+        minute = _epoch_minute(qso.date)
+        state = self._transmitters.get(qso.t)
+        if state is None:
+            self._transmitters[qso.t] = [code, None, collections.deque(
+                maxlen=(self.max_changes or 0) + 1)]
+            return []
+
+        previous, since, changes = state
+        if code == previous:
+            return []
+
+        violations = []
+        band, previous_band = self._bands[code], self._bands[previous]
+        if self.min_dwell is not None and since is not None \
+                and minute - since < self.min_dwell:
+            violations.append(BandChangeViolation(
+                index, qso, DWELL, band, previous_band, minute - since))
+        if self.max_changes is not None:
+            changes.append(minute)
+            if len(changes) == changes.maxlen and (
+                    changes[0] // 60 == minute // 60 if self.clock_hour
+                    else minute - changes[0] < 60):
+                violations.append(BandChangeViolation(
+                    index, qso, RATE, band, previous_band,
+                    minute - changes[0]))
+        state[0], state[1] = code, minute
+        return violations
+
+    def check_all(self, qsos):
+        """Check the next QSOs.
+
+        Returns:
+            list of BandChangeViolation.
+        """
+        return [violation for qso in qsos for violation in self.check(qso)]
+
+
+def check_band_changes(qsos, min_dwell=10, max_changes=None,
+                       clock_hour=True):
+    """Check the band changes of a log.
+
+    Arguments:
+        qsos: Time-ordered iterable of cabrillo.QSO, e.g. Cabrillo.qso.
+        See BandChangeChecker for the other arguments.
+
+    Returns:
+        list of BandChangeViolation.
+    """
+    return BandChangeChecker(min_dwell, max_changes,
+                             clock_hour).check_all(qsos)
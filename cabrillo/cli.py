@@ -0,0 +1,370 @@
+"""Contains the command-line interface, run as `cabrillo` or
+`python -m cabrillo`, e.g.:
+
+    cabrillo validate --jobs 8 logs/
+    cabrillo stats logs/
+    cabrillo convert --to adif --output adif/ logs/
+    cabrillo crosscheck --jobs 8 logs/
+
+Directories are searched recursively for files ending in .log or .cbr. Logs
+are processed in a pool of worker processes with --jobs. Results are written
+to standard output as soon as they are available, in the order of the files,
+and the throughput is reported to standard error.
+"""
+import argparse
+import collections
+import concurrent.futures
+import functools
+import json
+import os
+import sqlite3
+import sys
+import time
+
+from cabrillo.adif import write_adif
+from cabrillo.archive import LOG_SUFFIXES
+from cabrillo.crosscheck import MATCHED, CrossCheckIndex
+from cabrillo.errors import CabrilloParserException
+from cabrillo.parser import parse_log_file, validate_log_file
+from cabrillo.qso import frequency_to_band
+from cabrillo.storage import create_schema, save_logs
+
+# Output format to file name suffix. sqlite writes a single database.
+FORMATS = {'cabrillo': '.log', 'adif': '.adi', 'jsonl': '.jsonl',
+           'sqlite': None}
+
+
+def log_files(paths, suffixes=LOG_SUFFIXES):
+    """Expand paths to the log files to process.
+
+    Arguments:
+        paths: Iterable of file and directory names. Directories are searched
+            recursively.
+        suffixes: Tuple of file name suffixes of the log files in
+            directories, compared case-insensitively.
+
+    Yields:
+        str: File name. Files of a directory are yielded in sorted order.
+    """
+    for path in paths:
+        if not os.path.isdir(path):
+            yield path
+            continue
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            for name in sorted(files):
+                if name.lower().endswith(suffixes):
+                    yield os.path.join(root, name)
+
+
+def log_stats(cab):
+    """Return QSO counts and rates of a log.
+
+    Rates are computed from the valid QSOs. The operating span counts the
+    minutes from the first to the last QSO, both included.
+
+    Returns:
+        dict with callsign, contest, qsos, valid, x_qsos, bands (QSOs per
+        band), modes (QSOs per mode), first and last (ISO dates), minutes,
+        rate (QSOs per hour over the span) and peak_hour (most QSOs in a
+        clock hour).
+    """
+    valid = cab.valid_qso
+    bands = collections.Counter(frequency_to_band(qso.freq) for qso in valid)
+    modes = collections.Counter(qso.mo for qso in valid)
+    hours = collections.Counter(qso.date.replace(minute=0, second=0,
+                                                 microsecond=0)
+                                for qso in valid)
+
+    result = dict(callsign=cab.callsign, contest=cab.contest,
+                  qsos=len(cab.qso), valid=len(valid),
+                  x_qsos=len(cab.qso) - len(valid), bands=dict(bands),
+                  modes=dict(modes), first=None, last=None, minutes=0,
+                  rate=0.0, peak_hour=max(hours.values(), default=0))
+    if valid:
+        first = min(qso.date for qso in valid)
+        last = max(qso.date for qso in valid)
+        result['first'] = first.isoformat()
+        result['last'] = last.isoformat()
+        result['minutes'] = int((last - first).total_seconds()) // 60 + 1
+        result['rate'] = round(len(valid) * 60 / result['minutes'], 1)
+    return result
+
+
+def write_jsonl(cab, file):
+    """Write the QSOs of a log as JSON lines, one object per QSO.
+
+    Arguments:
+        cab: cabrillo.Cabrillo
+        file: Anything that has a write() - method accepting a string.
+    """
+    for qso in cab.qso:
+        file.write(json.dumps(dict(
+            log=cab.callsign, freq=qso.freq, mo=qso.mo,
+            date=qso.date.isoformat(), de_call=qso.de_call,
+            de_exch=qso.de_exch, dx_call=qso.dx_call, dx_exch=qso.dx_exch,
+            t=qso.t, valid=qso.valid)) + '\n')
+
+
+def _imap(func, items, jobs):
+    """Like map, but in a pool of jobs worker processes if jobs > 1.
+
+    Results are yielded in order, with at most 2 * jobs items in flight.
+    """
+    if jobs <= 1:
+        yield from map(func, items)
+        return
+
+    with concurrent.futures.ProcessPoolExecutor(jobs) as executor:
+        pending = collections.deque()
+        for item in items:
+            pending.append(executor.submit(func, item))
+            if len(pending) >= 2 * jobs:
+                yield pending.popleft().result()
+        for future in pending:
+            yield future.result()
+
+
+def _parse(filename, options):
+    """Return the parsed log of filename or the exception."""
+    try:
+        return filename, parse_log_file(filename, **options)
+    except (CabrilloParserException, OSError) as e:
+        return filename, e
+
+
+def _validate(filename, options):
+    try:
+        return filename, validate_log_file(filename, **options)
+    except OSError as e:
+        return filename, e
+
+
+def _stats(filename, options):
+    filename, result = _parse(filename, options)
+    if isinstance(result, Exception):
+        return filename, result
+    return filename, log_stats(result)
+
+
+def _convert(filename, options, to, output):
+    """Convert filename to the format to. Returns the parsed log for sqlite,
+    which is written by the main process, or else the number of QSOs."""
+    filename, result = _parse(filename, options)
+    if isinstance(result, Exception) or to == 'sqlite':
+        return filename, result
+
+    name = os.path.splitext(os.path.basename(filename))[0] + FORMATS[to]
+    try:
+        with open(os.path.join(output, name), 'w', encoding='utf-8') as f:
+            if to == 'cabrillo':
+                result.write(f)
+            elif to == 'adif':
+                write_adif(result.qso, f)
+            else:
+                write_jsonl(result, f)
+    except (CabrilloParserException, OSError) as e:
+        return filename, e
+    return filename, len(result.qso)
+
+
+def _print(line):
+    print(line, flush=True)
+
+
+def _error(filename, e):
+    print('{}: {}'.format(filename, e), file=sys.stderr, flush=True)
+
+
+def _validate_command(args, options):
+    """Print every error of each log. Returns (ok, files, QSOs)."""
+    ok, files, qsos = True, 0, 0
+    for filename, report in _imap(
+            functools.partial(_validate, options=options),
+            log_files(args.paths), args.jobs):
+        files += 1
+        if isinstance(report, Exception):
+            _error(filename, report)
+            ok = False
+            continue
+        qsos += report.qso_count
+        for error in report.errors:
+            _print('{}:{}:{}: {}'.format(filename, error.line, error.column,
+                                         error.exception))
+        ok = ok and report.valid
+    return ok, files, qsos
+
+
+def _stats_command(args, options):
+    """Print the stats of each log as a JSON line."""
+    ok, files, qsos = True, 0, 0
+    for filename, result in _imap(functools.partial(_stats, options=options),
+                                  log_files(args.paths), args.jobs):
+        files += 1
+        if isinstance(result, Exception):
+            _error(filename, result)
+            ok = False
+            continue
+        qsos += result['qsos']
+        _print(json.dumps(dict(file=filename, **result)))
+    return ok, files, qsos
+
+
+def _convert_command(args, options):
+    """Convert each log, printing the number of QSOs converted."""
+    ok, files, qsos = True, 0, 0
+    if args.to != 'sqlite':
+        os.makedirs(args.output, exist_ok=True)
+    results = _imap(functools.partial(_convert, options=options, to=args.to,
+                                      output=args.output),
+                    log_files(args.paths), args.jobs)
+
+    def converted():
+        nonlocal ok, files, qsos
+        for filename, result in results:
+            files += 1
+            if isinstance(result, Exception):
+                _error(filename, result)
+                ok = False
+                continue
+            count = result if isinstance(result, int) else len(result.qso)
+            qsos += count
+            if not isinstance(result, int):
+                # Stored by save_logs below.
+                yield result
+            _print('{}: {} QSOs'.format(filename, count))
+
+    if args.to == 'sqlite':
+        connection = sqlite3.connect(args.output)
+        try:
+            create_schema(connection)
+            save_logs(connection, converted())
+        finally:
+            connection.close()
+    else:
+        collections.deque(converted(), maxlen=0)
+    return ok, files, qsos
+
+
+def _crosscheck_command(args, options):
+    """Cross-check all logs, printing the status counts of each log as a
+    JSON line."""
+    ok, files, qsos = True, 0, 0
+    index = CrossCheckIndex(args.max_time_delta, not args.no_check_exch,
+                            not args.no_check_band)
+    filenames = dict()
+    for filename, result in _imap(functools.partial(_parse, options=options),
+                                  log_files(args.paths), args.jobs):
+        files += 1
+        if isinstance(result, Exception):
+            _error(filename, result)
+            ok = False
+            continue
+        if not result.callsign:
+            _error(filename, 'No CALLSIGN, skipped.')
+            ok = False
+            continue
+        if result.callsign in filenames:
+            _error(filename, 'Replaces the log of {} in {}.'.format(
+                result.callsign, filenames[result.callsign]))
+        qsos += len(result.qso)
+        filenames[result.callsign] = filename
+        index.add_log(result)
+
+    for callsign, filename in filenames.items():
+        statuses = index.results(callsign)
+        counts = collections.Counter(status for status in statuses if status)
+        line = dict(file=filename, callsign=callsign, **counts)
+        if args.details:
+            line['unmatched'] = [
+                dict(qso=str(qso), status=status)
+                for qso, status in zip(index.logs[callsign].qso, statuses)
+                if status not in (None, MATCHED)]
+        _print(json.dumps(line))
+    return ok, files, qsos
+
+
+def _parser():
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('paths', nargs='+', metavar='PATH',
+                        help='Log file or directory of log files.')
+    common.add_argument('-j', '--jobs', type=int, default=1,
+                        help='Number of worker processes. Defaults to 1.')
+    common.add_argument('--ignore-unknown-key', action='store_true',
+                        help='Ignore unknown header keywords.')
+    common.add_argument('--ignore-order', action='store_true',
+                        help='Accept QSOs that are not ordered by time.')
+    common.add_argument('--no-check-categories', dest='check_categories',
+                        action='store_false',
+                        help='Accept categories not in the specification.')
+    common.add_argument('--no-check-mode', dest='check_mode',
+                        action='store_false',
+                        help='Accept QSO modes not in the specification.')
+    common.add_argument('--encoding',
+                        help='Encoding of the logs. Defaults to UTF-8, '
+                             'falling back to Latin-1.')
+
+    parser = argparse.ArgumentParser(
+        prog='cabrillo', description='Process Cabrillo log files.')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    command = commands.add_parser(
+        'validate', parents=[common],
+        help='Report every error of each log as FILE:LINE:COLUMN: ERROR.')
+    command.set_defaults(func=_validate_command)
+
+    command = commands.add_parser(
+        'stats', parents=[common],
+        help='Print QSO counts and rates of each log as JSON lines.')
+    command.set_defaults(func=_stats_command)
+
+    command = commands.add_parser(
+        'convert', parents=[common],
+        help='Convert logs to Cabrillo, ADIF, JSON lines or SQLite.')
+    command.add_argument('--to', choices=sorted(FORMATS), required=True,
+                         help='Output format.')
+    command.add_argument('-o', '--output', required=True,
+                         help='Output directory, or database file for '
+                              'sqlite.')
+    command.set_defaults(func=_convert_command)
+
+    command = commands.add_parser(
+        'crosscheck', parents=[common],
+        help='Cross-check logs against each other. Prints the number of '
+             'matched, busted, nil and unverified QSOs of each log as JSON '
+             'lines.')
+    command.add_argument('--max-time-delta', type=int, default=30,
+                         help='Maximum time difference of matching QSOs in '
+                              'minutes. Defaults to 30.')
+    command.add_argument('--no-check-exch', action='store_true',
+                         help='Do not compare exchanges.')
+    command.add_argument('--no-check-band', action='store_true',
+                         help='Do not compare bands.')
+    command.add_argument('--details', action='store_true',
+                         help='List the QSOs that did not match.')
+    command.set_defaults(func=_crosscheck_command)
+    return parser
+
+
+def main(argv=None):
+    """Run the command-line interface.
+
+    Arguments:
+        argv: List of arguments. Defaults to sys.argv[1:].
+
+    Returns:
+        int: Exit status, 1 if a log is invalid or failed to process.
+    """
+    args = _parser().parse_args(argv)
+    options = dict(ignore_unknown_key=args.ignore_unknown_key,
+                   check_categories=args.check_categories,
+                   ignore_order=args.ignore_order,
+                   check_mode=args.check_mode, encoding=args.encoding)
+
+    start = time.perf_counter()
+    ok, files, qsos = args.func(args, options)
+    seconds = time.perf_counter() - start
+    print('{}: {} files, {} QSOs in {:.2f} s ({:.0f} QSOs/s)'.format(
+        args.command, files, qsos, seconds, qsos / seconds if seconds else 0),
+        file=sys.stderr)
+    return 0 if ok else 1
@@ -0,0 +1,391 @@
+"""Contains utilities to export QSOs column-wise, e.g. for dataframes.
+
+QSOColumns keeps the QSOs of any number of logs in stdlib array buffers.
+Strings are dictionary-encoded, i.e. stored once in a string table and
+referenced by index. Logs can be added straight from their text without
+constructing QSO objects.
+
+If pyarrow is installed, the columns can be converted to a pyarrow.Table
+and written as Arrow IPC or Parquet. Without it, save() writes the raw
+buffers and a JSON description, e.g. for numpy.fromfile.
+"""
+import array
+import itertools
+import json
+import os.path
+import sys
+from datetime import datetime
+
+from cabrillo import data
+from cabrillo.errors import InvalidLogException, InvalidQSOException
+from cabrillo.parser import decode_log, parse_log_text, split_qso
+from cabrillo.qso import _EPOCH_ORDINAL, _epoch_minute, frequency_to_band
+
+try:
+    import pyarrow
+    import pyarrow.compute
+    import pyarrow.ipc
+    import pyarrow.parquet
+except ImportError:  # pragma: no cover
+    pyarrow = None
+
+STRING_COLUMNS = ('log', 'band', 'mo', 'de_call', 'dx_call')
+NUMBER_COLUMNS = ('freq', 'minute', 't', 'valid')
+EXCHANGE_COLUMNS = ('de_exch', 'dx_exch')
+
+if pyarrow is not None:
+    # Array type codes used for the buffers to Arrow types.
+    _ARROW_TYPES = {'b': pyarrow.int8(), 'i': pyarrow.int32(),
+                    'q': pyarrow.int64()}
+
+
+class StringColumn:
+    """Dictionary-encoded column of strings.
+
+    Attributes:
+        codes: array of the index in values of each row.
+        values: List of the distinct strings in order of appearance.
+    """
+
+    def __init__(self):
+        self.codes = array.array('i')
+        self.values = []
+        self._index = dict()
+
+    def code(self, value):
+        """Return the index of value in values, adding it if needed."""
+        code = self._index.get(value)
+        if code is None:
+            code = self._index[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def extend(self, values):
+        """Append values, a list of strings."""
+        for value in dict.fromkeys(values):
+            self.code(value)
+        self.codes.extend(map(self._index.__getitem__, values))
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __getitem__(self, index):
+        return self.values[self.codes[index]]
+
+
+class ExchangeColumn:
+    """Column of lists of exchange tokens.
+
+    Attributes:
+        offsets: array of the start of each row in tokens, followed by the
+            end of the last row.
+        tokens: StringColumn of all tokens of all rows.
+    """
+
+    def __init__(self):
+        self.offsets = array.array('q', [0])
+        self.tokens = StringColumn()
+
+    def extend(self, rows):
+        """Append rows, a list of lists of tokens."""
+        self.offsets.extend(itertools.accumulate(
+            map(len, rows), initial=self.offsets[-1]))
+        # accumulate repeats the initial offset.
+        del self.offsets[-len(rows) - 1]
+        self.tokens.extend(list(itertools.chain.from_iterable(rows)))
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index):
+        return [self.tokens[i] for i in range(self.offsets[index],
+                                              self.offsets[index + 1])]
+
+
+class QSOColumns:
+    """The QSOs of one or more logs in column buffers.
+
+    Attributes:
+        log: StringColumn of the callsign of the log of each QSO.
+        freq: array of the frequency in kHz, 0 if not numeric (e.g. LIGHT).
+        band: StringColumn of the band designation per frequency_to_band.
+        mo: StringColumn of the mode.
+        minute: array of the minutes since the epoch (UTC).
+        de_call: StringColumn of the sent callsign.
+        de_exch: ExchangeColumn of the sent exchange.
+        dx_call: StringColumn of the received callsign.
+        dx_exch: ExchangeColumn of the received exchange.
+        t: array of the transmitter ID, -1 if not given.
+        valid: array of 1 for valid QSOs and 0 for X-QSOs.
+    """
+
+    def __init__(self):
+        for name in STRING_COLUMNS:
+            setattr(self, name, StringColumn())
+        for name in EXCHANGE_COLUMNS:
+            setattr(self, name, ExchangeColumn())
+        self.freq = array.array('q')
+        self.minute = array.array('q')
+        self.t = array.array('b')
+        self.valid = array.array('b')
+        # Frequency to (number, band) and date to epoch minute of the day.
+        self._freqs = dict()
+        self._days = dict()
+
+    def __len__(self):
+        return len(self.minute)
+
+    def _extend(self, log, freq, mo, minute, de_call, de_exch, dx_call,
+                dx_exch, t, valid):
+        """Append rows given as one list per column."""
+        freqs = self._freqs
+        for f in dict.fromkeys(freq):
+            if f not in freqs:
+                freqs[f] = (int(f) if f.isdigit() else 0,
+                            self.band.code(frequency_to_band(f)))
+        self.freq.extend([freqs[f][0] for f in freq])
+        self.band.codes.extend([freqs[f][1] for f in freq])
+        self.log.extend([log] * len(freq))
+        self.mo.extend(mo)
+        self.minute.extend(minute)
+        self.de_call.extend(de_call)
+        self.de_exch.extend(de_exch)
+        self.dx_call.extend(dx_call)
+        self.dx_exch.extend(dx_exch)
+        self.t.extend([-1 if x is None else x for x in t])
+        self.valid.extend(valid)
+
+    def add_qsos(self, qsos, log=None):
+        """Add QSOs.
+
+        Arguments:
+            qsos: Iterable of cabrillo.QSO.
+            log: Callsign of the log the QSOs are from.
+        """
+        qsos = list(qsos)
+        if not qsos:
+            return
+        self._extend(log, [qso.freq for qso in qsos],
+                     [qso.mo for qso in qsos],
+                     [_epoch_minute(qso.date) for qso in qsos],
+                     [qso.de_call for qso in qsos],
+                     [qso.de_exch for qso in qsos],
+                     [qso.dx_call for qso in qsos],
+                     [qso.dx_exch for qso in qsos],
+                     [qso.t for qso in qsos], [qso.valid for qso in qsos])
+
+    def add_log(self, cab):
+        """Add the QSOs of a cabrillo.Cabrillo."""
+        self.add_qsos(cab.qso, cab.callsign)
+
+    def add_log_text(self, text, ignore_unknown_key=False,
+                     check_categories=True, ignore_order=False,
+                     check_mode=True):
+        """Parse a Cabrillo log in text form and add its QSOs.
+
+        QSO lines are split straight into the columns without constructing
+        QSO objects. They are checked like parse_log_text does. The columns
+        are unchanged if the log is invalid.
+
+        Arguments:
+            See parse_log_text.
+
+        Returns:
+            cabrillo.Cabrillo: The log with its QSOs not parsed, see lazy in
+                parse_log_text.
+
+        Raises:
+            InvalidQSOException, InvalidLogException
+        """
+        cab = parse_log_text(text, ignore_unknown_key, check_categories,
+                             ignore_order, check_mode, lazy=True)
+        rows = []
+        previous = None
+        for start, stop, valid in cab.qso.iter_spans():
+            components, middle, end, t = split_qso(text[start:stop])
+            mo = components[1]
+            if check_mode and mo not in data.MODES:
+                raise InvalidQSOException('{} is not a valid mode.'.format(mo))
+            minute = self._minute(components[2], components[3])
+            if previous is not None and minute < previous \
+                    and not ignore_order:
+                raise InvalidLogException("QSOs need to be ordered time-wise.")
+            previous = minute
+            rows.append((components[0], mo, minute, components[4],
+                         components[5:middle], components[middle],
+                         components[middle + 1:end], t, valid))
+
+        if rows:
+            self._extend(cab.callsign, *map(list, zip(*rows)))
+        return cab
+
+    def add_log_file(self, filename, encoding=None, **kwargs):
+        """Parse a Cabrillo log file and add its QSOs.
+
+        Arguments:
+            filename: filename of the target log file.
+            encoding: See parse_log_file.
+            See add_log_text for the other arguments.
+
+        Returns:
+            cabrillo.Cabrillo, see add_log_text.
+
+        Raises:
+            InvalidQSOException, InvalidLogException
+        """
+        with open(filename, 'rb') as f:
+            return self.add_log_text(decode_log(f.read(), encoding), **kwargs)
+
+    def _minute(self, date, time):
+        """Return the epoch minute of the date and time of a QSO line.
+
+        Parsing dates is the expensive part of parsing QSOs, so each date is
+        parsed once and times are converted by hand.
+        """
+        day = self._days.get(date)
+        if day is not None and len(time) == 4 and time.isascii() \
+                and time.isdigit():
+            hour, minute = int(time[:2]), int(time[2:])
+            if hour < 24 and minute < 60:
+                return day + hour * 60 + minute
+
+        try:
+            parsed = datetime.strptime('{} {}'.format(date, time),
+                                       '%Y-%m-%d %H%M')
+        except ValueError as e:
+            raise InvalidQSOException(
+                'Unable to parse QSO date/time "{} {}": {}'.format(
+                    date, time, e))
+        self._days[date] = (parsed.toordinal() - _EPOCH_ORDINAL) * 1440
+        return _epoch_minute(parsed)
+
+    def to_pydict(self):
+        """Return the columns as a dict of lists, e.g. for
+        pandas.DataFrame."""
+        result = dict()
+        for name in STRING_COLUMNS:
+            column = getattr(self, name)
+            result[name] = [column.values[code] for code in column.codes]
+        for name in NUMBER_COLUMNS:
+            result[name] = getattr(self, name).tolist()
+        result['t'] = [None if t == -1 else t for t in result['t']]
+        result['valid'] = [bool(valid) for valid in result['valid']]
+        for name in EXCHANGE_COLUMNS:
+            column = getattr(self, name)
+            result[name] = [column[i] for i in range(len(column))]
+        return result
+
+    def to_arrow(self):
+        """Return the columns as a pyarrow.Table.
+
+        String columns become dictionary arrays, the buffers are not copied
+        row by row.
+
+        Raises:
+            ImportError if pyarrow is not installed.
+        """
+        if pyarrow is None:
+            raise ImportError('pyarrow is required for Arrow output.')
+
+        def numbers(buffer):
+            # Wraps the buffer without converting element by element.
+            return pyarrow.Array.from_buffers(
+                _ARROW_TYPES[buffer.typecode], len(buffer),
+                [None, pyarrow.py_buffer(buffer)])
+
+        def strings(column):
+            return pyarrow.DictionaryArray.from_arrays(
+                numbers(column.codes),
+                pyarrow.array(column.values, pyarrow.string()))
+
+        def exchanges(column):
+            return pyarrow.LargeListArray.from_arrays(
+                numbers(column.offsets), strings(column.tokens))
+
+        t = numbers(self.t)
+        return pyarrow.table({
+            'log': strings(self.log),
+            'freq': numbers(self.freq),
+            'band': strings(self.band),
+            'mo': strings(self.mo),
+            'minute': numbers(self.minute),
+            'de_call': strings(self.de_call),
+            'de_exch': exchanges(self.de_exch),
+            'dx_call': strings(self.dx_call),
+            'dx_exch': exchanges(self.dx_exch),
+            't': pyarrow.compute.if_else(pyarrow.compute.equal(t, -1),
+                                         None, t),
+            'valid': numbers(self.valid).cast(pyarrow.bool_()),
+        })
+
+    def write_arrow(self, filename):
+        """Write the columns as an Arrow IPC file. Requires pyarrow."""
+        table = self.to_arrow()
+        with pyarrow.OSFile(filename, 'wb') as sink:
+            with pyarrow.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+
+    def write_parquet(self, filename):
+        """Write the columns as a Parquet file. Requires pyarrow."""
+        pyarrow.parquet.write_table(self.to_arrow(), filename)
+
+    def save(self, directory):
+        """Write the raw buffers to a directory without third-party
+        libraries.
+
+        Each array is written to `<name>.bin` in native byte order. The
+        string tables, the array type codes and the byte order go to
+        columns.json.
+        """
+        os.makedirs(directory, exist_ok=True)
+        buffers = dict(freq=self.freq, minute=self.minute, t=self.t,
+                       valid=self.valid)
+        strings = dict()
+        for name in STRING_COLUMNS:
+            buffers[name] = getattr(self, name).codes
+            strings[name] = getattr(self, name).values
+        for name in EXCHANGE_COLUMNS:
+            buffers[name + '_offsets'] = getattr(self, name).offsets
+            buffers[name + '_tokens'] = getattr(self, name).tokens.codes
+            strings[name] = getattr(self, name).tokens.values
+
+        for name, buffer in buffers.items():
+            with open(os.path.join(directory, name + '.bin'), 'wb') as f:
+                buffer.tofile(f)
+        with open(os.path.join(directory, 'columns.json'), 'w',
+                  encoding='utf-8') as f:
+            json.dump(dict(rows=len(self), byteorder=sys.byteorder,
+                           typecodes={name: buffer.typecode
+                                      for name, buffer in buffers.items()},
+                           strings=strings), f)
+
+    @classmethod
+    def load(cls, directory):
+        """Read columns written by save()."""
+        with open(os.path.join(directory, 'columns.json'),
+                  encoding='utf-8') as f:
+            meta = json.load(f)
+
+        def read(name):
+            buffer = array.array(meta['typecodes'][name])
+            with open(os.path.join(directory, name + '.bin'), 'rb') as f:
+                buffer.frombytes(f.read())
+            if meta['byteorder'] != sys.byteorder:
+                buffer.byteswap()
+            return buffer
+
+        def strings(column, name, values):
+            column.codes = read(name)
+            column.values = values
+            column._index = {value: i for i, value in enumerate(values)}
+
+        columns = cls()
+        for name in NUMBER_COLUMNS:
+            setattr(columns, name, read(name))
+        for name in STRING_COLUMNS:
+            strings(getattr(columns, name), name, meta['strings'][name])
+        for name in EXCHANGE_COLUMNS:
+            column = getattr(columns, name)
+            column.offsets = read(name + '_offsets')
+            strings(column.tokens, name + '_tokens', meta['strings'][name])
+        return columns
@@ -0,0 +1,241 @@
+"""Contains contest-wide statistics over the logs of all stations.
+
+Log checkers flag "unique" calls, worked by only one station in the whole
+contest, as they are likely busted. CallCounter counts the stations that
+worked each call. ExchangeChecker finds stations logged with inconsistent
+exchanges. Both take one log at a time, so the logs need not be held in
+memory together.
+"""
+import array
+import collections
+import hashlib
+import sys
+
+
+class CallCounter:
+    """Number of stations that worked each callsign.
+
+    Each log counts a callsign once, no matter how often its valid QSOs
+    worked it. Callsigns are compared case-insensitively.
+
+    In exact mode, counts are kept in a dict of interned callsigns. In
+    approximate mode, they are kept in a count-min sketch of width * depth
+    counters: memory does not grow with the number of callsigns and counts
+    are never too low, but can be too high when callsigns collide.
+
+    Counters are picklable, so each worker process can count a share of the
+    logs and the results can be combined with merge().
+
+    Attributes:
+        logs: Number of logs counted.
+        width: Counters per row of the sketch, None in exact mode.
+        depth: Rows of the sketch, None in exact mode.
+    """
+
+    def __init__(self, width=None, depth=4):
+        """Construct an empty CallCounter.
+
+        Arguments:
+            width: Counters per row for approximate mode. Defaults to exact
+                mode. The expected overcount of a callsign is about
+                e / width times the number of callsigns counted.
+            depth: Number of rows for approximate mode. A count is too high
+                with probability of about e ** -depth.
+        """
+        self.logs = 0
+        self.width = width
+        self.depth = depth if width else None
+        if width:
+            self._sketch = array.array('L', bytes(
+                array.array('L').itemsize * width * depth))
+        else:
+            self._counts = collections.Counter()
+
+    def _cells(self, call):
+        """Return the index of the sketch counter of call in each row."""
+        # Two 64-bit hashes, stable across processes unlike hash(), combined
+        # into depth hashes by double hashing.
+        digest = hashlib.blake2b(call.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return [row * self.width + (h1 + row * h2) % self.width
+                for row in range(self.depth)]
+
+    def add(self, call, count=1):
+        """Count a callsign as worked by count more stations."""
+        call = call.upper()
+        if self.width:
+            for cell in self._cells(call):
+                self._sketch[cell] += count
+        else:
+            self._counts[sys.intern(call)] += count
+
+    def add_log(self, cab):
+        """Count the callsigns worked in the valid QSOs of a log.
+
+        Arguments:
+            cab: cabrillo.Cabrillo
+        """
+        for call in {qso.dx_call.upper() for qso in cab.valid_qso}:
+            self.add(call)
+        self.logs += 1
+
+    def __getitem__(self, call):
+        """Return the number of stations that worked call. In approximate
+        mode, this is an upper bound."""
+        call = call.upper()
+        if self.width:
+            return min(self._sketch[cell] for cell in self._cells(call))
+        return self._counts.get(call, 0)
+
+    def merge(self, other):
+        """Add the counts of another CallCounter of the same mode and size.
+
+        Raises:
+            ValueError if the counters are not compatible.
+        """
+        if (self.width, self.depth) != (other.width, other.depth):
+            raise ValueError('Cannot merge CallCounter of width {} and depth '
+                             '{} into one of width {} and depth {}.'.format(
+                                 other.width, other.depth, self.width,
+                                 self.depth))
+        if self.width:
+            sketch = self._sketch
+            for cell, count in enumerate(other._sketch):
+                if count:
+                    sketch[cell] += count
+        else:
+            for call, count in other._counts.items():
+                self._counts[sys.intern(call)] += count
+        self.logs += other.logs
+
+    def uniques(self, calls=None):
+        """Return the callsigns worked by only one station.
+
+        Arguments:
+            calls: Callsigns to check. Defaults to all callsigns counted,
+                which is only possible in exact mode.
+
+        Returns:
+            list of upper-cased callsigns. In approximate mode, a unique
+            callsign may be missed, but no other callsign is returned.
+
+        Raises:
+            ValueError if calls is not given in approximate mode.
+        """
+        if calls is None:
+            if self.width:
+                raise ValueError('Approximate CallCounter cannot list the '
+                                 'callsigns counted.')
+            return [call for call, count in self._counts.items()
+                    if count == 1]
+        return [call for call in dict.fromkeys(c.upper() for c in calls)
+                if self[call] == 1]
+
+    def unique_qsos(self, cab):
+        """Return the valid QSOs of a counted log with a callsign worked by
+        no other station."""
+        return [qso for qso in cab.valid_qso if self[qso.dx_call] <= 1]
+
+
+class ExchangeChecker:
+    """Checks that each station was logged with a consistent exchange.
+
+    The received exchanges of all valid QSOs are counted per callsign worked
+    in one pass over the logs. The most frequent exchange of a callsign is
+    taken as its correct exchange, and QSOs logging another exchange are
+    outliers. Exchanges are compared case-insensitively, like
+    QSO.match_against does.
+
+    Checkers are picklable and can be combined with merge(), like
+    CallCounter.
+
+    Attributes:
+        fields: Indexes of the exchange components compared, e.g. (1,) to
+            only compare the zone of an `RST zone` exchange. None compares
+            all components.
+        min_count: Minimum number of QSOs with a callsign for its exchange
+            to be checked.
+    """
+
+    def __init__(self, fields=None, min_count=2):
+        self.fields = tuple(fields) if fields is not None else None
+        self.min_count = min_count
+        # Callsign to Counter of exchange tuples.
+        self._exchanges = collections.defaultdict(collections.Counter)
+
+    def _exchange(self, qso):
+        """Return the compared exchange components of a QSO as a tuple."""
+        exch = qso.key.dx_exch
+        if self.fields is None:
+            return tuple(sys.intern(x) for x in exch)
+        return tuple(sys.intern(exch[i]) if i < len(exch) else ''
+                     for i in self.fields)
+
+    def add(self, qso):
+        """Count the received exchange of a QSO."""
+        self._exchanges[sys.intern(qso.key.dx_call)][self._exchange(qso)] += 1
+
+    def add_log(self, cab):
+        """Count the received exchanges of the valid QSOs of a log."""
+        for qso in cab.valid_qso:
+            self.add(qso)
+
+    def merge(self, other):
+        """Add the counts of another ExchangeChecker comparing the same
+        fields.
+
+        Raises:
+            ValueError if the checkers compare different fields.
+        """
+        if self.fields != other.fields:
+            raise ValueError('Cannot merge ExchangeChecker of fields {} into '
+                             'one of fields {}.'.format(other.fields,
+                                                        self.fields))
+        for call, exchanges in other._exchanges.items():
+            self._exchanges[call].update(exchanges)
+
+    def majority(self, call):
+        """Return the most frequent exchange of a callsign.
+
+        Returns:
+            tuple of the exchange components, or None if the callsign was
+            worked less than min_count times or the most frequent exchanges
+            are tied.
+        """
+        exchanges = self._exchanges.get(call.upper())
+        if not exchanges or sum(exchanges.values()) < self.min_count:
+            return None
+        top = exchanges.most_common(2)
+        if len(top) > 1 and top[0][1] == top[1][1]:
+            return None
+        return top[0][0]
+
+    def inconsistent(self):
+        """Generate the callsigns logged with more than one exchange.
+
+        Yields:
+            (callsign, majority exchange or None, Counter of exchanges)
+            tuple.
+        """
+        for call, exchanges in self._exchanges.items():
+            if len(exchanges) > 1:
+                yield call, self.majority(call), exchanges
+
+    def outliers(self, cab):
+        """Return the valid QSOs of a log whose exchange differs from the
+        majority exchange of the station worked.
+
+        Returns:
+            list of (cabrillo.QSO, majority exchange) tuples.
+        """
+        result = []
+        for qso in cab.valid_qso:
+            call = qso.key.dx_call
+            if len(self._exchanges.get(call, ())) < 2:
+                # Consistent, or not counted.
+                continue
+            majority = self.majority(call)
+            if majority is not None and self._exchange(qso) != majority:
+                result.append((qso, majority))
+        return result
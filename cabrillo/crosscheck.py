@@ -0,0 +1,139 @@
+"""Contains utilities to cross-check the logs of a contest against each other.
+
+Each valid QSO of a log gets one of the following statuses:
+
+    MATCHED: The log of the station worked has a QSO that matches it per
+        QSO.match_against.
+    BUSTED: The log of the station worked has QSOs between the two stations,
+        but none matches, e.g. because of a wrong exchange or time.
+    NIL: The log of the station worked has no QSO with this station
+        ("not in log").
+    UNVERIFIED: The station worked did not submit a log.
+"""
+import collections
+
+MATCHED = 'matched'
+BUSTED = 'busted'
+NIL = 'nil'
+UNVERIFIED = 'unverified'
+
+
+def qso_status(qso, candidates, max_time_delta=30, check_exch=True,
+               check_band=True):
+    """Return the cross-check status of a QSO.
+
+    Arguments:
+        qso: cabrillo.QSO to check.
+        candidates: List of the QSOs of the other station's log between the
+            two stations, or None if the other station did not submit a log.
+        See QSO.match_against for the other arguments.
+
+    Returns:
+        One of MATCHED, BUSTED, NIL or UNVERIFIED.
+    """
+    if candidates is None:
+        return UNVERIFIED
+    if not candidates:
+        return NIL
+    for other in candidates:
+        if qso.match_against(other, max_time_delta, check_exch, check_band):
+            return MATCHED
+    return BUSTED
+
+
+class CrossCheckIndex:
+    """Index of the logs of a contest for cross-checking.
+
+    Logs are identified by their callsign. When a log is added, removed or
+    replaced, only the results of that log and of the logs that worked its
+    station are recomputed.
+
+    Attributes:
+        logs: dict of callsign to cabrillo.Cabrillo of all indexed logs.
+    """
+
+    def __init__(self, max_time_delta=30, check_exch=True, check_band=True):
+        """Construct an empty CrossCheckIndex.
+
+        Arguments:
+            See QSO.match_against.
+        """
+        self.max_time_delta = max_time_delta
+        self.check_exch = check_exch
+        self.check_band = check_band
+        self.logs = dict()
+        # Per log: (de_call, dx_call) to the valid QSOs with these calls.
+        self._pairs = dict()
+        # Callsign worked to the callsigns of the logs that worked it.
+        self._worked_by = collections.defaultdict(set)
+        self._results = dict()
+
+    def add_log(self, cab):
+        """Add a log, replacing a log with the same callsign.
+
+        Returns:
+            set of the callsigns of the logs whose results changed.
+        """
+        affected = self.remove_log(cab.callsign)
+
+        pairs = collections.defaultdict(list)
+        for qso in cab.valid_qso:
+            pairs[qso.de_call, qso.dx_call].append(qso)
+        self.logs[cab.callsign] = cab
+        self._pairs[cab.callsign] = pairs
+        for _, dx_call in pairs:
+            self._worked_by[dx_call].add(cab.callsign)
+
+        return affected | self._invalidate(cab.callsign)
+
+    replace_log = add_log
+
+    def remove_log(self, callsign):
+        """Remove the log of callsign, if indexed.
+
+        Returns:
+            set of the callsigns of the logs whose results changed.
+        """
+        if callsign not in self.logs:
+            return set()
+
+        for _, dx_call in self._pairs.pop(callsign):
+            self._worked_by[dx_call].discard(callsign)
+            if not self._worked_by[dx_call]:
+                del self._worked_by[dx_call]
+        del self.logs[callsign]
+        return self._invalidate(callsign)
+
+    def _invalidate(self, callsign):
+        """Forget the results affected by a change to the log of callsign."""
+        affected = set(self._worked_by.get(callsign, ()))
+        if callsign in self.logs:
+            affected.add(callsign)
+        for call in affected:
+            self._results.pop(call, None)
+        self._results.pop(callsign, None)
+        return affected
+
+    def candidates(self, qso):
+        """Return the QSOs of the other station's log between the two
+        stations, or None if the other station did not submit a log."""
+        pairs = self._pairs.get(qso.dx_call)
+        if pairs is None:
+            return None
+        return pairs.get((qso.dx_call, qso.de_call), [])
+
+    def results(self, callsign):
+        """Return the cross-check results of a log, computing them if needed.
+
+        Returns:
+            list with the status of each QSO in Cabrillo.qso. X-QSOs have
+            the status None.
+        """
+        results = self._results.get(callsign)
+        if results is None:
+            results = [qso_status(qso, self.candidates(qso),
+                                  self.max_time_delta, self.check_exch,
+                                  self.check_band) if qso.valid else None
+                       for qso in self.logs[callsign].qso]
+            self._results[callsign] = results
+        return results
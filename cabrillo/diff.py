@@ -0,0 +1,113 @@
+"""Contains utilities to compare two versions of the same log."""
+import collections
+
+LogDiff = collections.namedtuple('LogDiff', ['added', 'removed', 'modified',
+                                             'headers'])
+LogDiff.__doc__ = """Differences between two versions of a log.
+
+Attributes:
+    added: List of QSOs only in the new log.
+    removed: List of QSOs only in the old log.
+    modified: List of (old QSO, new QSO) tuples of QSOs with the same time
+        and received callsign that differ otherwise.
+    headers: dict of header keyword to (old values, new values) for each
+        keyword whose values differ. Values are lists of str in log order.
+"""
+
+
+def _minute_groups(qsos):
+    """Yield (minute, list of QSOs) of QSOs ordered by time."""
+    group = []
+    minute = None
+    for qso in sorted(qsos, key=lambda qso: qso.date):
+        if qso.key.minute != minute and group:
+            yield minute, group
+            group = []
+        minute = qso.key.minute
+        group.append(qso)
+    if group:
+        yield minute, group
+
+
+def _diff_group(old, new, diff):
+    """Compare QSOs of the same minute."""
+    # Identical QSOs, found by hash.
+    unchanged = collections.defaultdict(list)
+    for qso in old:
+        unchanged[qso, qso.valid, qso.t].append(qso)
+    new_left = []
+    for qso in new:
+        if unchanged.get((qso, qso.valid, qso.t)):
+            unchanged[qso, qso.valid, qso.t].pop(0)
+        else:
+            new_left.append(qso)
+    old_left = [qso for qsos in unchanged.values() for qso in qsos]
+    if not old_left or not new_left:
+        diff.removed.extend(old_left)
+        diff.added.extend(new_left)
+        return
+
+    # Changed QSOs with the same station worked.
+    by_call = collections.defaultdict(list)
+    for qso in old_left:
+        by_call[qso.key.dx_call].append(qso)
+    for qso in new_left:
+        if by_call.get(qso.key.dx_call):
+            diff.modified.append((by_call[qso.key.dx_call].pop(0), qso))
+        else:
+            diff.added.append(qso)
+    diff.removed.extend(qso for qsos in by_call.values() for qso in qsos)
+
+
+def _header_values(cab):
+    values = collections.OrderedDict()
+    for keyword, value in cab.header_items():
+        values.setdefault(keyword, []).append(str(value))
+    return values
+
+
+def diff_logs(old, new):
+    """Compare two versions of the same log, e.g. a resubmitted log.
+
+    QSOs are walked minute by minute in time order, and QSOs of the same
+    minute are compared by hash, so this takes linear time for ordered logs.
+    QSOs count as unchanged if they are equal and have the same valid flag
+    and transmitter ID. A QSO whose time was corrected shows up as removed
+    and added.
+
+    Arguments:
+        old: cabrillo.Cabrillo
+        new: cabrillo.Cabrillo
+
+    Returns:
+        LogDiff
+    """
+    diff = LogDiff([], [], [], dict())
+
+    old_groups = _minute_groups(old.qso)
+    new_groups = _minute_groups(new.qso)
+    old_group = next(old_groups, None)
+    new_group = next(new_groups, None)
+    while old_group is not None or new_group is not None:
+        if new_group is None or \
+                (old_group is not None and old_group[0] < new_group[0]):
+            diff.removed.extend(old_group[1])
+            old_group = next(old_groups, None)
+        elif old_group is None or new_group[0] < old_group[0]:
+            diff.added.extend(new_group[1])
+            new_group = next(new_groups, None)
+        else:
+            _diff_group(old_group[1], new_group[1], diff)
+            old_group = next(old_groups, None)
+            new_group = next(new_groups, None)
+
+    old_headers = _header_values(old)
+    new_headers = _header_values(new)
+    for keyword in list(old_headers) + [k for k in new_headers
+                                        if k not in old_headers]:
+        old_values = old_headers.get(keyword, [])
+        new_values = new_headers.get(keyword, [])
+        if old_values != new_values:
+            diff.headers[keyword] = (old_values, new_values)
+
+    return diff
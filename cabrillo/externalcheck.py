@@ -0,0 +1,208 @@
+"""Contains an out-of-core cross-check for contests too large for memory.
+
+crosscheck_external reads each log once and writes a record per valid QSO:
+once as a candidate in the log of its station, once as a query to the log of
+the station worked. Records are buffered up to a memory budget, sorted and
+spilled to run files on disk. The runs are then merged with heapq.merge, so
+the candidates of a call pair come right before the queries for them, and
+each query is checked against them while reading sequentially.
+
+The statuses are the same as those of cabrillo.crosscheck.CrossCheckIndex,
+with QSOs compared like QSO.match_against. Callsigns, modes, frequencies and
+exchange components must not contain whitespace, which parsed logs never
+do.
+"""
+import heapq
+import itertools
+import mmap
+import os
+import sys
+import tempfile
+
+from cabrillo.crosscheck import BUSTED, MATCHED, NIL, UNVERIFIED
+from cabrillo.qso import _epoch_minute
+
+# Status of each status code in the results file.
+STATUSES = (None, MATCHED, BUSTED, NIL, UNVERIFIED)
+
+# Maximum number of runs merged at once. More runs are merged in passes.
+MAX_FAN_IN = 64
+
+_CANDIDATE = '0'
+_QUERY = '1'
+
+
+def _records(cab, log):
+    """Generate the candidate and query records of the valid QSOs of a log.
+
+    The fields of a record are its sort key (log callsign, de_call,
+    dx_call of the candidate), its kind, mode, time in microseconds since the
+    epoch, frequency, band, the exchanges, the log number and the QSO index.
+    """
+    for i, qso in enumerate(cab.qso):
+        if not qso.valid:
+            continue
+        key = qso.key
+        date = qso.date
+        fields = '\t'.join([
+            qso.mo,
+            str((_epoch_minute(date) * 60 + date.second) * 1000000
+                + date.microsecond),
+            qso.freq, key.band, ' '.join(key.de_exch), ' '.join(key.dx_exch),
+            str(log), str(i)])
+        if cab.callsign is not None:
+            yield '\t'.join([cab.callsign, qso.de_call, qso.dx_call,
+                             _CANDIDATE, fields]) + '\n'
+        yield '\t'.join([qso.dx_call, qso.dx_call, qso.de_call, _QUERY,
+                         fields]) + '\n'
+
+
+def _write_run(lines, directory, runs):
+    lines.sort()
+    fd, path = tempfile.mkstemp(suffix='.run', dir=directory)
+    with open(fd, 'w', encoding='utf-8', newline='') as f:
+        f.writelines(lines)
+    runs.append(path)
+    lines.clear()
+
+
+def _merge_runs(runs, directory):
+    """Merge runs in passes of at most MAX_FAN_IN runs, until MAX_FAN_IN or
+    fewer are left."""
+    while len(runs) > MAX_FAN_IN:
+        merged = []
+        for start in range(0, len(runs), MAX_FAN_IN):
+            group = runs[start:start + MAX_FAN_IN]
+            files = [open(path, encoding='utf-8', newline='')
+                     for path in group]
+            try:
+                fd, path = tempfile.mkstemp(suffix='.run', dir=directory)
+                with open(fd, 'w', encoding='utf-8', newline='') as f:
+                    f.writelines(heapq.merge(*files))
+            finally:
+                for file in files:
+                    file.close()
+            for old in group:
+                os.remove(old)
+            merged.append(path)
+        runs = merged
+    return runs
+
+
+def _matches(query, candidate, max_time_delta, check_exch, check_band):
+    """Return whether two records match, see QSO.match_against. Callsigns
+    match by the sort key."""
+    # Fields: 4 mode, 5 time, 6 freq, 7 band, 8 de_exch, 9 dx_exch.
+    if query[4] != candidate[4]:
+        return False
+    if max_time_delta != -1 and abs(int(query[5]) - int(candidate[5])) \
+            > max_time_delta * 60000000:
+        return False
+    if check_exch and (query[8] != candidate[9] or query[9] != candidate[8]):
+        return False
+    if check_band and query[6] != candidate[6] and query[7] != candidate[7]:
+        try:
+            return abs(int(query[6]) - int(candidate[6])) <= 500
+        except ValueError:
+            return False
+    return True
+
+
+def crosscheck_external(logs, memory=64 * 1024 * 1024, directory=None,
+                        max_time_delta=30, check_exch=True, check_band=True):
+    """Cross-check the logs of a contest without holding them in memory.
+
+    Arguments:
+        logs: Iterable of cabrillo.Cabrillo, read once, e.g. a generator
+            parsing one log file at a time. A log replaces an earlier log
+            with the same callsign, like in CrossCheckIndex.
+        memory: Approximate budget in bytes for the records held in memory
+            before they are spilled to disk. Defaults to 64 MiB.
+        directory: Directory for the temporary files. Defaults to the system
+            temporary directory.
+        See QSO.match_against for the other arguments.
+
+    Returns:
+        Generator of (callsign, list of statuses) tuples, one per log in the
+        order read. The statuses are those of CrossCheckIndex.results.
+
+    Raises:
+        ValueError: When a negative max_time_delta that is not -1 is
+            received.
+    """
+    if max_time_delta != -1 and max_time_delta < 0:
+        raise ValueError('Time delta should nonnegative. The only '
+                         'exception is -1, which would turn off time '
+                         'checking.')
+    return _crosscheck_external(logs, memory, directory, max_time_delta,
+                                check_exch, check_band)
+
+
+def _crosscheck_external(logs, memory, directory, max_time_delta, check_exch,
+                         check_band):
+    with tempfile.TemporaryDirectory(dir=directory) as directory:
+        # Per log: callsign and offset of its first QSO in the results.
+        callsigns = []
+        offsets = [0]
+        # Callsign to the number of its latest log.
+        latest = dict()
+        runs = []
+        lines = []
+        size = 0
+        for log, cab in enumerate(logs):
+            callsigns.append(cab.callsign)
+            offsets.append(offsets[-1] + len(cab.qso))
+            latest[cab.callsign] = log
+            for line in _records(cab, log):
+                lines.append(line)
+                # The str and its reference in the list.
+                size += sys.getsizeof(line) + 8
+                if size >= memory:
+                    _write_run(lines, directory, runs)
+                    size = 0
+        if lines:
+            _write_run(lines, directory, runs)
+        runs = _merge_runs(runs, directory)
+
+        # One status code per QSO, 0 (None) for X-QSOs.
+        with tempfile.TemporaryFile(dir=directory) as results_file:
+            results_file.truncate(max(offsets[-1], 1))
+            results = mmap.mmap(results_file.fileno(), 0)
+            files = [open(path, encoding='utf-8', newline='')
+                     for path in runs]
+            try:
+                records = (line[:-1].split('\t')
+                           for line in heapq.merge(*files))
+                for (owner, _, _), group in itertools.groupby(
+                        records, key=lambda record: record[:3]):
+                    owner_log = latest.get(owner)
+                    candidates = []
+                    for record in group:
+                        if record[3] == _CANDIDATE:
+                            if int(record[10]) == owner_log:
+                                candidates.append(record)
+                            continue
+                        log = int(record[10])
+                        if owner_log is None:
+                            status = 4
+                        elif not candidates:
+                            status = 3
+                        elif any(_matches(record, candidate, max_time_delta,
+                                          check_exch, check_band)
+                                 for candidate in candidates):
+                            status = 1
+                        else:
+                            status = 2
+                        results[offsets[log] + int(record[11])] = status
+            finally:
+                for file in files:
+                    file.close()
+
+            try:
+                for log, callsign in enumerate(callsigns):
+                    if latest[callsign] == log:
+                        yield callsign, [STATUSES[code] for code in
+                                         results[offsets[log]:
+                                                 offsets[log + 1]]]
+            finally:
+                results.close()
@@ -0,0 +1,59 @@
+"""Contains counters and timings collected while parsing logs."""
+
+import time
+
+
+class ParseStats:
+    """Counters and cumulative per-stage timings of parsing.
+
+    Pass an instance as `stats` to parse_log_text or parse_log_file. Passing
+    the same instance to several calls accumulates over all of them.
+
+    Attributes:
+        logs: Number of logs parsed.
+        lines: Number of non-empty lines read.
+        qsos: Number of QSOs parsed.
+        chars: Number of characters of log text parsed.
+        bytes: Number of bytes read from log files.
+        ns: dict of cumulative nanoseconds per stage. Stages are:
+            read: Reading and decoding log files.
+            split: Splitting log text into lines.
+            keyword: Matching the `KEY: value` pattern of each line.
+            header: Parsing header lines.
+            parse_qso: Parsing QSO lines, including strptime.
+            strptime: Parsing QSO dates and times.
+            categories: Checking categories in the Cabrillo constructor.
+            append_qso: Adding QSOs to the log with the ordering check.
+    """
+
+    STAGES = ('read', 'split', 'keyword', 'header', 'parse_qso', 'strptime',
+              'categories', 'append_qso')
+
+    def __init__(self):
+        self.logs = 0
+        self.lines = 0
+        self.qsos = 0
+        self.chars = 0
+        self.bytes = 0
+        self.ns = dict.fromkeys(self.STAGES, 0)
+
+    @staticmethod
+    def start():
+        """Return a start time for stop()."""
+        return time.perf_counter_ns()
+
+    def stop(self, stage, start):
+        """Add the time elapsed since start to stage."""
+        self.ns[stage] += time.perf_counter_ns() - start
+
+    def as_dict(self):
+        """Return all counters and timings as a flat dict, e.g. for export to
+        a metrics system. Timings are keyed `<stage>_ns`."""
+        result = dict(logs=self.logs, lines=self.lines, qsos=self.qsos,
+                      chars=self.chars, bytes=self.bytes)
+        for stage, ns in self.ns.items():
+            result['{}_ns'.format(stage)] = ns
+        return result
+
+    def __str__(self):
+        return '<ParseStats of {} logs, {} QSOs>'.format(self.logs, self.qsos)
@@ -0,0 +1,83 @@
+"""Contains a sequence of QSOs that are parsed from raw log text on access."""
+
+import collections.abc
+
+from cabrillo.errors import InvalidLogException
+
+
+class LazyQSOList(collections.abc.Sequence):
+    """A list-like sequence of QSOs backed by the raw log text.
+
+    Only the offsets of each QSO line are kept. A QSO is parsed on first
+    access and cached afterwards, so any InvalidQSOException surfaces on
+    access rather than when the log is read.
+
+    QSOs appended after parsing are stored as-is.
+    """
+
+    def __init__(self, text, spans, parse):
+        """Construct a LazyQSOList.
+
+        Arguments:
+            text: str of the log the QSO lines are taken from.
+            spans: List of (start, end, valid) tuples denoting the QSO data
+                (excluding the 'QSO: ' preamble) in text.
+            parse: Callable taking the QSO data and valid that returns a
+                cabrillo.QSO.
+        """
+        self._text = text
+        self._spans = spans
+        self._cache = [None] * len(spans)
+        self._parse = parse
+
+    def __len__(self):
+        return len(self._cache)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+
+        qso = self._cache[index]
+        if qso is None:
+            start, end, valid = self._spans[index]
+            qso = self._parse(self._text[start:end], valid)
+            self._cache[index] = qso
+        return qso
+
+    def __eq__(self, other):
+        if not isinstance(other, (list, LazyQSOList)):
+            return NotImplemented
+        return len(self) == len(other) and all(
+            a == b for a, b in zip(self, other))
+
+    def __repr__(self):
+        return '<LazyQSOList of {} QSOs>'.format(len(self))
+
+    def iter_spans(self):
+        """Generate the (start, end, valid) span of each QSO line in the log
+        text, see __init__. QSOs appended after parsing have no span and are
+        skipped."""
+        return (span for span in self._spans if span is not None)
+
+    def append(self, qso):
+        """Add one already constructed QSO to the end of the sequence."""
+        self._spans.append(None)
+        self._cache.append(qso)
+
+    def validate_all(self, ignore_order=False):
+        """Parse every QSO not yet parsed.
+
+        Arguments:
+            ignore_order: Whether to skip checking that QSOs are ordered
+                time-wise.
+
+        Raises:
+            InvalidQSOException, InvalidLogException
+        """
+        previous = None
+        for qso in self:
+            if previous is not None and qso.date < previous.date \
+                    and not ignore_order:
+                raise InvalidLogException(
+                    "QSOs need to be ordered time-wise.")
+            previous = qso
@@ -0,0 +1,71 @@
+"""Contains utilities to merge several logs into one time-ordered log."""
+import copy
+import heapq
+
+from cabrillo.errors import InvalidLogException
+
+
+def _ordered(qsos, transmitter, index):
+    """Yield qsos, checking their order and setting the transmitter ID."""
+    previous = None
+    for qso in qsos:
+        if previous is not None and qso.date < previous.date:
+            raise InvalidLogException(
+                'QSOs of source {} need to be ordered time-wise.'.format(index))
+        previous = qso
+        if transmitter is not None:
+            qso = copy.copy(qso)
+            qso.t = transmitter
+        yield qso
+
+
+def merge_qsos(sources, transmitters=None):
+    """Merge time-ordered logs into a single time-ordered stream of QSOs.
+
+    QSOs with the same time keep their order within each source, and are
+    taken from earlier sources first. Only one QSO per source is held at a
+    time, so sources can be streams like read_adif() or a LazyQSOList.
+
+    Arguments:
+        sources: List of cabrillo.Cabrillo or iterables of cabrillo.QSO.
+        transmitters: Optional list with the transmitter ID to set on the QSOs
+            of each source, e.g. [0, 1]. None in the list, or no list at all,
+            keeps the transmitter ID of the QSOs. QSOs of the sources are not
+            changed, QSOs with a new transmitter ID are copies.
+
+    Yields:
+        cabrillo.QSO
+
+    Raises:
+        InvalidLogException when a source is not ordered time-wise.
+    """
+    if transmitters is None:
+        transmitters = [None] * len(sources)
+    if len(transmitters) != len(sources):
+        raise ValueError('Expected {} transmitter IDs, got {}.'.format(
+            len(sources), len(transmitters)))
+
+    return heapq.merge(
+        *[_ordered(getattr(source, 'qso', source), transmitter, index)
+          for index, (source, transmitter)
+          in enumerate(zip(sources, transmitters))],
+        key=lambda qso: qso.date)
+
+
+def write_merged(file, header, sources, transmitters=None):
+    """Write a Cabrillo log merged from several time-ordered logs.
+
+    The QSOs are streamed to file without building the merged log in
+    memory.
+
+    Arguments:
+        file: Anything that has a write() - method accepting a string.
+        header: cabrillo.Cabrillo whose header is written, e.g. a log
+            constructed with CATEGORY-STATION: DISTRIBUTED. Its QSOs are not
+            written unless it is also one of the sources.
+        sources, transmitters: See merge_qsos.
+
+    Raises:
+        InvalidLogException
+    """
+    header.write(file, qso=merge_qsos(sources, transmitters))
@@ -1,22 +1,37 @@
 """Contains utilities to parse a Cabrillo file."""
 from datetime import datetime
 from cabrillo import QSO, Cabrillo
+from cabrillo.qso import normalize_token
 
 from cabrillo.errors import InvalidQSOException, InvalidLogException
-from cabrillo.data import KEYWORD_MAP
+from cabrillo.data import KEYWORD_MAP, VALID_CATEGORIES_MAP
+from cabrillo.lazy import LazyQSOList
 
 import collections
+import functools
 import re
 
+_INVERSE_KEYWORDS = {v: k for k, v in KEYWORD_MAP.items()}
+_KEY_COLON_VALUE = re.compile(r'^\s*([^:]+?)\s*:\s*(.*?)\s*$')
 
-def parse_qso(text, valid, check_mode=True):
-    """Parse a single line of QSO into a QSO object.
+LogError = collections.namedtuple('LogError', ['line', 'column', 'exception'])
+LogError.__doc__ = """An error found by validate_log_text.
 
-    Arguments:
-        text: str of QSO from log file (excluding the 'QSO: ' preamble)
+Attributes:
+    line: Line number of the error, starting at 1.
+    column: Column of the error in the line, starting at 1.
+    exception: The InvalidQSOException or InvalidLogException.
+"""
+
+
+def split_qso(text):
+    """Split QSO data into its components.
 
     Returns:
-        cabrillo.QSO
+        (components, middle, end, transmitter) tuple. components[5:middle]
+        is the sent exchange, components[middle] the received callsign and
+        components[middle + 1:end] the received exchange. transmitter is 0,
+        1 or None.
 
     Raises:
         InvalidQSOException
@@ -40,7 +55,30 @@ def parse_qso(text, valid, check_mode=True):
             num_exchanged -= 1
             transmitter = int(components[-1])
 
+    return components, 4 + num_exchanged // 2, 4 + num_exchanged, transmitter
+
+
+def parse_qso(text, valid, check_mode=True, stats=None, normalize=False):
+    """Parse a single line of QSO into a QSO object.
+
+    Arguments:
+        text: str of QSO from log file (excluding the 'QSO: ' preamble)
+        stats: Optional cabrillo.instrumentation.ParseStats collecting the
+            time spent in strptime.
+        normalize: Upper-case and intern the mode, callsigns and exchange
+            components, see QSO.normalized. Defaults to False.
+
+    Returns:
+        cabrillo.QSO
+
+    Raises:
+        InvalidQSOException
+    """
+    components, middle, end, transmitter = split_qso(text)
+
     # Build QSO
+    if stats is not None:
+        start = stats.start()
     try:
         date = datetime.strptime('{} {}'.format(components[2], components[3]),
                                  '%Y-%m-%d %H%M')
@@ -48,19 +86,25 @@ def parse_qso(text, valid, check_mode=True):
         raise InvalidQSOException(
             'Unable to parse QSO date/time "{} {}": {}'.format(
                 components[2], components[3], e))
+    if stats is not None:
+        stats.stop('strptime', start)
+    if normalize:
+        components[1] = normalize_token(components[1])
+        components[4:end] = [normalize_token(x) for x in components[4:end]]
     return QSO(freq=components[0], mo=components[1], date=date,
                de_call=components[4],
-               de_exch=components[5:int(3 + num_exchanged / 2 + 1)],
-               dx_call=components[int(3 + num_exchanged / 2 + 1)],
-               dx_exch=components[int(3 + num_exchanged / 2 + 2):
-                                  int(3 + num_exchanged + 1)],
+               de_exch=components[5:middle],
+               dx_call=components[middle],
+               dx_exch=components[middle + 1:end],
                t=transmitter,
                valid=valid,
-               check_mode=check_mode)
+               check_mode=check_mode,
+               normalized=normalize)
 
 
 def parse_log_text(text, ignore_unknown_key=False, check_categories=True,
-                   ignore_order=False, check_mode=True):
+                   ignore_order=False, check_mode=True, lazy=False,
+                   stats=None, normalize=False):
     """Parse a Cabrillo log in text form.
 
     Attributes in cabrillo.data.KEYWORD_MAP will be parsed accordingly. X-
@@ -77,6 +121,17 @@ def parse_log_text(text, ignore_unknown_key=False, check_categories=True,
             Cabrillo specification.
         ignore_order: Cabrillo logs need to be ordered time-wise.
                 Whether to ignore violations on input and disable output.
+        check_mode: Check if QSO modes are valid per specification.
+            Defaults to True.
+        lazy: Only remember where QSOs are in text and parse each QSO when
+            it is first accessed. Errors in QSOs are then raised on access
+            or by Cabrillo.validate_all(). Defaults to False.
+        stats: Optional cabrillo.instrumentation.ParseStats to collect
+            counters and per-stage timings in.
+        normalize: Upper-case and intern the modes, callsigns and exchange
+            components of QSOs. Repeated tokens like 599 are then stored
+            once, and match_against compares callsigns case-insensitively.
+            Defaults to False.
 
     Returns:
         cabrillo.Cabrillo
@@ -84,18 +139,35 @@ def parse_log_text(text, ignore_unknown_key=False, check_categories=True,
     Raises:
         InvalidQSOException, InvalidLogException
     """
-    inverse_keywords = {v: k for k, v in KEYWORD_MAP.items()}
     results = dict()
     results['x_anything'] = collections.OrderedDict()
+    qso_spans = []
+
+    if stats is not None:
+        start = stats.start()
+    lines = text.split('\n')
+    if stats is not None:
+        stats.stop('split', start)
+        stats.logs += 1
+        stats.chars += len(text)
+
+    offset = 0
+    for line in lines:
+        line_start = offset
+        offset += len(line) + 1
 
-    key_colon_value = re.compile(r'^\s*([^:]+?)\s*:\s*(.*?)\s*$')
-    for line in text.split('\n'):
         # Provide for empty lines. This technically should not happen
         # but not all software is perfect.
         if not line.strip():
             continue
 
-        match = key_colon_value.fullmatch(line)
+        if stats is None:
+            match = _KEY_COLON_VALUE.fullmatch(line)
+        else:
+            stats.lines += 1
+            start = stats.start()
+            match = _KEY_COLON_VALUE.fullmatch(line)
+            stats.stop('keyword', start)
         if match:
             key, value = match.group(1), match.group(2)
         else:
@@ -104,72 +176,150 @@ def parse_log_text(text, ignore_unknown_key=False, check_categories=True,
 
         if key == 'END-OF-LOG':
             break
-        elif key == 'CLAIMED-SCORE':
-            try:
-                results[inverse_keywords[key]] = int(value.strip() if value.strip() else 0)
-            except ValueError:
-                raise InvalidLogException('Improperly formatted claimed '
-                                          'score "{}". Per specification the'
-                                          ' score, if given, must be an '
-                                          'integer without any formatting, '
-                                          'like "12345678".'.format(value))
-        elif key == 'CERTIFICATE':
-            results[inverse_keywords[key]] = value.upper() == 'YES'
         elif key in ['QSO', 'X-QSO']:
             # Do not split QSO and X-QSO case here.
             # By not splitting, we keep timewise order for QSOs that have the same timestamp.
-            results.setdefault("qso", []).append(
-                parse_qso(value, key.upper() == "QSO", check_mode=check_mode))
-        elif key == 'OPERATORS':
-            results.setdefault(inverse_keywords[key], list()).extend(
-                value.replace(',', ' ').split())
-        elif key in ['ADDRESS', 'SOAPBOX']:
-            results.setdefault(inverse_keywords[key], list()).append(value)
-        elif key == 'OFFTIME':
-            parts = value.split()
-            if len(parts) == 4:
-                try:
-                    start = datetime.strptime('{} {}'.format(parts[0], parts[1]),
-                                              '%Y-%m-%d %H%M')
-                    end = datetime.strptime('{} {}'.format(parts[2], parts[3]),
-                                            '%Y-%m-%d %H%M')
-                    results[inverse_keywords[key]] = [start, end]
-                except ValueError:
-                    pass
-        elif key == 'GRID-LOCATOR':
-            # Uppercase the grid locator to be consistent.
-            value = value.upper().strip()
-
-            if not value:
-                results[inverse_keywords[key]] = None
-                continue
-
-            # Maidenhead grid locators: 4, 6, 8, or 10 characters.
-            # Pattern: AA## or AA##AA or AA##AA## or AA##AA##AA
-            pattern = r'^[A-Z]{2}\d{2}([A-Z]{2}(\d{2}([A-Z]{2})?)?)?$'
-            if len(value) not in [4, 6, 8, 10] or not re.match(pattern, value):
-                raise InvalidLogException(
-                    'Improperly formatted grid locator "{}". '
-                    'Must look like AA##, AA##AA, AA##AA##, or AA##AA##AA.'.format(value)
-                )
-            results[inverse_keywords[key]] = value
-        elif key in inverse_keywords.keys():
-            if not value.strip():
-                continue
-            results[inverse_keywords[key]] = value
-        elif key.startswith('X-'):
-            # We keep the order that we were given.
-            if not value.strip():
-                continue
-            results['x_anything'][key] = value
-        elif not ignore_unknown_key:
-            raise InvalidLogException("Unknown key {} read.".format(key))
-
-    return Cabrillo(check_categories=check_categories, ignore_order=ignore_order, **results)
+            if lazy:
+                qso_spans.append((line_start + match.start(2),
+                                  line_start + match.end(2), key == 'QSO'))
+            elif stats is None:
+                results.setdefault("qso", []).append(
+                    parse_qso(value, key.upper() == "QSO", check_mode=check_mode,
+                              normalize=normalize))
+            else:
+                start = stats.start()
+                results.setdefault("qso", []).append(
+                    parse_qso(value, key.upper() == "QSO", check_mode=check_mode,
+                              stats=stats, normalize=normalize))
+                stats.stop('parse_qso', start)
+                stats.qsos += 1
+        elif stats is None:
+            _parse_header(key, value, results, ignore_unknown_key)
+        else:
+            start = stats.start()
+            _parse_header(key, value, results, ignore_unknown_key)
+            stats.stop('header', start)
+
+    if lazy:
+        results['qso'] = LazyQSOList(
+            text, qso_spans, functools.partial(parse_qso, check_mode=check_mode,
+                                               normalize=normalize))
+
+    if stats is None:
+        return Cabrillo(check_categories=check_categories, ignore_order=ignore_order, **results)
+
+    # Construct step by step to time the stages separately.
+    qso_list = results.pop('qso', [])
+    if lazy:
+        results['qso'] = qso_list
+    cab = Cabrillo(check_categories=False, ignore_order=ignore_order, **results)
+    if not lazy:
+        start = stats.start()
+        for qso in qso_list:
+            cab.append_qso(qso)
+        stats.stop('append_qso', start)
+    if check_categories:
+        start = stats.start()
+        cab._check_categories()
+        stats.stop('categories', start)
+    return cab
+
+
+def parse_header_items(items, ignore_unknown_key=False):
+    """Parse header lines given as (keyword, value) into Cabrillo attributes,
+    e.g. those of Cabrillo.header_items().
+
+    Arguments:
+        items: Iterable of (keyword, value) tuples, e.g. ('CALLSIGN',
+            'W1AW'). Values are converted to str.
+        ignore_unknown_key: See parse_log_text.
+
+    Returns:
+        dict of keyword arguments for the Cabrillo constructor.
+
+    Raises:
+        InvalidLogException
+    """
+    results = dict()
+    results['x_anything'] = collections.OrderedDict()
+    for key, value in items:
+        _parse_header(key, str(value), results, ignore_unknown_key)
+    return results
+
+
+def _parse_header(key, value, results, ignore_unknown_key):
+    """Parse a single non-QSO line of a log into results.
+
+    Arguments:
+        key: Keyword of the line, e.g. 'CALLSIGN'.
+        value: Value of the line.
+        results: dict of Cabrillo attributes updated in place. Must contain
+            an 'x_anything' mapping.
+        ignore_unknown_key: See parse_log_text.
+
+    Raises:
+        InvalidLogException
+    """
+    if key == 'CLAIMED-SCORE':
+        try:
+            results[_INVERSE_KEYWORDS[key]] = int(value.strip() if value.strip() else 0)
+        except ValueError:
+            raise InvalidLogException('Improperly formatted claimed '
+                                      'score "{}". Per specification the'
+                                      ' score, if given, must be an '
+                                      'integer without any formatting, '
+                                      'like "12345678".'.format(value))
+    elif key == 'CERTIFICATE':
+        results[_INVERSE_KEYWORDS[key]] = value.upper() == 'YES'
+    elif key == 'OPERATORS':
+        results.setdefault(_INVERSE_KEYWORDS[key], list()).extend(
+            value.replace(',', ' ').split())
+    elif key in ['ADDRESS', 'SOAPBOX']:
+        results.setdefault(_INVERSE_KEYWORDS[key], list()).append(value)
+    elif key == 'OFFTIME':
+        parts = value.split()
+        if len(parts) == 4:
+            try:
+                start = datetime.strptime('{} {}'.format(parts[0], parts[1]),
+                                          '%Y-%m-%d %H%M')
+                end = datetime.strptime('{} {}'.format(parts[2], parts[3]),
+                                        '%Y-%m-%d %H%M')
+                results[_INVERSE_KEYWORDS[key]] = [start, end]
+            except ValueError:
+                pass
+    elif key == 'GRID-LOCATOR':
+        # Uppercase the grid locator to be consistent.
+        value = value.upper().strip()
+
+        if not value:
+            results[_INVERSE_KEYWORDS[key]] = None
+            return
+
+        # Maidenhead grid locators: 4, 6, 8, or 10 characters.
+        # Pattern: AA## or AA##AA or AA##AA## or AA##AA##AA
+        pattern = r'^[A-Z]{2}\d{2}([A-Z]{2}(\d{2}([A-Z]{2})?)?)?$'
+        if len(value) not in [4, 6, 8, 10] or not re.match(pattern, value):
+            raise InvalidLogException(
+                'Improperly formatted grid locator "{}". '
+                'Must look like AA##, AA##AA, AA##AA##, or AA##AA##AA.'.format(value)
+            )
+        results[_INVERSE_KEYWORDS[key]] = value
+    elif key in _INVERSE_KEYWORDS.keys():
+        if not value.strip():
+            return
+        results[_INVERSE_KEYWORDS[key]] = value
+    elif key.startswith('X-'):
+        # We keep the order that we were given.
+        if not value.strip():
+            return
+        results['x_anything'][key] = value
+    elif not ignore_unknown_key:
+        raise InvalidLogException("Unknown key {} read.".format(key))
 
 
 def parse_log_file(filename, ignore_unknown_key=False, check_categories=True,
-                   ignore_order=False, check_mode=True):
+                   ignore_order=False, check_mode=True, lazy=False,
+                   stats=None, encoding=None, normalize=False):
     """Parse a Cabrillo log file.
 
         Attributes in cabrillo.data.KEYWORD_MAP will be parsed accordingly. X-
@@ -186,6 +336,13 @@ def parse_log_file(filename, ignore_unknown_key=False, check_categories=True,
                 Whether to ignore violations on input and disable output.
             check_mode: Check if QSO modes are valid per specification.
                 Defaults to True.
+            lazy: Parse QSOs on first access. See parse_log_text.
+            stats: Optional cabrillo.instrumentation.ParseStats to collect
+                counters and per-stage timings in.
+            encoding: Encoding of the file. Defaults to UTF-8, falling back
+                to Latin-1 for files that are not valid UTF-8. Use
+                'unicode_escape' for the behaviour of earlier versions.
+            normalize: Normalize QSO tokens. See parse_log_text.
 
         Returns:
             cabrillo.Cabrillo
@@ -193,6 +350,299 @@ def parse_log_file(filename, ignore_unknown_key=False, check_categories=True,
         Raises:
             InvalidQSOException, InvalidLogException
     """
-    with open(filename, 'r', encoding='unicode_escape') as f:
-        return parse_log_text(f.read(), ignore_unknown_key, check_categories,
-                              ignore_order, check_mode)
+    if stats is not None:
+        start = stats.start()
+    with open(filename, 'rb') as f:
+        data = f.read()
+    text = decode_log(data, encoding)
+    if stats is not None:
+        stats.bytes += len(data)
+        stats.stop('read', start)
+    return parse_log_text(text, ignore_unknown_key, check_categories,
+                          ignore_order, check_mode, lazy, stats, normalize)
+
+
+def parse_log_bytes(data, ignore_unknown_key=False, check_categories=True,
+                    ignore_order=False, check_mode=True, lazy=False,
+                    stats=None, encoding=None, normalize=False):
+    """Parse the raw content of a Cabrillo log file.
+
+    The content is decoded the same way parse_log_file decodes files, which
+    makes this useful for logs that are not plain files, e.g. archive members.
+
+    Arguments:
+        data: bytes of the log file.
+        encoding: See parse_log_file.
+        See parse_log_text for the other arguments.
+
+    Returns:
+        cabrillo.Cabrillo
+
+    Raises:
+        InvalidQSOException, InvalidLogException
+    """
+    if stats is not None:
+        start = stats.start()
+    text = decode_log(data, encoding)
+    if stats is not None:
+        stats.bytes += len(data)
+        stats.stop('read', start)
+    return parse_log_text(text, ignore_unknown_key, check_categories,
+                          ignore_order, check_mode, lazy, stats, normalize)
+
+
+def decode_log(data, encoding=None):
+    """Decode the raw content of a Cabrillo log file.
+
+    Arguments:
+        data: bytes of the log file.
+        encoding: See parse_log_file.
+
+    Returns:
+        str with all kinds of line breaks replaced by newlines.
+    """
+    if encoding is None:
+        try:
+            # Skip the byte order mark some editors write.
+            text = data.decode('utf-8-sig')
+        except UnicodeDecodeError:
+            text = data.decode('latin-1')
+    else:
+        text = data.decode(encoding)
+    if '\r' in text:
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+    return text
+
+
+class ValidationReport:
+    """Result of validating a Cabrillo log with validate_log_text.
+
+    Attributes:
+        errors: List of LogError in the order of the lines.
+        lines: Number of lines read.
+        qso_count: Number of QSO and X-QSO lines read.
+    """
+
+    def __init__(self, errors, lines, qso_count):
+        self.errors = errors
+        self.lines = lines
+        self.qso_count = qso_count
+
+    valid = property(fget=lambda self: not self.errors)
+
+    def __str__(self):
+        return '\n'.join('{}:{}: {}'.format(error.line, error.column,
+                                            error.exception)
+                         for error in self.errors)
+
+
+def validate_log_text(text, ignore_unknown_key=False, check_categories=True,
+                      ignore_order=False, check_mode=True):
+    """Validate a Cabrillo log in text form, collecting all errors.
+
+    Unlike parse_log_text, this does not stop at the first error. The log is
+    read once and every error is reported with its position.
+
+    Arguments:
+        text: str of log
+        See parse_log_text for the other arguments.
+
+    Returns:
+        ValidationReport
+    """
+    results = dict()
+    results['x_anything'] = collections.OrderedDict()
+    errors = []
+    qso_count = 0
+    previous_date = None
+
+    for line_number, line in enumerate(text.split('\n'), 1):
+        if not line.strip():
+            continue
+
+        match = _KEY_COLON_VALUE.fullmatch(line)
+        if not match:
+            errors.append(LogError(line_number, 1, InvalidLogException(
+                'Line does not start with `:`-delimited key, '
+                'got `{}`.'.format(line))))
+            continue
+        key, value = match.group(1), match.group(2)
+        column = match.start(2) + 1
+
+        try:
+            if key == 'END-OF-LOG':
+                break
+            elif key in ['QSO', 'X-QSO']:
+                qso_count += 1
+                qso = parse_qso(value, key == 'QSO', check_mode=check_mode)
+                if previous_date is not None and qso.date < previous_date \
+                        and not ignore_order:
+                    raise InvalidLogException(
+                        "QSOs need to be ordered time-wise.")
+                previous_date = qso.date
+            else:
+                _parse_header(key, value, results, ignore_unknown_key)
+                attribute = _INVERSE_KEYWORDS.get(key)
+                # An empty version is skipped, like Cabrillo defaults it.
+                if attribute == 'version' \
+                        and results.get(attribute, '3.0') != '3.0':
+                    raise InvalidLogException(
+                        "Only Cabrillo v3 supported, got {}".format(value))
+                if check_categories and attribute in VALID_CATEGORIES_MAP:
+                    candidates = VALID_CATEGORIES_MAP[attribute]
+                    if value and value not in candidates:
+                        raise InvalidLogException(
+                            'Got {} for {} but expecting one of {}.'.format(
+                                value, attribute, candidates))
+        except (InvalidQSOException, InvalidLogException) as e:
+            errors.append(LogError(line_number, column, e))
+
+    return ValidationReport(errors, line_number, qso_count)
+
+
+def validate_log_file(filename, ignore_unknown_key=False,
+                      check_categories=True, ignore_order=False,
+                      check_mode=True, encoding=None):
+    """Validate a Cabrillo log file, collecting all errors.
+
+    Arguments:
+        filename: filename of the target log file.
+        encoding: See parse_log_file.
+        See parse_log_text for the other arguments.
+
+    Returns:
+        ValidationReport
+    """
+    with open(filename, 'rb') as f:
+        text = decode_log(f.read(), encoding)
+    return validate_log_text(text, ignore_unknown_key, check_categories,
+                             ignore_order, check_mode)
+
+
+class IncrementalParser:
+    """Parse a Cabrillo log file that is still being written to.
+
+    Each call to update() only reads the data appended to the file since the
+    previous call. QSOs are added to the log with Cabrillo.append_qso, so
+    QSOs still need to be ordered time-wise unless ignore_order is set.
+
+    Attributes:
+        filename: filename of the target log file.
+        offset: Number of bytes of the file read so far.
+        cabrillo: The cabrillo.Cabrillo parsed so far. None before the first
+            call to update().
+        finished: True once END-OF-LOG has been read.
+        pending_qso: QSOs added to cabrillo but not returned by update() yet,
+            because a later line of the same call raised an exception.
+    """
+
+    def __init__(self, filename, ignore_unknown_key=False,
+                 check_categories=True, ignore_order=False, check_mode=True,
+                 encoding=None):
+        """Construct an IncrementalParser.
+
+        Arguments:
+            filename: filename of the target log file.
+            encoding: See parse_log_file. Lines are decoded one at a time.
+            See parse_log_text for the other arguments.
+        """
+        self.filename = filename
+        self.encoding = encoding
+        self.ignore_unknown_key = ignore_unknown_key
+        self.check_categories = check_categories
+        self.ignore_order = ignore_order
+        self.check_mode = check_mode
+        self.reset()
+
+    def reset(self):
+        """Forget everything read so far, e.g. after the file was rewritten."""
+        self.offset = 0
+        self.cabrillo = None
+        self.finished = False
+        self.pending_qso = []
+        # Data read from the file but not processed yet, i.e. the partial
+        # last line.
+        self._pending = b''
+        self._header = dict()
+        self._header['x_anything'] = collections.OrderedDict()
+
+    def update(self, final=False):
+        """Read and parse the data appended to the file since the last call.
+
+        Arguments:
+            final: Also parse a last line that has no line break yet. Use this
+                once the file is known to be complete.
+
+        Returns:
+            list of cabrillo.QSO added to self.cabrillo since the last call
+            that returned, including pending_qso.
+
+        Raises:
+            InvalidQSOException, InvalidLogException. The offending line is
+            not consumed, so calling update() again raises again. The QSOs
+            of the lines before it are added and kept in pending_qso.
+        """
+        with open(self.filename, 'rb') as f:
+            f.seek(0, 2)
+            if f.tell() < self.offset:
+                raise InvalidLogException(
+                    'Log file {} shrank, call reset() to parse it '
+                    'anew.'.format(self.filename))
+            f.seek(self.offset)
+            data = f.read()
+        self.offset += len(data)
+
+        pending = self._pending + data
+        # Filled in place, so the QSOs added are kept if a line raises.
+        new_qso = self.pending_qso
+        pos = 0
+        try:
+            while not self.finished:
+                end = pending.find(b'\n', pos)
+                if end == -1:
+                    if not final or pos == len(pending):
+                        break
+                    end = len(pending)
+                self._parse_line(decode_log(pending[pos:end], self.encoding),
+                                 new_qso)
+                pos = end + 1
+        finally:
+            self._pending = pending[pos:]
+
+        if self.cabrillo is None:
+            self._make_cabrillo()
+        self.pending_qso = []
+        return new_qso
+
+    def _parse_line(self, line, new_qso):
+        """Parse one complete line, appending new QSOs to new_qso."""
+        if not line.strip():
+            return
+
+        match = _KEY_COLON_VALUE.fullmatch(line)
+        if not match:
+            raise InvalidLogException('Line does not start with `:`-delimited key, '
+                                      'got `{}`.'.format(line))
+        key, value = match.group(1), match.group(2)
+
+        if key == 'END-OF-LOG':
+            self.finished = True
+        elif key in ['QSO', 'X-QSO']:
+            qso = parse_qso(value, key == 'QSO', check_mode=self.check_mode)
+            if self.cabrillo is None:
+                self._make_cabrillo()
+            self.cabrillo.append_qso(qso)
+            new_qso.append(qso)
+        else:
+            _parse_header(key, value, self._header, self.ignore_unknown_key)
+            if self.cabrillo is not None:
+                # Header lines after QSOs are unusual but not fatal.
+                for attribute, attribute_value in self._header.items():
+                    setattr(self.cabrillo, attribute, attribute_value)
+                if self.check_categories:
+                    self.cabrillo._check_categories()
+
+    def _make_cabrillo(self):
+        self.cabrillo = Cabrillo(check_categories=self.check_categories,
+                                 ignore_order=self.ignore_order,
+                                 **self._header)
@@ -1,8 +1,52 @@
 """Contains classes pertaining to holding individual QSOs."""
 
+import collections
+import sys
+
 from cabrillo import data
 from cabrillo.errors import InvalidQSOException
 
+QSOKey = collections.namedtuple('QSOKey', ['band', 'mo', 'minute', 'de_call',
+                                           'de_exch', 'dx_call', 'dx_exch'])
+QSOKey.__doc__ = """Normalized, hashable representation of a QSO.
+
+Attributes:
+    band: Band designation as given by frequency_to_band.
+    mo: Mode.
+    minute: Minutes since the epoch (UTC).
+    de_call: Upper-cased sent callsign.
+    de_exch: Tuple of upper-cased sent exchange components.
+    dx_call: Upper-cased received callsign.
+    dx_exch: Tuple of upper-cased received exchange components.
+"""
+
+# Attributes QSO.key is derived from.
+_KEY_ATTRIBUTES = frozenset(['freq', 'mo', 'date', 'de_call', 'de_exch',
+                             'dx_call', 'dx_exch'])
+
+# Attributes that are no longer normalized when assigned.
+_NORMALIZED_ATTRIBUTES = frozenset(['mo', 'de_call', 'de_exch', 'dx_call',
+                                    'dx_exch'])
+
+# datetime(1970, 1, 1).toordinal(), saves importing calendar for timegm.
+_EPOCH_ORDINAL = 719163
+
+
+def _epoch_minute(date):
+    """Return the minutes since the epoch of a datetime. Naive datetimes are
+    taken as UTC."""
+    offset = date.utcoffset()
+    if offset is not None:
+        date = date - offset
+    return ((date.toordinal() - _EPOCH_ORDINAL) * 1440 + date.hour * 60
+            + date.minute)
+
+
+def normalize_token(token):
+    """Return a callsign, mode or exchange component upper-cased, stripped
+    and interned, so equal tokens are the same object."""
+    return sys.intern(token.strip().upper())
+
 
 def frequency_to_band(freq):
     """Converts numeric frequency in kHz to band designation.
@@ -84,29 +128,76 @@ class QSO:
         dx_exch: Received exchange incl. RST. List of each component.
         t: Transmitter ID for multi-transmitter categories in int. 0/1.
         valid: True: Valid QSO, False: X-QSO.
+        normalized: True if mo, the callsigns and the exchange components
+            are known to be normalized with normalize_token, e.g. for QSOs
+            parsed with normalize. Assigning one of them resets it.
+        key: QSOKey of this QSO, computed once and cached (read-only).
+            Assigning the attributes it is derived from resets the cache,
+            changing de_exch or dx_exch in place does not.
     """
 
     def __init__(self, freq, mo, date, de_call, dx_call, de_exch=[],
-                 dx_exch=[], t=None, valid=True, check_mode=True):
+                 dx_exch=[], t=None, valid=True, check_mode=True,
+                 normalized=False):
         """Construct a QSO object.
 
         Arguments:
             See class attributes for parameters.
             de_exch and dx_exch are optional lists.
             check_mode: If True (default), validate mo against data.MODES.
+            normalized: Declare the tokens normalized, see normalize() to
+                normalize them.
         """
         if check_mode and mo not in data.MODES:
             raise InvalidQSOException('{} is not a valid mode.'.format(mo))
 
-        self.freq = freq
-        self.mo = mo
-        self.date = date
-        self.de_call = de_call
-        self.de_exch = de_exch
-        self.dx_call = dx_call
-        self.dx_exch = dx_exch
-        self.t = t
-        self.valid = valid
+        # Bypass __setattr__, there is no cached key to reset yet.
+        self.__dict__.update(freq=freq, mo=mo, date=date, de_call=de_call,
+                             de_exch=de_exch, dx_call=dx_call,
+                             dx_exch=dx_exch, t=t, valid=valid,
+                             normalized=normalized)
+
+    def __setattr__(self, name, value):
+        if name in _KEY_ATTRIBUTES:
+            self.__dict__.pop('_key', None)
+            if name in _NORMALIZED_ATTRIBUTES:
+                self.__dict__['normalized'] = False
+        object.__setattr__(self, name, value)
+
+    def normalize(self):
+        """Normalize mo, the callsigns and the exchange components in place
+        with normalize_token.
+
+        Callsigns are then compared case-insensitively by match_against.
+        """
+        self.__dict__.update(
+            mo=normalize_token(self.mo),
+            de_call=normalize_token(self.de_call),
+            de_exch=[normalize_token(x) for x in self.de_exch],
+            dx_call=normalize_token(self.dx_call),
+            dx_exch=[normalize_token(x) for x in self.dx_exch],
+            normalized=True)
+        self.__dict__.pop('_key', None)
+
+    @property
+    def key(self):
+        key = self.__dict__.get('_key')
+        if key is None and self.normalized:
+            # The tokens are upper-case already, and shared with the key.
+            key = QSOKey(frequency_to_band(self.freq), self.mo,
+                         _epoch_minute(self.date), self.de_call,
+                         tuple(self.de_exch), self.dx_call,
+                         tuple(self.dx_exch))
+            self._key = key
+        elif key is None:
+            key = QSOKey(frequency_to_band(self.freq), self.mo,
+                         _epoch_minute(self.date),
+                         self.de_call.upper(),
+                         tuple(x.upper() for x in self.de_exch),
+                         self.dx_call.upper(),
+                         tuple(x.upper() for x in self.dx_exch))
+            self._key = key
+        return key
 
     def match_against(self, other, max_time_delta=30, check_exch=True,
                       check_band=True):
@@ -156,10 +247,18 @@ class QSO:
             if abs(delta.total_seconds()) > max_time_delta * 60:
                 return False
 
-        # Check exchange
+        # Check exchange. The lists may have been changed in place since
+        # the key was cached, so compare them directly.
         if check_exch:
-            if [x.upper() for x in self.de_exch] != [x.upper() for x in other.dx_exch] \
-                    or [x.upper() for x in self.dx_exch] != [x.upper() for x in other.de_exch]:
+            if self.normalized and other.normalized:
+                # Upper-case already.
+                if self.de_exch != other.dx_exch \
+                        or self.dx_exch != other.de_exch:
+                    return False
+            elif [x.upper() for x in self.de_exch] \
+                    != [x.upper() for x in other.dx_exch] \
+                    or [x.upper() for x in self.dx_exch] \
+                    != [x.upper() for x in other.de_exch]:
                 return False
 
         # Check band
@@ -168,7 +267,7 @@ class QSO:
             if self.freq == other.freq:
                 return True
             # If they're the same band, they match.
-            if frequency_to_band(self.freq) == frequency_to_band(other.freq):
+            if self.key.band == other.key.band:
                 return True
             # Account for bands not in Cabrillo, we give 500kHz latitude.
             try:
@@ -207,3 +306,7 @@ class QSO:
             == other.date and self.de_call == other.de_call and \
             self.dx_call == other.dx_call and self.de_exch == \
             other.de_exch and self.dx_exch == other.dx_exch
+
+    def __hash__(self):
+        """Hash consistent with __eq__, based on the normalized key."""
+        return hash(self.key)
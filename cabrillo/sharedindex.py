@@ -0,0 +1,341 @@
+"""Contains a contest-wide QSO index in shared memory for cross-checking in
+several processes.
+
+SharedContestIndex.create() encodes the QSOs of all logs once into integer
+column arrays in a multiprocessing.shared_memory block: callsigns, modes,
+frequencies, bands and exchanges as codes into string tables, times as
+epoch seconds. Worker processes attach to the block by name and read the
+columns in place, so no log is pickled to them.
+
+The statuses are the same as those of cabrillo.crosscheck.CrossCheckIndex,
+with QSOs compared like QSO.match_against.
+"""
+import array
+import bisect
+import concurrent.futures
+from multiprocessing import shared_memory
+
+from cabrillo.crosscheck import BUSTED, MATCHED, NIL, UNVERIFIED
+from cabrillo.qso import _epoch_minute
+
+# Status of each status code in the results of worker processes.
+STATUSES = (None, MATCHED, BUSTED, NIL, UNVERIFIED)
+
+# Bits per code in the (log, de_call, dx_call) keys of the pair index.
+_BITS = 21
+
+_COLUMNS = ('log_start', 'log_call', 'call_log', 'freq', 'freq_num',
+            'numeric', 'band', 'mo', 'second', 'de_call', 'dx_call',
+            'de_exch', 'dx_exch', 'valid', 'pair_key', 'pair_row')
+
+
+class _Table:
+    """Table of distinct strings, each with its index as code."""
+
+    def __init__(self):
+        self.index = dict()
+
+    def code(self, value):
+        code = self.index.get(value)
+        if code is None:
+            code = self.index[value] = len(self.index)
+        return code
+
+    def encode(self):
+        return '\n'.join(self.index).encode('utf-8')
+
+
+class SharedContestIndex:
+    """Index of the QSOs of all logs of a contest in shared memory.
+
+    The process that creates the index owns the shared memory and must
+    unlink() it, e.g. by using the index as a context manager. Other
+    processes attach() with the handle and close() when done.
+
+    Attributes:
+        handle: Picklable handle to attach to the index with.
+    """
+
+    def __init__(self, memory, layout, owner):
+        self._memory = memory
+        self._layout = layout
+        self._owner = owner
+        self._views = dict()
+        buffer = memory.buf if owner else memory.buf.toreadonly()
+        for name, (offset, typecode, length) in layout['columns'].items():
+            size = array.array(typecode).itemsize * length
+            self._views[name] = buffer[offset:offset + size].cast(typecode)
+        self._callsigns = None
+
+    @classmethod
+    def create(cls, logs):
+        """Build the index in a new shared memory block.
+
+        Arguments:
+            logs: Iterable of cabrillo.Cabrillo. A log replaces an earlier
+                log with the same callsign, like in CrossCheckIndex.
+
+        Returns:
+            SharedContestIndex
+
+        Raises:
+            ValueError if there are more logs or callsigns than can be
+            encoded in the pair index (2 ** 21 each).
+        """
+        logs = list({cab.callsign: cab for cab in logs}.values())
+        calls = _Table()
+        strings = _Table()
+        columns = {name: array.array(typecode) for name, typecode in [
+            ('log_start', 'q'), ('log_call', 'i'), ('freq', 'i'),
+            ('freq_num', 'q'), ('numeric', 'b'), ('band', 'i'), ('mo', 'i'),
+            ('second', 'q'), ('de_call', 'i'), ('dx_call', 'i'),
+            ('de_exch', 'i'), ('dx_exch', 'i'), ('valid', 'b')]}
+
+        for cab in logs:
+            columns['log_start'].append(len(columns['valid']))
+            columns['log_call'].append(
+                -1 if cab.callsign is None else calls.code(cab.callsign))
+            for qso in cab.qso:
+                key = qso.key
+                try:
+                    freq_num, numeric = int(qso.freq), 1
+                except ValueError:
+                    freq_num, numeric = 0, 0
+                columns['freq'].append(strings.code(qso.freq))
+                columns['freq_num'].append(freq_num)
+                columns['numeric'].append(numeric)
+                columns['band'].append(strings.code(key.band))
+                columns['mo'].append(strings.code(qso.mo))
+                columns['second'].append(_epoch_minute(qso.date) * 60
+                                         + qso.date.second)
+                columns['de_call'].append(calls.code(qso.de_call))
+                columns['dx_call'].append(calls.code(qso.dx_call))
+                columns['de_exch'].append(strings.code(' '.join(key.de_exch)))
+                columns['dx_exch'].append(strings.code(' '.join(key.dx_exch)))
+                columns['valid'].append(qso.valid)
+        columns['log_start'].append(len(columns['valid']))
+
+        if max(len(logs), len(calls.index)) >= 1 << _BITS:
+            raise ValueError('Too many logs or callsigns for the index.')
+
+        # Log of each callsign, -1 if the station did not submit a log.
+        columns['call_log'] = array.array('i', [-1]) * len(calls.index)
+        for log, code in enumerate(columns['log_call']):
+            if code != -1:
+                columns['call_log'][code] = log
+
+        # Valid QSOs sorted by (log, de_call, dx_call).
+        pairs = []
+        for log in range(len(logs)):
+            for row in range(columns['log_start'][log],
+                             columns['log_start'][log + 1]):
+                if columns['valid'][row]:
+                    pairs.append((_pair_key(log, columns['de_call'][row],
+                                            columns['dx_call'][row]), row))
+        pairs.sort()
+        columns['pair_key'] = array.array('q', [key for key, _ in pairs])
+        columns['pair_row'] = array.array('i', [row for _, row in pairs])
+
+        blobs = dict(calls=calls.encode(), strings=strings.encode())
+        layout = dict(columns=dict(), blobs=dict())
+        size = 0
+        for name in _COLUMNS:
+            layout['columns'][name] = (size, columns[name].typecode,
+                                       len(columns[name]))
+            # Align each column to 8 bytes.
+            size += -(-columns[name].itemsize * len(columns[name]) // 8) * 8
+        for name, blob in blobs.items():
+            layout['blobs'][name] = (size, len(blob))
+            size += len(blob)
+
+        memory = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        for name in _COLUMNS:
+            offset, _, _ = layout['columns'][name]
+            data = columns[name].tobytes()
+            memory.buf[offset:offset + len(data)] = data
+        for name, blob in blobs.items():
+            offset, length = layout['blobs'][name]
+            memory.buf[offset:offset + length] = blob
+        return cls(memory, layout, owner=True)
+
+    @classmethod
+    def attach(cls, handle):
+        """Attach to an index created in another process, read-only."""
+        name, layout = handle
+        try:
+            # Do not let this process' resource tracker unlink the memory.
+            memory = shared_memory.SharedMemory(name=name, track=False)
+        except TypeError:  # pragma: no cover
+            # Python < 3.13
+            memory = shared_memory.SharedMemory(name=name)
+        return cls(memory, layout, owner=False)
+
+    handle = property(fget=lambda self: (self._memory.name, self._layout))
+
+    def __len__(self):
+        """Return the number of logs."""
+        return len(self._views['log_call'])
+
+    def _strings(self, name):
+        offset, length = self._layout['blobs'][name]
+        text = bytes(self._memory.buf[offset:offset + length]).decode('utf-8')
+        return text.split('\n') if text else []
+
+    @property
+    def callsigns(self):
+        """List of the callsign of each log, in index order."""
+        if self._callsigns is None:
+            calls = self._strings('calls')
+            self._callsigns = [None if code == -1 else calls[code]
+                               for code in self._views['log_call']]
+        return self._callsigns
+
+    def status_codes(self, log, max_time_delta=30, check_exch=True,
+                     check_band=True):
+        """Return the cross-check status codes of the QSOs of a log.
+
+        Arguments:
+            log: Index of the log.
+            See QSO.match_against for the other arguments.
+
+        Returns:
+            bytes with an index into STATUSES per QSO.
+        """
+        if max_time_delta != -1 and max_time_delta < 0:
+            raise ValueError('Time delta should nonnegative. The only '
+                             'exception is -1, which would turn off time '
+                             'checking.')
+        v = self._views
+        freq, freq_num, numeric, band, mo, second = (
+            v['freq'], v['freq_num'], v['numeric'], v['band'], v['mo'],
+            v['second'])
+        de_call, dx_call, de_exch, dx_exch = (
+            v['de_call'], v['dx_call'], v['de_exch'], v['dx_exch'])
+        pair_key, pair_row = v['pair_key'], v['pair_row']
+        max_seconds = max_time_delta * 60
+
+        codes = bytearray()
+        for row in range(v['log_start'][log], v['log_start'][log + 1]):
+            if not v['valid'][row]:
+                codes.append(0)
+                continue
+            other_log = v['call_log'][dx_call[row]]
+            if other_log == -1:
+                codes.append(4)
+                continue
+
+            key = _pair_key(other_log, dx_call[row], de_call[row])
+            start = bisect.bisect_left(pair_key, key)
+            end = bisect.bisect_right(pair_key, key, start)
+            if start == end:
+                codes.append(3)
+                continue
+
+            status = 2
+            for other in pair_row[start:end]:
+                # See QSO.match_against. Callsigns match by the key.
+                if mo[row] != mo[other]:
+                    continue
+                if max_time_delta != -1 and \
+                        abs(second[row] - second[other]) > max_seconds:
+                    continue
+                if check_exch and (de_exch[row] != dx_exch[other]
+                                   or dx_exch[row] != de_exch[other]):
+                    continue
+                if check_band and freq[row] != freq[other] \
+                        and band[row] != band[other] \
+                        and not (numeric[row] and numeric[other] and abs(
+                            freq_num[row] - freq_num[other]) <= 500):
+                    continue
+                status = 1
+                break
+            codes.append(status)
+        return bytes(codes)
+
+    def results(self, log, max_time_delta=30, check_exch=True,
+                check_band=True):
+        """Return the cross-check results of a log.
+
+        Arguments:
+            log: Index or callsign of the log.
+            See QSO.match_against for the other arguments.
+
+        Returns:
+            list with the status of each QSO in Cabrillo.qso, see
+            CrossCheckIndex.results.
+        """
+        if not isinstance(log, int):
+            log = self.callsigns.index(log)
+        return [STATUSES[code] for code in self.status_codes(
+            log, max_time_delta, check_exch, check_band)]
+
+    def close(self):
+        """Release this process' access to the shared memory."""
+        for view in self._views.values():
+            view.release()
+        self._views = dict()
+        self._memory.close()
+
+    def unlink(self):
+        """Close and free the shared memory. Only for the creator."""
+        self.close()
+        self._memory.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        if self._owner:
+            self.unlink()
+        else:
+            self.close()
+
+
+def _pair_key(log, de_call, dx_call):
+    return (log << 2 * _BITS) | (de_call << _BITS) | dx_call
+
+
+# The index attached to in a worker process of crosscheck_shared.
+_worker_index = None
+
+
+def _attach_worker(handle):
+    global _worker_index
+    _worker_index = SharedContestIndex.attach(handle)
+
+
+def _worker_status_codes(logs, kwargs):
+    return [_worker_index.status_codes(log, **kwargs) for log in logs]
+
+
+def crosscheck_shared(logs, jobs=None, chunk_size=16, **kwargs):
+    """Cross-check the logs of a contest in a pool of worker processes.
+
+    The index is built once in shared memory. Workers attach to it and only
+    return compact status codes.
+
+    Arguments:
+        logs: Iterable of cabrillo.Cabrillo, see SharedContestIndex.create.
+        jobs: Number of worker processes. Defaults to the number of CPUs.
+        chunk_size: Number of logs per task.
+        kwargs: max_time_delta, check_exch and check_band, see
+            QSO.match_against.
+
+    Returns:
+        dict of log callsign to the list of statuses of its QSOs, see
+        CrossCheckIndex.results.
+    """
+    with SharedContestIndex.create(logs) as index:
+        chunks = [range(start, min(start + chunk_size, len(index)))
+                  for start in range(0, len(index), chunk_size)]
+        results = dict()
+        with concurrent.futures.ProcessPoolExecutor(
+                jobs, initializer=_attach_worker,
+                initargs=(index.handle,)) as executor:
+            for chunk, codes in zip(chunks, executor.map(
+                    _worker_status_codes, chunks,
+                    [kwargs] * len(chunks))):
+                for log, log_codes in zip(chunk, codes):
+                    results[index.callsigns[log]] = [
+                        STATUSES[code] for code in log_codes]
+        return results
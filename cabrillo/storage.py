@@ -0,0 +1,156 @@
+"""Contains utilities to store Cabrillo logs in an SQLite database.
+
+Callsigns are stored once in the callsign table and referenced by id. QSOs
+are indexed by callsign pair and by band and time for cross-checking, e.g.:
+
+    SELECT log_id, seq FROM qso
+    WHERE de_call_id = ? AND dx_call_id = ? AND band = ?
+      AND minute BETWEEN ? AND ?
+"""
+from datetime import datetime, timedelta
+
+from cabrillo import QSO, Cabrillo
+from cabrillo.parser import parse_header_items
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS callsign (
+    id INTEGER PRIMARY KEY,
+    call TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS log (
+    id INTEGER PRIMARY KEY,
+    callsign_id INTEGER REFERENCES callsign(id),
+    ignore_order INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS header (
+    log_id INTEGER NOT NULL REFERENCES log(id),
+    seq INTEGER NOT NULL,
+    keyword TEXT NOT NULL,
+    value TEXT NOT NULL,
+    PRIMARY KEY (log_id, seq)
+);
+CREATE TABLE IF NOT EXISTS qso (
+    log_id INTEGER NOT NULL REFERENCES log(id),
+    seq INTEGER NOT NULL,
+    freq TEXT NOT NULL,
+    band TEXT NOT NULL,
+    mo TEXT NOT NULL,
+    minute INTEGER NOT NULL,
+    de_call_id INTEGER NOT NULL REFERENCES callsign(id),
+    de_exch TEXT NOT NULL,
+    dx_call_id INTEGER NOT NULL REFERENCES callsign(id),
+    dx_exch TEXT NOT NULL,
+    t INTEGER,
+    valid INTEGER NOT NULL,
+    PRIMARY KEY (log_id, seq)
+);
+CREATE INDEX IF NOT EXISTS qso_call_pair ON qso (de_call_id, dx_call_id);
+CREATE INDEX IF NOT EXISTS qso_band_minute ON qso (band, minute);
+CREATE INDEX IF NOT EXISTS qso_minute ON qso (minute);
+"""
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+def create_schema(connection):
+    """Create the tables and indexes, unless they exist already.
+
+    Arguments:
+        connection: sqlite3.Connection
+    """
+    connection.executescript(SCHEMA)
+
+
+def save_logs(connection, logs, batch_size=10000):
+    """Store Cabrillo logs.
+
+    Rows are inserted with executemany and committed every batch_size QSOs.
+    QSO times are stored with minute precision, like in the log text.
+
+    Arguments:
+        connection: sqlite3.Connection with the schema created.
+        logs: Iterable of cabrillo.Cabrillo.
+        batch_size: Number of QSOs inserted per transaction.
+
+    Returns:
+        list of int: The ids of the stored logs.
+    """
+    call_ids = dict(connection.execute('SELECT call, id FROM callsign'))
+
+    def call_id(call):
+        if call not in call_ids:
+            call_ids[call] = connection.execute(
+                'INSERT INTO callsign (call) VALUES (?)', (call,)).lastrowid
+        return call_ids[call]
+
+    log_ids = []
+    rows = []
+    for cab in logs:
+        log_id = connection.execute(
+            'INSERT INTO log (callsign_id, ignore_order) VALUES (?, ?)',
+            (None if cab.callsign is None else call_id(cab.callsign),
+             cab.ignore_order)).lastrowid
+        log_ids.append(log_id)
+        connection.executemany(
+            'INSERT INTO header VALUES (?, ?, ?, ?)',
+            [(log_id, seq, keyword, str(value))
+             for seq, (keyword, value) in enumerate(cab.header_items())])
+
+        for seq, qso in enumerate(cab.qso):
+            key = qso.key
+            rows.append((log_id, seq, qso.freq, key.band, qso.mo, key.minute,
+                         call_id(qso.de_call), ' '.join(qso.de_exch),
+                         call_id(qso.dx_call), ' '.join(qso.dx_exch),
+                         qso.t, qso.valid))
+            if len(rows) >= batch_size:
+                connection.executemany(
+                    'INSERT INTO qso VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                    rows)
+                connection.commit()
+                rows = []
+
+    connection.executemany(
+        'INSERT INTO qso VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)', rows)
+    connection.commit()
+    return log_ids
+
+
+def load_logs(connection, log_ids=None):
+    """Read stored Cabrillo logs back, one log at a time.
+
+    Categories and modes are not checked again.
+
+    Arguments:
+        connection: sqlite3.Connection
+        log_ids: Iterable of ids of the logs to load. Defaults to all logs.
+
+    Yields:
+        cabrillo.Cabrillo
+    """
+    if log_ids is None:
+        log_ids = [row[0] for row in
+                   connection.execute('SELECT id FROM log ORDER BY id')]
+
+    for log_id in log_ids:
+        ignore_order, = connection.execute(
+            'SELECT ignore_order FROM log WHERE id = ?', (log_id,)).fetchone()
+
+        results = parse_header_items(connection.execute(
+            'SELECT keyword, value FROM header WHERE log_id = ? '
+            'ORDER BY seq', (log_id,)), ignore_unknown_key=True)
+
+        qso = []
+        for freq, mo, minute, de_call, de_exch, dx_call, dx_exch, t, valid \
+                in connection.execute(
+                    'SELECT freq, mo, minute, de.call, de_exch, dx.call, '
+                    'dx_exch, t, valid FROM qso '
+                    'JOIN callsign de ON de.id = de_call_id '
+                    'JOIN callsign dx ON dx.id = dx_call_id '
+                    'WHERE log_id = ? ORDER BY seq', (log_id,)):
+            qso.append(QSO(freq, mo, _EPOCH + timedelta(minutes=minute),
+                           de_call, dx_call, de_exch=de_exch.split(),
+                           dx_exch=dx_exch.split(), t=t, valid=bool(valid),
+                           check_mode=False))
+
+        yield Cabrillo(check_categories=False, ignore_order=bool(ignore_order),
+                       qso=qso, **results)
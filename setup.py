@@ -14,6 +14,12 @@ setuptools.setup(
     long_description_content_type="text/markdown",
     url="https://github.com/thxo/cabrillo",
     packages=setuptools.find_packages(),
+    extras_require={
+        "arrow": ["pyarrow"],
+    },
+    entry_points={
+        "console_scripts": ["cabrillo=cabrillo.cli:main"],
+    },
     classifiers=[
         "Programming Language :: Python :: 3",
         "License :: OSI Approved :: BSD License",
@@ -0,0 +1,95 @@
+"""Test the conversion between ADIF and Cabrillo QSOs."""
+import io
+from datetime import datetime
+
+import pytest
+
+import path_helper
+
+from cabrillo import QSO
+from cabrillo.adif import read_adif, write_adif
+from cabrillo.errors import InvalidLogException, InvalidQSOException
+from cabrillo.parser import parse_log_file
+
+ADIF = """Exported by some logger <with angle brackets in the header text
+<adif_ver:5>3.1.4
+<EOH>
+<call:5>K4NYX <qso_date:8>20181201 <time_on:6>142015 <freq:6>14.200
+<band:3>20m <mode:3>SSB <rst_sent:2>59 <stx_string:2>NY <rst_rcvd:2>59
+<srx_string:2>FL <station_callsign:8>W200YARC <eor>
+<CALL:4>W1AW<QSO_DATE:8>20181201<TIME_ON:4>1425<BAND:2>2m<MODE:3>FT8
+<RST_SENT:3>-10<RST_RCVD:3>-12<SRX:3>123<EOR>
+"""
+
+
+def test_read_adif():
+    """Test reading ADIF, including records spanning read chunks."""
+    for chunk_size in [7, 65536]:
+        qsos = list(read_adif(io.StringIO(ADIF), de_call='W1XYZ',
+                              chunk_size=chunk_size))
+        assert qsos == [
+            QSO('14200', 'PH', datetime(2018, 12, 1, 14, 20), 'W200YARC',
+                'K4NYX', de_exch=['59', 'NY'], dx_exch=['59', 'FL']),
+            QSO('144', 'DG', datetime(2018, 12, 1, 14, 25), 'W1XYZ',
+                'W1AW', de_exch=['-10'], dx_exch=['-12', '123'])]
+        assert qsos[0].valid and qsos[0].t is None
+
+
+def test_read_adif_errors():
+    """Test reading broken ADIF."""
+    with pytest.raises(InvalidQSOException):
+        list(read_adif(io.StringIO('<CALL:4>W1AW<BAND:3>20m<EOR>')))
+    with pytest.raises(InvalidQSOException):
+        list(read_adif(io.StringIO(ADIF)))
+    with pytest.raises(InvalidLogException):
+        list(read_adif(io.StringIO('<CALL:X>W1AW<EOR>')))
+
+    # Records without an exchange cannot become Cabrillo QSOs.
+    record = ('<CALL:4>W1AW<QSO_DATE:8>20181201<TIME_ON:4>1425<BAND:3>20m'
+              '<MODE:2>CW<STATION_CALLSIGN:4>K3LR{}<EOR>')
+    with pytest.raises(InvalidQSOException):
+        list(read_adif(io.StringIO(record.format(''))))
+    with pytest.raises(InvalidQSOException):
+        list(read_adif(io.StringIO(record.format('<RST_SENT:3>599'))))
+    qso, = read_adif(io.StringIO(record.format('<STX:1>1<SRX:1>2')))
+    assert (qso.de_exch, qso.dx_exch) == (['1'], ['2'])
+
+
+def test_roundtrip():
+    """Test that QSOs survive the conversion to ADIF and back."""
+    for filename, kwargs in [('tests/YARC.log', {}),
+                             ('tests/GB0WR.log', {'ignore_unknown_key': True}),
+                             ('tests/I44Z.log', {'ignore_order': True}),
+                             ('tests/LAQP.log', {'check_mode': False}),
+                             ('tests/iaru.log', {})]:
+        cab = parse_log_file(filename, **kwargs)
+        for rst in [False, True]:
+            out = io.StringIO()
+            write_adif(cab.qso, out, rst=rst)
+            assert ('<RST_SENT:' in out.getvalue()) == rst
+            out.seek(0)
+            qsos = list(read_adif(out, check_mode=False, chunk_size=100))
+            assert qsos == cab.qso
+            assert [(q.t, q.valid) for q in qsos] == \
+                [(q.t, q.valid) for q in cab.qso]
+
+    qsos = [QSO(freq, 'CW', datetime(2020, 1, 1), 'W1AW', 'K3LR',
+                de_exch=['1'], dx_exch=['2'])
+            for freq in ['144', '144300', '10G', '10120', 'LIGHT']]
+    out = io.StringIO()
+    write_adif(qsos, out)
+    assert '<BAND:2>2m' not in out.getvalue()
+    assert '<BAND:2>2M <FREQ:7>144.300' in out.getvalue()
+    out.seek(0)
+    # Above 30 MHz, Cabrillo uses the band designation.
+    assert [qso.freq for qso in read_adif(out)] == \
+        ['144', '144', '10G', '10120', 'LIGHT']
+
+    record = ('<CALL:4>W1AW<QSO_DATE:8>20181201<TIME_ON:4>1425'
+              '<FREQ:{}>{}<MODE:2>CW<STATION_CALLSIGN:4>K3LR'
+              '<STX:1>1<SRX:1>2<EOR>')
+    for mhz, freq in [('28.025', '28025'), ('50.125', '50'),
+                      ('432.100', '432'), ('1296.2', '1.2G'),
+                      ('40.5', '40500')]:
+        qso, = read_adif(io.StringIO(record.format(len(mhz), mhz)))
+        assert qso.freq == freq
@@ -0,0 +1,39 @@
+"""Test the asyncio parsing utilities."""
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+import path_helper
+
+from cabrillo.aio import aparse_log_file, aparse_many
+from cabrillo.errors import InvalidLogException
+from cabrillo.parser import parse_log_file
+
+
+def test_aparse_log_file():
+    """Test that the async parser gives the same result as parse_log_file."""
+    cab = asyncio.run(aparse_log_file('tests/YARC.log', chunk_size=100))
+    expected = parse_log_file('tests/YARC.log')
+    assert cab.qso == expected.qso
+    assert cab.text() == expected.text()
+
+    with pytest.raises(InvalidLogException):
+        asyncio.run(aparse_log_file('tests/badorder.log'))
+
+
+def test_aparse_many():
+    """Test parsing several logs concurrently."""
+    filenames = ['tests/CQWPX.log', 'tests/YARC.log', 'tests/badorder.log',
+                 'tests/iaru.log']
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        results = asyncio.run(aparse_many(filenames, concurrency=2,
+                                          return_exceptions=True,
+                                          executor=executor))
+    assert results[0].callsign == 'AA1ZZZ'
+    assert results[1].qso == parse_log_file('tests/YARC.log').qso
+    assert isinstance(results[2], InvalidLogException)
+    assert len(results[3].qso) == 2
+
+    with pytest.raises(InvalidLogException):
+        asyncio.run(aparse_many(filenames))
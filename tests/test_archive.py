@@ -0,0 +1,65 @@
+"""Test parsing logs straight from archives."""
+import gzip
+import tarfile
+import zipfile
+
+import pytest
+
+import path_helper
+
+from cabrillo.archive import parse_archive
+from cabrillo.errors import InvalidLogException
+from cabrillo.parser import parse_log_file
+
+FILES = ['tests/CQWPX.log', 'tests/YARC.log', 'tests/badorder.log']
+
+
+def check(results):
+    results = dict(results)
+    assert sorted(results) == ['logs/CQWPX.log', 'logs/YARC.CBR',
+                               'logs/badorder.log']
+    assert results['logs/CQWPX.log'].text() == \
+        parse_log_file('tests/CQWPX.log').text()
+    assert results['logs/YARC.CBR'].qso == \
+        parse_log_file('tests/YARC.log').qso
+    assert isinstance(results['logs/badorder.log'], InvalidLogException)
+
+
+def member_name(filename):
+    name = 'logs/' + filename.split('/')[-1]
+    return name.replace('YARC.log', 'YARC.CBR')
+
+
+def test_zip(tmp_path):
+    """Test a zip archive, parsed in this process and in workers."""
+    path = str(tmp_path / 'logs.zip')
+    with zipfile.ZipFile(path, 'w') as archive:
+        for filename in FILES:
+            archive.write(filename, member_name(filename))
+        archive.writestr('logs/README.txt', 'Not a log.')
+    check(parse_archive(path, return_exceptions=True))
+    check(parse_archive(path, jobs=2, return_exceptions=True))
+
+    with pytest.raises(InvalidLogException):
+        list(parse_archive(path))
+
+
+def test_tar(tmp_path):
+    """Test a compressed tar archive."""
+    path = str(tmp_path / 'logs.tar.gz')
+    with tarfile.open(path, 'w:gz') as archive:
+        for filename in FILES:
+            archive.add(filename, member_name(filename))
+    check(parse_archive(path, return_exceptions=True))
+
+
+def test_gzip(tmp_path):
+    """Test a single gzip-compressed log with Windows line breaks."""
+    path = str(tmp_path / 'YARC.log.gz')
+    with open('tests/YARC.log', 'rb') as f:
+        data = f.read().replace(b'\n', b'\r\n')
+    with gzip.open(path, 'wb') as f:
+        f.write(data)
+    [(name, cab)] = parse_archive(path)
+    assert name == 'YARC.log'
+    assert cab.text() == parse_log_file('tests/YARC.log').text()
@@ -0,0 +1,37 @@
+"""Test the benchmark harness and its synthetic log generator."""
+import json
+
+import path_helper
+
+from benchmarks import run
+from benchmarks.synthetic import generate_log
+from cabrillo.parser import parse_log_text
+
+
+def test_generate_log():
+    """Test that synthetic logs are valid and deterministic."""
+    text = generate_log(500, x_qso_ratio=0.1, extra_headers=5)
+    assert text == generate_log(500, x_qso_ratio=0.1, extra_headers=5)
+    cab = parse_log_text(text)
+    assert len(cab.qso) == 500
+    assert cab.x_qso
+    assert len(cab.x_anything) == 5
+    assert parse_log_text(cab.text()).qso == cab.qso
+
+    cab = parse_log_text(generate_log(100, transmitters=2))
+    assert {qso.t for qso in cab.qso} == {0, 1}
+    assert all(qso.match_against(other)
+               for qso, other in zip(cab.qso, run.counterparts(cab)))
+
+
+def test_run(tmp_path):
+    """Test that the harness writes comparable JSON results."""
+    output = tmp_path / 'results.json'
+    run.main(['--sizes', '50', '--repeat', '1', '--output', str(output)])
+    results = json.loads(output.read_text())
+    names = {r['name'] for r in results['results']}
+    assert {'parse_log_text', 'parse_log_file', 'write', 'match_against',
+            'frequency_to_band', 'import_cabrillo'} <= names
+    assert all(r['seconds'] >= 0 and r['peak_bytes'] > 0
+               for r in results['results'])
+    assert len(run.compare(results, results)) == len(results['results'])
@@ -1,11 +1,14 @@
 """Test the Cabrillo class."""
 
+import subprocess
+import sys
 from datetime import datetime
 
 import path_helper
 import pytest
 
-from cabrillo import Cabrillo, QSO
+import cabrillo
+from cabrillo import Cabrillo, QSO, data
 from cabrillo.data import VALID_CATEGORIES_MAP
 from cabrillo.errors import InvalidLogException
 
@@ -178,3 +181,23 @@ def test_append_qso_without_ignore_order():
     cab.append_qso(qso)
     assert len(cab.qso) == 1
     assert cab.qso[0] == qso
+
+
+def test_lazy_import():
+    """Test that importing the package does not import its submodules."""
+    code = ('import sys, cabrillo; '
+            'print(sorted(m for m in sys.modules if m.startswith("cabrillo")))')
+    output = subprocess.run([sys.executable, '-c', code], check=True,
+                            capture_output=True, text=True,
+                            cwd=path_helper.project_root_dir).stdout
+    assert output.strip() == "['cabrillo']"
+
+    assert cabrillo.QSO is QSO
+    assert cabrillo.parser.parse_log_text
+    assert {'QSO', 'Cabrillo', 'parser'} <= set(dir(cabrillo))
+    assert cabrillo.__all__ == ['QSO', 'Cabrillo']
+    assert 'CQ-WPX-CW' in data.CONTEST
+    with pytest.raises(AttributeError):
+        cabrillo.nonexistent
+    with pytest.raises(AttributeError):
+        data.NONEXISTENT
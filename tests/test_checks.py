@@ -0,0 +1,175 @@
+"""Test the checks of a single log."""
+from datetime import datetime, timedelta
+
+import path_helper
+
+from benchmarks.synthetic import generate_log
+from cabrillo import Cabrillo, QSO
+from cabrillo.checks import (DWELL, GAP, INVALID, RATE, REGRESSION, REPEAT,
+                             BandChangeChecker, OperatingPeriod,
+                             SerialChecker, check_band_changes,
+                             check_operating_time, check_serials)
+from cabrillo.parser import parse_log_text
+
+
+def serial_qsos(*serials):
+    """Make QSOs from (sent serial, transmitter) tuples."""
+    return [QSO('14000', 'CW', datetime(2020, 1, 1, 0, minute), 'W1AW',
+                'K3LR', de_exch=['599', serial], dx_exch=['599', '1'], t=t)
+            for minute, (serial, t) in enumerate(serials)]
+
+
+def test_check_serials():
+    """Test that gaps, repeats, regressions and invalid serials are found."""
+    qsos = serial_qsos(('1', None), ('2', None), ('4', None), ('4', None),
+                       ('5', None), ('15', None), ('6', None), ('x', None),
+                       ('7', None))
+    anomalies = check_serials(qsos)
+    assert [(a.index, a.kind, a.expected) for a in anomalies] == [
+        (2, GAP, 3), (3, REPEAT, 5), (5, GAP, 6), (7, INVALID, 7)]
+    assert anomalies[0].qso is qsos[2]
+
+    # A single mistyped serial is reported once, whether it took the place
+    # of the expected serial or was sent in between.
+    for serials in [[1, 2, 3, 4, 5, 60, 7, 8, 9, 10, 11],
+                    [1, 2, 3, 4, 5, 60, 6, 7, 8, 9, 10]]:
+        anomalies = check_serials(serial_qsos(
+            *[(str(serial), None) for serial in serials]))
+        assert [(a.index, a.kind, a.expected) for a in anomalies] == \
+            [(5, GAP, 6)]
+
+    # A real gap continues from the serial sent.
+    anomalies = check_serials(serial_qsos(
+        *[(str(serial), None) for serial in [1, 2, 10, 11, 12]]))
+    assert [(a.index, a.kind) for a in anomalies] == [(2, GAP)]
+    anomalies = check_serials(serial_qsos(
+        *[(str(serial), None) for serial in [1, 2, 60, 30, 31]]))
+    assert [(a.index, a.kind, a.expected) for a in anomalies] == \
+        [(2, GAP, 3), (3, GAP, 4)]
+
+    # The first serial is checked unless start is None.
+    assert [a.kind for a in check_serials(serial_qsos(('3', None)))] == [GAP]
+    assert check_serials(serial_qsos(('3', None), ('4', None)),
+                         start=None) == []
+
+
+def test_check_serials_transmitters():
+    """Test that each transmitter has its own sequence."""
+    qsos = serial_qsos(('1', 0), ('1', 1), ('2', 1), ('2', 0), ('3', 0),
+                       ('2', 1))
+    assert [(a.index, a.kind) for a in check_serials(qsos)] == [(5, REPEAT)]
+
+    cab = parse_log_text(generate_log(500, transmitters=2))
+    assert check_serials(cab.qso) == []
+
+
+def test_serial_checker_streaming():
+    """Test checking QSOs one at a time, e.g. while a log is read."""
+    checker = SerialChecker(field=0, start=10)
+    qsos = [QSO('14000', 'CW', datetime(2020, 1, 1), 'W1AW', 'K3LR',
+                de_exch=[serial, 'MA'], dx_exch=['1', 'CT'])
+            for serial in ['10', '11', '13']]
+    assert checker.check(qsos[0]) is None
+    assert checker.check_all(qsos[1:]) == [(2, qsos[2], GAP, 12)]
+    assert checker.index == 3
+
+
+def timed_log(minutes, category_time=None, offtime=None):
+    """Make a log with QSOs at the given minutes after midnight."""
+    return Cabrillo(
+        callsign='W1AW', category_time=category_time, offtime=offtime,
+        qso=[QSO('14000', 'CW', datetime(2020, 1, 1) + timedelta(minutes=m),
+                 'W1AW', 'K3LR', de_exch=['599', '1'], dx_exch=['599', '1'])
+             for m in minutes])
+
+
+def test_check_operating_time():
+    """Test operating periods, the time limit and the best window."""
+    # 0-9: 10 minutes, 100-104: 5 minutes, 300-339: 40 minutes.
+    minutes = list(range(10)) + [100, 102, 104] + list(range(300, 340, 2))
+    report = check_operating_time(timed_log(minutes))
+    assert [(p.start.hour * 60 + p.start.minute, p.minutes, p.qsos)
+            for p in report.periods] == [(0, 10, 10), (100, 5, 3),
+                                         (300, 39, 20)]
+    assert report.minutes == 54
+    assert report.limit is None
+    assert report.valid
+    assert report.window == OperatingPeriod(datetime(2020, 1, 1),
+                                            datetime(2020, 1, 1, 5, 38),
+                                            54, 33)
+
+    # A longer minimum break joins the first two periods.
+    report = check_operating_time(timed_log(minutes), min_break=120)
+    assert [p.minutes for p in report.periods] == [105, 39]
+
+    # The best 15 minutes are the first two periods.
+    report = check_operating_time(timed_log(minutes), limit=15)
+    assert not report.valid
+    assert (report.window.minutes, report.window.qsos) == (15, 13)
+    # The best 40 minutes span the breaks.
+    report = check_operating_time(timed_log(minutes), limit=40)
+    assert (report.window.minutes, report.window.qsos) == (40, 26)
+    assert report.window.end == datetime(2020, 1, 1, 5, 24)
+
+    report = check_operating_time(timed_log(range(0, 400, 30), '6-HOURS'))
+    assert report.limit == 360
+    assert report.minutes == 391
+    assert not report.valid
+    assert report.window.minutes == 331
+
+    # CATEGORY-TIME values outside the specification are not a limit.
+    cab = timed_log(range(0, 400, 30))
+    cab.category_time = 'ALL'
+    report = check_operating_time(cab)
+    assert report.limit is None
+    assert report.valid
+
+    assert check_operating_time(timed_log([])).window is None
+
+
+def test_check_operating_time_offtime():
+    """Test that QSOs during the declared off-time are reported."""
+    offtime = [datetime(2020, 1, 1, 0, 10), datetime(2020, 1, 1, 2, 0)]
+    report = check_operating_time(timed_log([0, 10, 50, 120, 130],
+                                            offtime=offtime))
+    assert [qso.date.minute for qso in report.offtime_qsos] == [50]
+    assert not report.valid
+
+
+def band_qsos(*qsos):
+    """Make QSOs from (minute, frequency, transmitter) tuples."""
+    return [QSO(freq, 'CW', datetime(2020, 1, 1) + timedelta(minutes=m),
+                'W1AW', 'K3LR', de_exch=['599', '1'], dx_exch=['599', '1'],
+                t=t)
+            for m, freq, t in qsos]
+
+
+def test_check_band_changes():
+    """Test the 10-minute rule per transmitter."""
+    # Leaving the first band of a transmitter is not checked.
+    qsos = band_qsos((0, '14025', 0), (1, '7010', 1), (5, '14030', 1),
+                     (9, '21010', 0), (12, '7020', 1), (19, '7000', 0),
+                     (20, 'LIGHT', 0))
+    violations = check_band_changes(qsos)
+    assert [(v.index, v.kind, v.band, v.previous_band, v.minutes)
+            for v in violations] == [(4, DWELL, '7000', '14000', 7),
+                                     (6, DWELL, 'LIGHT', '7000', 1)]
+    assert violations[0].qso is qsos[4]
+    assert check_band_changes(qsos, min_dwell=None) == []
+
+
+def test_check_band_changes_rate():
+    """Test the maximum number of band changes per hour."""
+    bands = ['14000', '7000']
+    qsos = band_qsos(*[(m, bands[i % 2], 0)
+                       for i, m in enumerate([0, 10, 20, 30, 50, 70, 80])])
+    violations = check_band_changes(qsos, max_changes=3)
+    assert [(v.index, v.kind, v.minutes) for v in violations] == \
+        [(4, RATE, 40)]
+    violations = check_band_changes(qsos, max_changes=3, clock_hour=False)
+    assert [(v.index, v.minutes) for v in violations] == \
+        [(4, 40), (5, 50), (6, 50)]
+
+    checker = BandChangeChecker(min_dwell=None, max_changes=3)
+    assert checker.check_all(qsos[:4]) == []
+    assert [v.index for v in checker.check(qsos[4])] == [4]
@@ -0,0 +1,94 @@
+"""Test the command-line interface."""
+import json
+import shutil
+import sqlite3
+
+import path_helper
+
+from cabrillo.adif import read_adif
+from cabrillo.cli import log_files, main
+from cabrillo.parser import parse_log_file
+from cabrillo.storage import load_logs
+
+
+def test_log_files(tmp_path):
+    """Test that directories are searched recursively for log files."""
+    (tmp_path / 'b').mkdir()
+    for name in ['a.log', 'b/c.CBR', 'b/d.txt']:
+        (tmp_path / name).write_text('')
+    assert [f[len(str(tmp_path)) + 1:] for f in log_files([str(tmp_path)])] \
+        == ['a.log', 'b/c.CBR']
+    assert list(log_files(['x.txt'])) == ['x.txt']
+
+
+def test_validate(capsys):
+    """Test that every error is reported, in parallel too."""
+    for jobs in ['1', '2']:
+        assert main(['validate', '--jobs', jobs, 'tests']) == 1
+        out, err = capsys.readouterr()
+        assert out.splitlines() == [
+            'tests/GB0WR.log:5:11: Unknown key CATEGORY read.',
+            'tests/I44Z.log:28:6: QSOs need to be ordered time-wise.',
+            'tests/LAQP.log:21:6: CW/Digital is not a valid mode.',
+            'tests/badorder.log:18:8: QSOs need to be ordered time-wise.']
+        assert err.startswith('validate: 9 files, 90 QSOs in ')
+
+    assert main(['validate', '--no-check-mode', 'tests/LAQP.log']) == 0
+    assert main(['validate', 'tests/nonexistent.log']) == 1
+
+
+def test_stats(capsys):
+    """Test the QSO counts and rates."""
+    assert main(['stats', 'tests/YARC.log', 'tests/badorder.log']) == 1
+    out, err = capsys.readouterr()
+    stats = json.loads(out)
+    assert stats['file'] == 'tests/YARC.log'
+    assert stats['callsign'] == 'W200YARC'
+    assert (stats['qsos'], stats['valid'], stats['x_qsos']) == (69, 68, 1)
+    assert stats['bands'] == {'14000': 63, '7000': 5}
+    assert stats['first'] == '2018-12-01T14:20:00'
+    assert stats['minutes'] == 573
+    assert stats['peak_hour'] == 16
+    assert 'tests/badorder.log: QSOs need to be ordered' in err
+
+
+def test_convert(tmp_path, capsys):
+    """Test converting to each format."""
+    for to in ['cabrillo', 'adif', 'jsonl']:
+        assert main(['convert', '--to', to, '-o', str(tmp_path), '-j', '2',
+                     'tests/YARC.log']) == 0
+    assert capsys.readouterr()[0] == 'tests/YARC.log: 69 QSOs\n' * 3
+
+    cab = parse_log_file('tests/YARC.log')
+    assert parse_log_file(str(tmp_path / 'YARC.log')).text() == cab.text()
+    with open(tmp_path / 'YARC.adi') as f:
+        assert [qso.dx_call for qso in read_adif(f)] == \
+            [qso.dx_call for qso in cab.qso]
+    lines = (tmp_path / 'YARC.jsonl').read_text().splitlines()
+    assert len(lines) == 69
+    assert sum(not json.loads(line)['valid'] for line in lines) == 1
+
+    database = str(tmp_path / 'logs.db')
+    assert main(['convert', '--to', 'sqlite', '-o', database,
+                 'tests/CQWPX.log', 'tests/YARC.log']) == 0
+    connection = sqlite3.connect(database)
+    assert [log.qso for log in load_logs(connection)] == \
+        [parse_log_file('tests/CQWPX.log').qso, cab.qso]
+    connection.close()
+
+
+def test_crosscheck(tmp_path, capsys):
+    """Test cross-checking a log against its counterpart."""
+    shutil.copy('tests/CQWPX.log', str(tmp_path))
+    text = open('tests/CQWPX.log').read().replace('AA1ZZZ', 'S50A').replace(
+        'QSO: 7005 CW 2009-05-30 0002 S50A 599 1 S50A 599 4',
+        'QSO: 7005 CW 2009-05-30 0003 S50A 599 4 AA1ZZZ 599 1')
+    (tmp_path / 'S50A.log').write_text(text)
+
+    assert main(['crosscheck', '--details', str(tmp_path)]) == 0
+    lines = [json.loads(line) for line in capsys.readouterr()[0].splitlines()]
+    assert lines[0]['callsign'] == 'AA1ZZZ'
+    assert (lines[0]['matched'], lines[0]['unverified']) == (1, 1)
+    assert [qso['status'] for qso in lines[0]['unmatched']] == ['unverified']
+    assert lines[1]['callsign'] == 'S50A'
+    assert lines[1]['matched'] == 1
@@ -0,0 +1,96 @@
+"""Test the columnar export of QSOs."""
+import pytest
+
+import path_helper
+
+from benchmarks.synthetic import generate_log
+from cabrillo.columnar import QSOColumns
+from cabrillo.errors import InvalidLogException, InvalidQSOException
+from cabrillo.parser import parse_log_file, parse_log_text
+
+
+def test_columns():
+    """Test that the columns hold every QSO field."""
+    columns = QSOColumns()
+    columns.add_log(parse_log_file('tests/CQWPX.log'))
+    assert len(columns) == 2
+    assert columns.to_pydict() == {
+        'log': ['AA1ZZZ', 'AA1ZZZ'],
+        'band': ['7000', '7000'],
+        'mo': ['CW', 'CW'],
+        'de_call': ['AA1ZZZ', 'AA1ZZZ'],
+        'dx_call': ['S50A', 'EF8M'],
+        'freq': [7005, 7006],
+        'minute': [20727362, 20727375],
+        't': [None, None],
+        'valid': [True, True],
+        'de_exch': [['599', '1'], ['599', '2']],
+        'dx_exch': [['599', '4'], ['599', '34']]}
+    assert columns.mo.values == ['CW']
+
+
+def test_add_log_text():
+    """Test that adding log text gives the same columns as adding QSOs."""
+    texts = [generate_log(300, transmitters=2, x_qso_ratio=0.1),
+             generate_log(100, callsign='K1ABC', seed=1),
+             open('tests/YARC.log').read()]
+    from_text = QSOColumns()
+    from_qsos = QSOColumns()
+    for text in texts:
+        cab = from_text.add_log_text(text)
+        from_qsos.add_log(parse_log_text(text))
+        assert len(cab.qso) == len(parse_log_text(text).qso)
+    assert len(from_text) == 469
+    assert from_text.to_pydict() == from_qsos.to_pydict()
+
+
+def test_add_log_text_invalid():
+    """Test that invalid logs raise like parse_log_text and are not added."""
+    columns = QSOColumns()
+    columns.add_log_text(open('tests/CQWPX.log').read())
+    with pytest.raises(InvalidLogException):
+        columns.add_log_text(open('tests/badorder.log').read())
+    with pytest.raises(InvalidQSOException):
+        columns.add_log_text(open('tests/LAQP.log').read())
+    with pytest.raises(InvalidQSOException):
+        columns.add_log_text(open('tests/CQWPX.log').read().replace(
+            '0015', '0075'))
+    assert len(columns) == 2
+    assert len(columns.de_exch) == 2
+
+    columns.add_log_text(open('tests/LAQP.log').read(), check_mode=False,
+                         ignore_unknown_key=True)
+    assert columns.mo.values == ['CW', 'CW/Digital']
+
+
+def test_save_load(tmp_path):
+    """Test writing the raw buffers and reading them back."""
+    columns = QSOColumns()
+    columns.add_log_text(generate_log(200, transmitters=2))
+    columns.save(str(tmp_path))
+    loaded = QSOColumns.load(str(tmp_path))
+    assert loaded.to_pydict() == columns.to_pydict()
+
+    # Loaded columns can be extended.
+    loaded.add_log_text(generate_log(10, callsign='K1ABC'))
+    columns.add_log_text(generate_log(10, callsign='K1ABC'))
+    assert loaded.to_pydict() == columns.to_pydict()
+
+
+def test_arrow(tmp_path):
+    """Test Arrow IPC and Parquet output."""
+    pyarrow = pytest.importorskip('pyarrow')
+    import pyarrow.parquet
+
+    columns = QSOColumns()
+    columns.add_log_text(generate_log(200, transmitters=2, x_qso_ratio=0.1))
+    columns.add_log(parse_log_file('tests/CQWPX.log'))
+    table = columns.to_arrow()
+    assert table.to_pydict() == columns.to_pydict()
+
+    columns.write_arrow(str(tmp_path / 'qsos.arrow'))
+    with pyarrow.ipc.open_file(str(tmp_path / 'qsos.arrow')) as reader:
+        assert reader.read_all().equals(table)
+    columns.write_parquet(str(tmp_path / 'qsos.parquet'))
+    assert pyarrow.parquet.read_table(str(tmp_path / 'qsos.parquet')) \
+        .to_pydict() == columns.to_pydict()
@@ -0,0 +1,145 @@
+"""Test contest-wide statistics."""
+import pickle
+from datetime import datetime
+
+import pytest
+
+import path_helper
+
+from benchmarks.synthetic import generate_log
+from cabrillo import Cabrillo, QSO
+from cabrillo.contest import CallCounter, ExchangeChecker
+from cabrillo.parser import parse_log_text
+
+
+def make_log(callsign, *dx_calls):
+    return Cabrillo(callsign=callsign, qso=[
+        QSO('14000', 'CW', datetime(2020, 1, 1, 0, minute), callsign, dx_call,
+            de_exch=['599', '1'], dx_exch=['599', '2'])
+        for minute, dx_call in enumerate(dx_calls)])
+
+
+def make_logs():
+    return [make_log('W1AW', 'K3LR', 'N2IC', 'dl1abc', 'K3LR'),
+            make_log('K3LR', 'W1AW', 'N2IC'),
+            make_log('N2IC', 'W1AW', 'K3LR', 'VE3XYZ')]
+
+
+def test_exact():
+    """Test that each log counts a callsign once."""
+    counter = CallCounter()
+    for cab in make_logs():
+        counter.add_log(cab)
+    assert counter.logs == 3
+    assert (counter['K3LR'], counter['w1aw'], counter['N2IC']) == (2, 2, 2)
+    assert counter['NOBODY'] == 0
+    assert sorted(counter.uniques()) == ['DL1ABC', 'VE3XYZ']
+    assert counter.uniques(['ve3xyz', 'K3LR']) == ['VE3XYZ']
+    assert [qso.dx_call for qso in counter.unique_qsos(make_logs()[0])] == \
+        ['dl1abc']
+
+    # X-QSOs are not counted.
+    x_log = make_log('DL1ABC', 'VE3XYZ')
+    x_log.qso[0].valid = False
+    counter.add_log(x_log)
+    assert counter['VE3XYZ'] == 1
+
+
+def test_merge():
+    """Test that counters of several processes merge to the same counts."""
+    for width in [None, 512]:
+        whole = CallCounter(width)
+        parts = [CallCounter(width), CallCounter(width)]
+        for i, cab in enumerate(make_logs()):
+            whole.add_log(cab)
+            parts[i % 2].add_log(cab)
+        merged = pickle.loads(pickle.dumps(parts[0]))
+        merged.merge(pickle.loads(pickle.dumps(parts[1])))
+        assert merged.logs == 3
+        for call in ['K3LR', 'W1AW', 'N2IC', 'DL1ABC', 'VE3XYZ', 'X']:
+            assert merged[call] == whole[call]
+
+    with pytest.raises(ValueError):
+        CallCounter().merge(CallCounter(512))
+    with pytest.raises(ValueError):
+        CallCounter(512).merge(CallCounter(256))
+
+
+def test_approximate():
+    """Test that approximate counts are never too low."""
+    exact = CallCounter()
+    approximate = CallCounter(width=8192, depth=4)
+    for seed in range(5):
+        cab = parse_log_text(generate_log(2000, callsign='K{}A'.format(seed),
+                                          seed=seed))
+        exact.add_log(cab)
+        approximate.add_log(cab)
+
+    calls = list(exact._counts)
+    assert len(calls) > 2000
+    assert all(approximate[call] >= exact[call] for call in calls)
+    assert sum(approximate[call] == exact[call] for call in calls) \
+        > 0.95 * len(calls)
+    assert set(approximate.uniques(calls)) <= set(exact.uniques())
+    with pytest.raises(ValueError):
+        approximate.uniques()
+
+
+def exchange_log(callsign, *qsos):
+    return Cabrillo(callsign=callsign, qso=[
+        QSO('14000', 'CW', datetime(2020, 1, 1, 0, minute), callsign, dx_call,
+            de_exch=['599', '5'], dx_exch=received.split())
+        for minute, (dx_call, received) in enumerate(qsos)])
+
+
+def exchange_logs():
+    return [exchange_log('W1AW', ('K3LR', '599 5'), ('N2IC', '599 4')),
+            exchange_log('K1ABC', ('K3LR', '599 5'), ('n2ic', '599 4'),
+                         ('DL1ABC', '599 14')),
+            exchange_log('W2XYZ', ('K3LR', '579 6'), ('N2IC', '599 5'),
+                         ('DL1ABC', '599 15')),
+            exchange_log('K4DEF', ('K3LR', '599 5'))]
+
+
+def test_exchange_checker():
+    """Test that minority exchanges are flagged."""
+    checker = ExchangeChecker()
+    for cab in exchange_logs():
+        checker.add_log(cab)
+    assert checker.majority('K3LR') == ('599', '5')
+    assert checker.majority('n2ic') == ('599', '4')
+    # Tied.
+    assert checker.majority('DL1ABC') is None
+    assert checker.majority('NOBODY') is None
+    assert sorted(call for call, _, _ in checker.inconsistent()) == \
+        ['DL1ABC', 'K3LR', 'N2IC']
+
+    assert checker.outliers(exchange_logs()[0]) == []
+    outliers = checker.outliers(exchange_logs()[2])
+    assert [(qso.dx_call, majority) for qso, majority in outliers] == \
+        [('K3LR', ('599', '5')), ('N2IC', ('599', '4'))]
+
+    # Only compare the zone.
+    checker = ExchangeChecker(fields=[1])
+    for cab in exchange_logs():
+        checker.add_log(cab)
+    assert checker.majority('K3LR') == ('5',)
+    assert [qso.dx_call for qso, _ in checker.outliers(exchange_logs()[2])] \
+        == ['K3LR', 'N2IC']
+
+    # A single QSO is not enough to check.
+    assert ExchangeChecker(min_count=5).majority('K3LR') is None
+
+
+def test_exchange_checker_merge():
+    """Test that checkers of several processes merge."""
+    whole = ExchangeChecker()
+    parts = [ExchangeChecker(), ExchangeChecker()]
+    for i, cab in enumerate(exchange_logs()):
+        whole.add_log(cab)
+        parts[i % 2].add_log(cab)
+    merged = pickle.loads(pickle.dumps(parts[0]))
+    merged.merge(parts[1])
+    assert dict(merged._exchanges) == dict(whole._exchanges)
+    with pytest.raises(ValueError):
+        merged.merge(ExchangeChecker(fields=[1]))
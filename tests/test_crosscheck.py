@@ -0,0 +1,73 @@
+"""Test cross-checking the logs of a contest."""
+from datetime import datetime
+
+import path_helper
+
+from cabrillo import Cabrillo, QSO
+from cabrillo.crosscheck import (BUSTED, MATCHED, NIL, UNVERIFIED,
+                                 CrossCheckIndex)
+
+
+def make_log(callsign, *qsos):
+    """Make a log from (minute, dx_call, sent, received) tuples."""
+    return Cabrillo(callsign=callsign, qso=[
+        QSO('14000', 'CW', datetime(2020, 1, 1, 0, minute), callsign, dx_call,
+            de_exch=['599', sent], dx_exch=['599', received])
+        for minute, dx_call, sent, received in qsos])
+
+
+def make_logs():
+    return [make_log('W1AW', (0, 'K3LR', '1', '7'), (1, 'N2IC', '2', '3'),
+                     (2, 'DL1ABC', '3', '1'), (3, 'VE3XYZ', '4', '9')),
+            make_log('K3LR', (0, 'W1AW', '7', '1'), (5, 'N2IC', '8', '4')),
+            make_log('N2IC', (1, 'W1AW', '3', '22'), (5, 'K3LR', '4', '8'))]
+
+
+def test_results():
+    """Test the cross-check statuses."""
+    index = CrossCheckIndex()
+    for cab in make_logs():
+        index.add_log(cab)
+    assert index.results('W1AW') == [MATCHED, BUSTED, UNVERIFIED, UNVERIFIED]
+    assert index.results('K3LR') == [MATCHED, MATCHED]
+    assert index.results('N2IC') == [BUSTED, MATCHED]
+
+    index.add_log(make_log('DL1ABC', (2, 'W1AW', '1', '3')))
+    assert index.results('W1AW')[2] == MATCHED
+
+    # X-QSOs are not checked, and do not count as counterparts.
+    x_log = make_log('VE3XYZ', (3, 'W1AW', '9', '4'))
+    x_log.qso[0].valid = False
+    index.add_log(x_log)
+    assert index.results('VE3XYZ') == [None]
+    assert index.results('W1AW')[3] == NIL
+
+
+def test_replace_log():
+    """Test that replacing a log only affects the logs that worked it."""
+    index = CrossCheckIndex()
+    logs = make_logs()
+    for cab in logs:
+        index.add_log(cab)
+    index.add_log(make_log('G4ABC', (9, 'F5XYZ', '1', '1')))
+    for callsign in index.logs:
+        index.results(callsign)
+
+    affected = index.replace_log(
+        make_log('N2IC', (1, 'W1AW', '3', '2'), (5, 'K3LR', '4', '8')))
+    assert affected == {'N2IC', 'W1AW', 'K3LR'}
+    assert 'G4ABC' in index._results
+    assert index.results('W1AW') == [MATCHED, MATCHED, UNVERIFIED,
+                                     UNVERIFIED]
+    assert index.results('N2IC') == [MATCHED, MATCHED]
+
+    assert index.remove_log('K3LR') == {'W1AW', 'N2IC'}
+    assert index.results('W1AW')[0] == UNVERIFIED
+    assert index.results('N2IC') == [MATCHED, UNVERIFIED]
+    assert index.remove_log('K3LR') == set()
+
+    # Matching options are passed on to QSO.match_against.
+    index = CrossCheckIndex(check_exch=False)
+    for cab in logs:
+        index.add_log(cab)
+    assert index.results('W1AW')[1] == MATCHED
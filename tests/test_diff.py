@@ -0,0 +1,42 @@
+"""Test comparing two versions of a log."""
+import copy
+from datetime import datetime
+
+import path_helper
+
+from cabrillo import QSO
+from cabrillo.diff import diff_logs
+from cabrillo.parser import parse_log_file
+
+
+def test_diff_identical():
+    """Test that a log does not differ from itself."""
+    old = parse_log_file('tests/YARC.log')
+    new = parse_log_file('tests/YARC.log', lazy=True)
+    assert diff_logs(old, new) == ([], [], [], {})
+
+
+def test_diff():
+    """Test added, removed and modified QSOs and header changes."""
+    old = parse_log_file('tests/YARC.log')
+    new = parse_log_file('tests/YARC.log')
+    new.qso = [copy.copy(qso) for qso in new.qso]
+
+    removed = new.qso.pop(10)
+    new.qso[0].dx_exch = ['045', 'GA']
+    new.qso[1].valid = False
+    added = QSO('14200', 'PH', datetime(2018, 12, 1, 14, 21), 'W200YARC',
+                'W1AW', de_exch=['19', 'NY'], dx_exch=['01', 'CT'])
+    new.qso.insert(1, added)
+    new.claimed_score = 1
+    new.soapbox = ['Corrected log.']
+    del new.x_anything['X-LOREM']
+
+    diff = diff_logs(old, new)
+    assert diff.added == [added]
+    assert diff.removed == [removed]
+    assert diff.modified == [(old.qso[0], new.qso[0]),
+                             (old.qso[1], new.qso[2])]
+    assert diff.headers == {'CLAIMED-SCORE': (['5945'], ['1']),
+                            'SOAPBOX': ([], ['Corrected log.']),
+                            'X-LOREM': (['Ipsum'], [])}
@@ -0,0 +1,62 @@
+"""Test the out-of-core cross-check."""
+import os
+
+import pytest
+
+import path_helper
+
+from cabrillo import externalcheck
+from cabrillo.crosscheck import CrossCheckIndex
+from cabrillo.externalcheck import crosscheck_external
+from test_sharedindex import OPTIONS, make_contest
+
+
+def expected_results(logs, **options):
+    index = CrossCheckIndex(**options)
+    for cab in logs:
+        index.add_log(cab)
+    return [(callsign, index.results(callsign)) for callsign in index.logs]
+
+
+def test_results(tmp_path):
+    """Test that the statuses equal those of CrossCheckIndex."""
+    logs = make_contest()
+    for options in OPTIONS:
+        results = list(crosscheck_external(iter(logs), directory=str(tmp_path),
+                                           **options))
+        assert results == expected_results(logs, **options)
+    # Temporary files are removed.
+    assert os.listdir(str(tmp_path)) == []
+
+    assert list(crosscheck_external([])) == []
+    with pytest.raises(ValueError):
+        crosscheck_external(logs, max_time_delta=-2)
+
+
+def test_spill(tmp_path, monkeypatch):
+    """Test that a small memory budget spills many runs, merged in passes."""
+    written = []
+    write_run = externalcheck._write_run
+
+    def record_run(lines, directory, runs):
+        write_run(lines, directory, runs)
+        written.append(runs[-1])
+
+    monkeypatch.setattr(externalcheck, '_write_run', record_run)
+    monkeypatch.setattr(externalcheck, 'MAX_FAN_IN', 4)
+    logs = make_contest(num_qsos=500, seed=1)
+    results = crosscheck_external(logs, memory=4096, directory=str(tmp_path))
+    assert list(results) == expected_results(logs)
+    assert len(written) > 16
+
+
+def test_replaced_log():
+    """Test that a later log with the same callsign replaces the earlier."""
+    logs = make_contest(num_logs=4, num_qsos=60)
+    resubmitted = make_contest(num_logs=4, num_qsos=60, seed=2)[1]
+    logs.append(resubmitted)
+    results = list(crosscheck_external(logs))
+    assert [callsign for callsign, _ in results] == \
+        [logs[0].callsign, logs[2].callsign, logs[3].callsign,
+         resubmitted.callsign]
+    assert sorted(results) == sorted(expected_results(logs))
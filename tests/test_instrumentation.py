@@ -0,0 +1,42 @@
+"""Test the collection of parsing statistics."""
+import os
+
+import pytest
+
+import path_helper
+
+from cabrillo.errors import InvalidLogException
+from cabrillo.instrumentation import ParseStats
+from cabrillo.parser import parse_log_file
+
+
+def test_parse_stats():
+    """Test that counters and timings are collected and accumulate."""
+    stats = ParseStats()
+    cab = parse_log_file('tests/YARC.log', stats=stats)
+    assert stats.logs == 1
+    assert stats.qsos == len(cab.qso)
+    assert stats.lines == 96
+    assert stats.bytes == os.path.getsize('tests/YARC.log')
+    for stage in ParseStats.STAGES:
+        assert stats.ns[stage] > 0
+    assert stats.ns['strptime'] < stats.ns['parse_qso']
+
+    parse_log_file('tests/YARC.log', stats=stats, lazy=True)
+    assert stats.logs == 2
+    assert stats.qsos == len(cab.qso)
+
+    exported = stats.as_dict()
+    assert exported['logs'] == 2
+    assert exported['parse_qso_ns'] == stats.ns['parse_qso']
+    assert str(stats) == '<ParseStats of 2 logs, {} QSOs>'.format(stats.qsos)
+
+
+def test_parse_stats_same_result():
+    """Test that instrumented parsing behaves like uninstrumented parsing."""
+    for filename in ['tests/CQWPX.log', 'tests/iaru.log', 'tests/GB0WR.log']:
+        assert parse_log_file(filename, ignore_unknown_key=True).text() == \
+            parse_log_file(filename, ignore_unknown_key=True,
+                           stats=ParseStats()).text()
+    with pytest.raises(InvalidLogException):
+        parse_log_file('tests/badorder.log', stats=ParseStats())
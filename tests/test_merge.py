@@ -0,0 +1,57 @@
+"""Test merging several logs into one."""
+import io
+from datetime import datetime
+
+import pytest
+
+import path_helper
+
+from cabrillo import Cabrillo, QSO
+from cabrillo.errors import InvalidLogException
+from cabrillo.merge import merge_qsos, write_merged
+from cabrillo.parser import parse_log_file, parse_log_text
+
+
+def make_qso(minute, dx_call):
+    return QSO('14000', 'CW', datetime(2020, 1, 1, 0, minute), 'W1AW',
+               dx_call, de_exch=['599'], dx_exch=['599'])
+
+
+def test_merge_qsos():
+    """Test that merging is stable and sets transmitter IDs."""
+    first = [make_qso(0, 'A1'), make_qso(1, 'A2'), make_qso(1, 'A3'),
+             make_qso(5, 'A4')]
+    second = Cabrillo(callsign='W1AW',
+                      qso=[make_qso(1, 'B1'), make_qso(1, 'B2'),
+                           make_qso(2, 'B3')])
+
+    merged = list(merge_qsos([first, second]))
+    assert [qso.dx_call for qso in merged] == \
+        ['A1', 'A2', 'A3', 'B1', 'B2', 'B3', 'A4']
+    assert all(qso.t is None for qso in merged)
+
+    merged = list(merge_qsos([iter(first), second], transmitters=[0, 1]))
+    assert [qso.t for qso in merged] == [0, 0, 0, 1, 1, 1, 0]
+    # The sources are left alone.
+    assert first[0].t is None
+
+    with pytest.raises(ValueError):
+        merge_qsos([first, second], transmitters=[0])
+    with pytest.raises(InvalidLogException):
+        list(merge_qsos([first, list(reversed(first))]))
+
+
+def test_write_merged():
+    """Test writing a merged log from parsed logs."""
+    yarc = parse_log_file('tests/YARC.log', lazy=True)
+    qsos = list(yarc.qso)
+    even = Cabrillo(callsign='W200YARC', qso=qsos[::2])
+    odd = Cabrillo(callsign='W200YARC', qso=qsos[1::2])
+    header = parse_log_text(yarc.text().split('QSO:')[0])
+
+    out = io.StringIO()
+    write_merged(out, header, [even, odd], transmitters=[0, 1])
+    cab = parse_log_text(out.getvalue())
+    assert cab.qso == qsos
+    assert [qso.t for qso in cab.qso] == [i % 2 for i in range(len(qsos))]
+    assert cab.callsign == 'W200YARC'
@@ -1,13 +1,16 @@
 """Test the parsing of Cabrillo logs."""
+import io
 from datetime import datetime
 
 import pytest
 
 import path_helper
 
-from cabrillo import QSO
+from cabrillo import Cabrillo, QSO
 from cabrillo.errors import InvalidLogException, InvalidQSOException
-from cabrillo.parser import parse_log_file, parse_log_text
+from cabrillo.parser import (IncrementalParser, parse_header_items,
+                             parse_log_bytes, parse_log_file, parse_log_text,
+                             validate_log_file, validate_log_text)
 
 
 def test_parse_cqwpx():
@@ -240,3 +243,225 @@ def test_parse_bad_claimed_score():
 
     with pytest.raises(InvalidLogException) as _:
         parse_log_text(bad_text)
+
+
+def test_parse_lazy():
+    """Test that lazily parsed logs produce the same QSOs on access."""
+    eager = parse_log_file('tests/YARC.log')
+    cab = parse_log_file('tests/YARC.log', lazy=True)
+    assert len(cab.qso) == len(eager.qso)
+    assert cab.qso[-1] == eager.qso[-1]
+    assert cab.qso[1:3] == eager.qso[1:3]
+    assert cab.qso == eager.qso
+    assert cab.x_qso == eager.x_qso
+    assert cab.text() == eager.text()
+    cab.validate_all()
+
+    text = open('tests/YARC.log').read()
+    spans = list(cab.qso.iter_spans())
+    assert len(spans) == len(eager.qso)
+    start, end, valid = spans[0]
+    assert text[start:end].split()[4] == eager.qso[0].de_call
+    assert valid == eager.qso[0].valid
+
+
+def test_parse_normalize():
+    """Test that normalized logs hold the same QSOs, upper-cased."""
+    text = open('tests/YARC.log').read()
+    # Lower-case the QSO data, but not the keywords.
+    lines = [line.partition(':') for line in text.split('\n')]
+    lower = '\n'.join(key + colon + (value.lower() if 'QSO' in key else value)
+                      for key, colon, value in lines)
+    cab = parse_log_text(lower, normalize=True)
+    eager = parse_log_text(text)
+    assert cab.qso == eager.qso
+    assert all(qso.normalized for qso in cab.qso)
+    lazy = parse_log_file('tests/YARC.log', lazy=True, normalize=True)
+    assert lazy.qso == eager.qso
+    assert lazy.qso[0].normalized
+
+
+def test_parse_lazy_write_order():
+    """Test that lazy logs are checked for order before output."""
+    cab = parse_log_file('tests/badorder.log', lazy=True)
+    with pytest.raises(InvalidLogException):
+        cab.text()
+    out = io.StringIO()
+    with pytest.raises(InvalidLogException):
+        cab.write(out)
+    assert out.getvalue() == ''
+
+
+def test_parse_lazy_errors_on_access():
+    """Test that errors in lazily parsed QSOs surface on access."""
+    text = ("START-OF-LOG: 3.0\n"
+            "QSO: 14000 CW 2020-01-01 0000 W1AW 599 1 VA2RAC 599 4\n"
+            "QSO: 14000 CW 2020-13-45 9999 W1AW 599 2 VA2RAC 599 5\n"
+            "END-OF-LOG:\n")
+    cab = parse_log_text(text, lazy=True)
+    assert cab.qso[0].dx_call == 'VA2RAC'
+    with pytest.raises(InvalidQSOException):
+        cab.qso[1]
+    with pytest.raises(InvalidQSOException):
+        cab.validate_all()
+
+    cab = parse_log_file('tests/badorder.log', lazy=True)
+    with pytest.raises(InvalidLogException):
+        cab.validate_all()
+    parse_log_file('tests/badorder.log', lazy=True,
+                   ignore_order=True).validate_all()
+
+
+def test_parse_header_items():
+    """Test that header items parse back to the same header."""
+    cab = parse_log_file('tests/YARC.log')
+    copy = Cabrillo(qso=cab.qso, **parse_header_items(cab.header_items()))
+    assert copy.text() == cab.text()
+    with pytest.raises(InvalidLogException):
+        parse_header_items([('DOGS-SHOULD-VOTE', 'YES')])
+    assert 'x_anything' in parse_header_items(
+        [('DOGS-SHOULD-VOTE', 'YES')], ignore_unknown_key=True)
+
+
+def test_incremental_parser(tmp_path):
+    """Test parsing a log file while it is being written."""
+    with open('tests/YARC.log') as infile:
+        lines = infile.read().splitlines(keepends=True)
+    qso_start = next(i for i, line in enumerate(lines)
+                     if line.startswith(('QSO:', 'X-QSO:')))
+    log = tmp_path / 'live.log'
+
+    # Header and a QSO line cut in half.
+    log.write_text(''.join(lines[:qso_start + 1]) + lines[qso_start + 1][:20])
+    parser = IncrementalParser(str(log))
+    new_qso = parser.update()
+    assert len(new_qso) == 1
+    assert parser.cabrillo.callsign == 'W200YARC'
+    assert len(parser.cabrillo.qso) == 1
+    assert not parser.finished
+
+    # The rest of the log.
+    with open(str(log), 'a') as f:
+        f.write(lines[qso_start + 1][20:] + ''.join(lines[qso_start + 2:]))
+    new_qso = parser.update()
+    assert parser.finished
+    assert parser.update() == []
+
+    expected = parse_log_file('tests/YARC.log')
+    assert new_qso == expected.qso[1:]
+    assert parser.cabrillo.qso == expected.qso
+    assert parser.cabrillo.text() == expected.text()
+
+    # Truncated files are not silently re-read.
+    log.write_text(''.join(lines[:qso_start]))
+    with pytest.raises(InvalidLogException):
+        parser.update()
+    parser.reset()
+    assert parser.update() == []
+
+
+def test_incremental_parser_order(tmp_path):
+    """Test that the incremental parser keeps the ordering checks."""
+    log = tmp_path / 'live.log'
+    with open('tests/badorder.log') as infile:
+        log.write_text(infile.read())
+    with pytest.raises(InvalidLogException):
+        IncrementalParser(str(log)).update()
+    parser = IncrementalParser(str(log), ignore_order=True)
+    parser.update()
+    assert parser.cabrillo.qso == parse_log_file('tests/badorder.log',
+                                                 ignore_order=True).qso
+
+
+def test_incremental_parser_error(tmp_path):
+    """Test that QSOs before a bad line in one chunk are not lost."""
+    log = tmp_path / 'live.log'
+    header = 'START-OF-LOG: 3.0\nCALLSIGN: W1AW\n'
+    good = ('QSO: 14000 CW 2020-01-01 0010 W1AW 599 1 VA2RAC 599 4\n'
+            'QSO: 14000 CW 2020-01-01 0011 W1AW 599 2 K3LR 599 5\n')
+    bad = 'QSO: 14000 CW 2020-13-45 9999 W1AW 599 3 N2IC 599 6\n'
+    log.write_text(header + good + bad)
+    parser = IncrementalParser(str(log))
+    with pytest.raises(InvalidQSOException):
+        parser.update()
+    assert len(parser.cabrillo.qso) == 2
+    assert parser.pending_qso == parser.cabrillo.qso
+    with pytest.raises(InvalidQSOException):
+        parser.update()
+    assert len(parser.pending_qso) == 2
+
+    # The consumer takes the partial delta, and starts anew once the file
+    # is fixed.
+    log.write_text(header + good + bad.replace('2020-13-45 9999',
+                                               '2020-01-01 0012'))
+    parser.reset()
+    assert parser.pending_qso == []
+    new_qso = parser.update()
+    assert [qso.dx_call for qso in new_qso] == ['VA2RAC', 'K3LR', 'N2IC']
+    assert parser.pending_qso == []
+    assert parser.update() == []
+
+
+def test_validate_log_text():
+    """Test that validation collects all errors with their positions."""
+    text = ("START-OF-LOG: 3.0\n"
+            "CATEGORY-POWER: ITALIAN-QRP\n"
+            "CLAIMED-SCORE: 12,345\n"
+            "DOGS-SHOULD-VOTE: YES\n"
+            "blah\n"
+            "QSO: 14000 CW 2020-01-01 0010 W1AW 599 1 VA2RAC 599 4\n"
+            "QSO: 14000 CW 2020-13-45 9999 W1AW 599 2 VA2RAC 599 5\n"
+            "QSO: 14000 MCW 2020-01-01 0011 W1AW 599 3 VA2RAC 599 6\n"
+            "QSO:   14000 CW 2020-01-01 0000 W1AW 599 4 VA2RAC 599 7\n"
+            "QSO: 14000 CW 2020-01-01 0012 W1AW 599 5 VA2RAC 599 8\n"
+            "END-OF-LOG:\n"
+            "garbage after the end\n")
+    report = validate_log_text(text)
+    assert not report.valid
+    assert report.qso_count == 5
+    assert [(e.line, e.column) for e in report.errors] == [
+        (2, 17), (3, 16), (4, 19), (5, 1), (7, 6), (8, 6), (9, 8)]
+    assert isinstance(report.errors[0].exception, InvalidLogException)
+    assert isinstance(report.errors[4].exception, InvalidQSOException)
+    assert str(report).startswith('2:17: Got ITALIAN-QRP')
+
+    report = validate_log_text(text, ignore_unknown_key=True,
+                               check_categories=False, ignore_order=True)
+    assert [e.line for e in report.errors] == [3, 5, 7, 8]
+
+    # An empty version is accepted, like parse_log_text does.
+    text = ('START-OF-LOG:\n'
+            'QSO: 14000 CW 2020-01-01 0010 W1AW 599 1 VA2RAC 599 4\n')
+    assert validate_log_text(text).valid
+    assert parse_log_text(text).version == '3.0'
+    assert not validate_log_text('START-OF-LOG: 2.0\n').valid
+
+
+def test_validate_log_file():
+    """Test that valid logs validate without errors."""
+    for filename in ['tests/CQWPX.log', 'tests/YARC.log', 'tests/iaru.log']:
+        report = validate_log_file(filename)
+        assert report.valid
+        assert report.qso_count == len(parse_log_file(filename).qso)
+    report = validate_log_file('tests/badorder.log')
+    assert len(report.errors) == 1
+    assert not validate_log_text('START-OF-LOG: 2.0\n').valid
+
+
+def test_parse_encoding(tmp_path):
+    """Test decoding UTF-8 and Latin-1 logs and the legacy decoding."""
+    assert parse_log_file('tests/iaru.log').name == 'Andreas Krüger'
+    assert parse_log_file('tests/iaru.log',
+                          encoding='unicode_escape').name == 'Andreas KrÃ¼ger'
+
+    with open('tests/iaru.log', encoding='utf-8') as f:
+        text = f.read()
+    latin1 = tmp_path / 'latin1.log'
+    latin1.write_bytes(text.encode('latin-1'))
+    assert parse_log_file(str(latin1)).name == 'Andreas Krüger'
+    bom = tmp_path / 'bom.log'
+    bom.write_bytes(text.replace('\n', '\r\n').encode('utf-8-sig'))
+    assert parse_log_file(str(bom)).text() == \
+        parse_log_file('tests/iaru.log').text()
+    assert parse_log_bytes(text.encode()).name == 'Andreas Krüger'
+    assert validate_log_file(str(bom)).valid
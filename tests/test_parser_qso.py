@@ -97,3 +97,19 @@ def test_nonstandard_mode_lenient():
     assert qso.mo == 'CW/DIGITAL'
     assert qso.freq == '14000'
     assert qso.de_call == 'W1AW'
+
+
+def test_normalize():
+    """Test that normalized QSOs share upper-cased tokens."""
+    qso1 = parse_qso('7005 cw 2009-05-30 0002 aa1zzz 599 1 s50a 599 4 1',
+                     True, normalize=True)
+    qso2 = parse_qso('7005 CW 2009-05-30 0002 S50A 599 4 AA1ZZZ 599 1', True,
+                     normalize=True)
+    assert qso1.normalized
+    assert (qso1.freq, qso1.mo, qso1.de_call, qso1.dx_call, qso1.t) == \
+        ('7005', 'CW', 'AA1ZZZ', 'S50A', 1)
+    assert qso1.de_exch[0] is qso2.dx_exch[0]
+    assert qso1.de_call is qso2.dx_call
+    assert qso1.match_against(qso2)
+    assert not parse_qso('7005 CW 2009-05-30 0002 AA1ZZZ 599 1 S50A 599 4',
+                         True).normalized
@@ -207,6 +207,25 @@ def test_match_against_case_insensitive_exchange():
     assert qso1.match_against(qso2) is True
 
 
+def test_match_against_exchange_changed_in_place():
+    """Test that matching sees exchanges changed after the key was cached."""
+    date = datetime(2018, 5, 30, 22, 10)
+    qso1 = QSO('14313', 'PH', date, 'KX0XXX', 'KX9XXX',
+               de_exch=['59', 'CT'], dx_exch=['44', 'IN'])
+    qso2 = QSO('14313', 'PH', date, 'KX9XXX', 'KX0XXX',
+               de_exch=['44', 'in'], dx_exch=['59', 'ct'])
+    assert qso1.match_against(qso2)
+    qso2.de_exch[1] = '9'
+    assert not qso1.match_against(qso2)
+
+    qso1.normalize()
+    qso2.normalize()
+    qso2.de_exch[1] = 'IN'
+    assert qso1.match_against(qso2)
+    qso2.de_exch[1] = '9'
+    assert not qso1.match_against(qso2)
+
+
 def test_eq_non_qso():
     qso = QSO('14313', 'PH',
               datetime.strptime('May 30 2018 10:10PM', '%b %d %Y %I:%M%p'),
@@ -216,3 +235,55 @@ def test_eq_non_qso():
     assert qso != "not a qso"
     assert qso != 42
     assert qso != ['a', 'list']
+
+
+def test_qso_key_and_hash():
+    """Test the normalized QSO key and hashing."""
+    date = datetime.strptime('May 30 2018 10:10PM', '%b %d %Y %I:%M%p')
+    qso1 = QSO('14313', 'PH', date, 'kx0xxx', 'KX9XXX',
+               de_exch=['59', 'co'], dx_exch=['44', 'IN'])
+    qso2 = QSO('14313', 'PH', date, 'kx0xxx', 'KX9XXX',
+               de_exch=['59', 'co'], dx_exch=['44', 'IN'], valid=False)
+    qso3 = QSO('14000', 'PH', date, 'KX0XXX', 'KX9XXX',
+               de_exch=['59', 'CO'], dx_exch=['44', 'IN'])
+
+    assert qso1.key == ('14000', 'PH', 25461970, 'KX0XXX', ('59', 'CO'),
+                        'KX9XXX', ('44', 'IN'))
+    assert qso1.key == qso3.key
+    assert qso1 != qso3
+    assert hash(qso1) == hash(qso2)
+    assert {qso1, qso2, qso3} == {qso1, qso3}
+    assert {qso1: 'x'}[qso2] == 'x'
+
+    # Assigning attributes updates the key.
+    qso3.freq = '7000'
+    assert qso3.key.band == '7000'
+    qso3.dx_exch = ['44', 'il']
+    assert qso3.key.dx_exch == ('44', 'IL')
+
+
+def test_normalize():
+    """Test normalizing the tokens of a QSO."""
+    date = datetime.strptime('May 30 2018 10:10PM', '%b %d %Y %I:%M%p')
+    qso1 = QSO('14313', 'ph', date, 'kx0xxx', 'KX9XXX',
+               de_exch=['59', 'co'], dx_exch=['44', 'IN'], check_mode=False)
+    qso2 = QSO('14313', 'PH', date, 'KX9XXX', 'KX0XXX',
+               de_exch=['44', 'IN'], dx_exch=['59', 'CO'])
+    assert not qso1.match_against(qso2)
+    assert not qso1.normalized
+
+    qso1.normalize()
+    assert qso1.normalized
+    assert (qso1.mo, qso1.de_call, qso1.de_exch) == ('PH', 'KX0XXX',
+                                                     ['59', 'CO'])
+    assert qso1.key == ('14000', 'PH', 25461970, 'KX0XXX', ('59', 'CO'),
+                        'KX9XXX', ('44', 'IN'))
+    assert qso1.match_against(qso2)
+    assert qso1.de_exch[1] is qso1.key.de_exch[1]
+
+    # Assigning a token resets the flag, but not other attributes.
+    qso1.freq = '7000'
+    assert qso1.normalized
+    qso1.dx_call = 'kx9xxx'
+    assert not qso1.normalized
+    assert qso1.key.dx_call == 'KX9XXX'
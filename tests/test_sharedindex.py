@@ -0,0 +1,98 @@
+"""Test cross-checking with the contest index in shared memory."""
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+import path_helper
+
+from cabrillo import Cabrillo, QSO
+from cabrillo.crosscheck import CrossCheckIndex
+from cabrillo.sharedindex import SharedContestIndex, crosscheck_shared
+
+
+def make_contest(num_logs=12, num_qsos=300, seed=0):
+    """Make logs of stations working each other, with busted, missing and
+    unverified QSOs."""
+    rng = random.Random(seed)
+    calls = ['K{}AB'.format(i) for i in range(num_logs)]
+    qsos = {call: [] for call in calls}
+    start = datetime(2020, 1, 1)
+    for i in range(num_qsos):
+        de_call, dx_call = rng.sample(calls, 2)
+        if rng.random() < 0.1:
+            dx_call = 'W{}XYZ'.format(rng.randrange(5))
+        date = start + timedelta(minutes=i)
+        freq = rng.choice(['7000', '7010', '14000', '14300', '50'])
+        mo = rng.choice(['CW', 'PH'])
+        exch = (['599', str(i)], ['599', str(i + 1)])
+        qsos[de_call].append(QSO(freq, mo, date, de_call, dx_call,
+                                 de_exch=exch[0], dx_exch=exch[1]))
+        if dx_call not in qsos or rng.random() < 0.1:
+            continue
+        # The other station's side, sometimes with an error.
+        error = rng.randrange(8)
+        qsos[dx_call].append(QSO(
+            {0: '14350', 1: '7500'}.get(error, freq),
+            'RY' if error == 2 else mo,
+            date + timedelta(minutes={3: 40, 4: -3}.get(error, 0)),
+            dx_call.lower() if error == 5 else dx_call, de_call,
+            de_exch=['599', str(i + 2)] if error == 6 else exch[1],
+            dx_exch=[x.lower() for x in exch[0]]))
+    logs = []
+    for call in calls:
+        qsos[call].sort(key=lambda qso: qso.date)
+        for qso in qsos[call][::13]:
+            qso.valid = False
+        logs.append(Cabrillo(callsign=call, qso=qsos[call]))
+    return logs
+
+
+OPTIONS = [{}, dict(max_time_delta=-1), dict(max_time_delta=2),
+           dict(check_exch=False), dict(check_band=False)]
+
+
+def test_results():
+    """Test that the statuses equal those of CrossCheckIndex."""
+    logs = make_contest()
+    with SharedContestIndex.create(logs) as index:
+        assert len(index) == len(logs)
+        assert index.callsigns == [cab.callsign for cab in logs]
+        for options in OPTIONS:
+            expected = CrossCheckIndex(**options)
+            for cab in logs:
+                expected.add_log(cab)
+            statuses = set()
+            for log, cab in enumerate(logs):
+                results = index.results(log, **options)
+                assert results == expected.results(cab.callsign)
+                assert index.results(cab.callsign, **options) == results
+                statuses.update(results)
+            assert len(statuses) == 5
+
+        with pytest.raises(ValueError):
+            index.results(0, max_time_delta=-2)
+
+
+def test_attach():
+    """Test that an attached index is read-only and gives the same results."""
+    logs = make_contest(num_logs=4, num_qsos=50)
+    with SharedContestIndex.create(logs) as index:
+        with SharedContestIndex.attach(index.handle) as attached:
+            assert attached.callsigns == index.callsigns
+            for log in range(len(logs)):
+                assert attached.results(log) == index.results(log)
+            with pytest.raises(TypeError):
+                attached._views['valid'][0] = 0
+
+
+def test_crosscheck_shared():
+    """Test cross-checking in worker processes."""
+    logs = make_contest()
+    expected = CrossCheckIndex(check_exch=False)
+    for cab in logs:
+        expected.add_log(cab)
+    results = crosscheck_shared(logs, jobs=2, chunk_size=5, check_exch=False)
+    assert results == {callsign: expected.results(callsign)
+                       for callsign in expected.logs}
+    assert crosscheck_shared([]) == {}
@@ -0,0 +1,53 @@
+"""Test storing Cabrillo logs in SQLite."""
+import sqlite3
+
+import path_helper
+
+from cabrillo.parser import parse_log_file
+from cabrillo.storage import create_schema, load_logs, save_logs
+
+
+def test_roundtrip():
+    """Test that logs read back from the database are the same."""
+    logs = [parse_log_file('tests/CQWPX.log'),
+            parse_log_file('tests/YARC.log'),
+            parse_log_file('tests/GB0WR.log', ignore_unknown_key=True),
+            parse_log_file('tests/I44Z.log', ignore_order=True),
+            parse_log_file('tests/LAQP.log', check_mode=False)]
+    connection = sqlite3.connect(':memory:')
+    create_schema(connection)
+    log_ids = save_logs(connection, logs, batch_size=7)
+    assert len(log_ids) == len(logs)
+
+    loaded = list(load_logs(connection))
+    assert len(loaded) == len(logs)
+    for original, copy in zip(logs, loaded):
+        assert list(copy.header_items()) == list(original.header_items())
+        assert copy.qso == original.qso
+        assert [q.t for q in copy.qso] == [q.t for q in original.qso]
+        assert copy.x_qso == original.x_qso
+        assert copy.ignore_order == original.ignore_order
+
+    # Callsigns are stored once.
+    assert connection.execute(
+        "SELECT COUNT(*) FROM callsign WHERE call = 'W200YARC'").fetchone() \
+        == (1,)
+
+    # Saving more logs later reuses the callsigns and keeps the order.
+    create_schema(connection)
+    new_ids = save_logs(connection, [logs[1]])
+    assert connection.execute(
+        "SELECT COUNT(*) FROM callsign WHERE call = 'W200YARC'").fetchone() \
+        == (1,)
+    assert next(load_logs(connection, new_ids)).text() == logs[1].text()
+
+
+def test_query():
+    """Test that stored QSOs can be queried for cross-checking."""
+    connection = sqlite3.connect(':memory:')
+    create_schema(connection)
+    save_logs(connection, [parse_log_file('tests/YARC.log')])
+    rows = connection.execute(
+        "SELECT q.seq FROM qso q JOIN callsign dx ON dx.id = q.dx_call_id "
+        "WHERE dx.call = 'K4NYX' AND q.band = '14000'").fetchall()
+    assert rows == [(0,)]